@@ -99,6 +99,7 @@ def cmd_collect(args):
     # Initialize scheduler and run once
     scheduler = Scheduler(config, store)
     scheduler.run_once()
+    store.close()
 
     logger.info("Collection complete")
 
@@ -33,6 +33,13 @@ class LogParser(BaseCollector):
         "syslog_error": re.compile(
             r"(?P<timestamp>\w+\s+\d+\s+[\d:]+)\s+(?P<host>\S+)\s+(?P<service>\S+?)(?:\[\d+\])?\s*:\s*(?P<message>.*)"
         ),
+        # Django logs typically have format: [LEVEL] message
+        "django_level": re.compile(r"\[(?P<level>\w+)\]\s+(?P<message>.*)"),
+        # Nginx access log format: IP - - [timestamp] "request" status size "referer" "user-agent"
+        "nginx_access": re.compile(
+            r"(?P<ip>[\d.]+)\s+-\s+-\s+\[(?P<timestamp>[^\]]+)\]\s+"
+            r'"(?P<request>[^"]*)"\s+(?P<status>\d+)\s+(?P<size>\d+)'
+        ),
     }
 
     def __init__(self, config: dict):
@@ -228,8 +235,7 @@ class LogParser(BaseCollector):
 
     def _parse_django_log(self, line: str) -> Optional[LogEvent]:
         """Parse Django log line"""
-        # Django logs typically have format: [LEVEL] message
-        level_match = re.match(r"\[(?P<level>\w+)\]\s+(?P<message>.*)", line)
+        level_match = self.PATTERNS["django_level"].match(line)
         if level_match:
             level = level_match.group("level").upper()
             message = level_match.group("message")
@@ -248,13 +254,7 @@ class LogParser(BaseCollector):
 
     def _parse_nginx_log(self, line: str) -> Optional[LogEvent]:
         """Parse nginx access log line"""
-        # Nginx access log format: IP - - [timestamp] "request" status size "referer" "user-agent"
-        nginx_pattern = re.compile(
-            r"(?P<ip>[\d.]+)\s+-\s+-\s+\[(?P<timestamp>[^\]]+)\]\s+"
-            r'"(?P<request>[^"]*)"\s+(?P<status>\d+)\s+(?P<size>\d+)'
-        )
-
-        match = nginx_pattern.search(line)
+        match = self.PATTERNS["nginx_access"].search(line)
         if match:
             status = int(match.group("status"))
             level = "ERROR" if status >= 500 else "WARNING" if status >= 400 else "INFO"
@@ -5,6 +5,7 @@ Uses /proc filesystem on Linux, subprocess/os calls on macOS for minimal depende
 
 import os
 import platform
+import re
 import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
@@ -20,6 +21,10 @@ logger = get_logger(__name__)
 IS_LINUX = platform.system() == "Linux"
 IS_MACOS = platform.system() == "Darwin"
 
+# Matches patterns like "5.12% user" and "10.25% sys" in macOS top output
+TOP_CPU_USER_PATTERN = re.compile(r'([\d.]+)%\s+user')
+TOP_CPU_SYS_PATTERN = re.compile(r'([\d.]+)%\s+sys')
+
 
 class SystemMetricsCollector(BaseCollector):
     """Collects system metrics using /proc filesystem"""
@@ -151,10 +156,8 @@ class SystemMetricsCollector(BaseCollector):
                 for line in result.stdout.split('\n'):
                     if 'CPU usage' in line:
                         # Extract percentages
-                        import re
-                        # Match patterns like "5.12% user" and "10.25% sys"
-                        user_match = re.search(r'([\d.]+)%\s+user', line)
-                        sys_match = re.search(r'([\d.]+)%\s+sys', line)
+                        user_match = TOP_CPU_USER_PATTERN.search(line)
+                        sys_match = TOP_CPU_SYS_PATTERN.search(line)
 
                         if user_match and sys_match:
                             user = float(user_match.group(1))
@@ -36,8 +36,12 @@ class TracerCollector(BaseCollector):
         self.event_tracer = EventTracer()
         self.process_tracer = ProcessTracer()
         self.network_tracer = NetworkTracer()
-        self.ip_tracer = IPTracer()
-        self.error_tracer = ErrorTracer()
+        self.ip_tracer = IPTracer(
+            max_cache_size=config.get('ip_cache_size', IPTracer.MAX_CACHE_SIZE)
+        )
+        self.error_tracer = ErrorTracer(
+            max_history=config.get('error_history_size', ErrorTracer.MAX_HISTORY)
+        )
 
         # Configuration
         self.trace_processes = config.get('trace_processes', True)
@@ -91,13 +95,12 @@ class TracerCollector(BaseCollector):
 
         # Add IP trace if IP is present
         if self.trace_ips and log_event.ip_address:
-            ip_trace = self.ip_tracer.trace_ip(log_event.ip_address)
-            trace['ip_info'] = ip_trace
-
-            # Update IP activity tracking
+            # Update IP activity tracking first so ip_info includes this event
             if log_event.action:
                 self.ip_tracer.update_ip_activity(log_event.ip_address, log_event.action)
 
+            trace['ip_info'] = self.ip_tracer.trace_ip(log_event.ip_address)
+
         # Add error trace if it's an error/warning event
         if self.trace_errors and log_event.level in ['ERROR', 'CRITICAL', 'WARNING']:
             error_trace = self.error_tracer.trace_error(
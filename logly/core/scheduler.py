@@ -233,6 +233,9 @@ class Scheduler:
         if self.thread:
             self.thread.join(timeout=5)
 
+        # Commit grouped writes now rather than leaving them to a finalizer
+        self.store.flush()
+
         logger.info("Logly scheduler stopped")
 
     def run_once(self):
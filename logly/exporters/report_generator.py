@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Dict, Any
 
 from logly.storage.sqlite_store import SQLiteStore
+from logly.utils.system_storage import format_bytes
 
 
 logger = logging.getLogger(__name__)
@@ -220,21 +221,7 @@ class ReportGenerator:
 
     def _format_bytes(self, bytes_value: int) -> str:
         """Format bytes to human-readable format"""
-        if bytes_value == 0:
-            return "0 B"
-
-        units = ["B", "KB", "MB", "GB", "TB"]
-        unit_index = 0
-        value = float(bytes_value)
-
-        while value >= 1024 and unit_index < len(units) - 1:
-            value /= 1024
-            unit_index += 1
-
-        # For bytes, show as integer; for larger units, show with 2 decimals
-        if unit_index == 0:
-            return f"{int(value)} {units[unit_index]}"
-        return f"{value:.2f} {units[unit_index]}"
+        return format_bytes(bytes_value)
 
     def generate_full_report(self, output_path: str, start_time: int, end_time: int):
         """
@@ -3,11 +3,39 @@ Data models for Logly metrics and log events
 """
 
 from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from operator import attrgetter
+from typing import Optional, Dict, Any, Tuple
 import time
 import json
 
 
+# Column order of the INSERT statements in SQLiteStore; as_insert_tuple()
+# returns values in exactly this order
+SYSTEM_METRIC_COLUMNS = (
+    "timestamp", "cpu_percent", "cpu_count", "memory_total",
+    "memory_available", "memory_percent", "disk_total", "disk_used",
+    "disk_percent", "disk_read_bytes", "disk_write_bytes",
+    "load_1min", "load_5min", "load_15min",
+)
+
+NETWORK_METRIC_COLUMNS = (
+    "timestamp", "bytes_sent", "bytes_recv", "packets_sent",
+    "packets_recv", "errors_in", "errors_out", "drops_in",
+    "drops_out", "connections_established", "connections_listen",
+    "connections_time_wait",
+)
+
+LOG_EVENT_COLUMNS = (
+    "timestamp", "source", "level", "message", "ip_address",
+    "user", "service", "action", "metadata",
+)
+
+# attrgetter builds the whole tuple in C instead of one lookup per field
+_system_metric_values = attrgetter(*SYSTEM_METRIC_COLUMNS)
+_network_metric_values = attrgetter(*NETWORK_METRIC_COLUMNS)
+_log_event_values = attrgetter(*LOG_EVENT_COLUMNS[:-1])
+
+
 @dataclass
 class SystemMetric:
     """System metrics data model"""
@@ -36,6 +64,10 @@ class SystemMetric:
         """Convert to dictionary"""
         return asdict(self)
 
+    def as_insert_tuple(self) -> Tuple[Any, ...]:
+        """Values in SYSTEM_METRIC_COLUMNS order for the system_metrics INSERT"""
+        return _system_metric_values(self)
+
 
 @dataclass
 class NetworkMetric:
@@ -63,6 +95,10 @@ class NetworkMetric:
         """Convert to dictionary"""
         return asdict(self)
 
+    def as_insert_tuple(self) -> Tuple[Any, ...]:
+        """Values in NETWORK_METRIC_COLUMNS order for the network_metrics INSERT"""
+        return _network_metric_values(self)
+
 
 @dataclass
 class LogEvent:
@@ -90,6 +126,12 @@ class LogEvent:
             data["metadata"] = json.dumps(self.metadata)
         return data
 
+    def as_insert_tuple(self) -> Tuple[Any, ...]:
+        """Values in LOG_EVENT_COLUMNS order, metadata serialized as JSON"""
+        return _log_event_values(self) + (
+            json.dumps(self.metadata) if self.metadata else None,
+        )
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LogEvent":
         """Create LogEvent from dictionary, deserializing metadata"""
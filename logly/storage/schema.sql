@@ -65,6 +65,12 @@ CREATE INDEX IF NOT EXISTS idx_log_events_level ON log_events(level);
 CREATE INDEX IF NOT EXISTS idx_log_events_action ON log_events(action);
 -- Composite index for common queries (source + timestamp)
 CREATE INDEX IF NOT EXISTS idx_log_events_source_timestamp ON log_events(source, timestamp);
+-- Partial indexes for the selective counts in hourly aggregation
+-- (only matching rows are indexed, so each count is a short range scan)
+CREATE INDEX IF NOT EXISTS idx_log_events_failed_login_ts ON log_events(timestamp) WHERE action = 'failed_login';
+CREATE INDEX IF NOT EXISTS idx_log_events_banned_ts ON log_events(timestamp) WHERE action = 'banned';
+CREATE INDEX IF NOT EXISTS idx_log_events_error_ts ON log_events(timestamp) WHERE level = 'ERROR';
+CREATE INDEX IF NOT EXISTS idx_log_events_warning_ts ON log_events(timestamp) WHERE level = 'WARNING';
 
 -- Hourly Aggregates Table
 -- Pre-computed hourly statistics for faster queries
@@ -266,7 +272,10 @@ CREATE TABLE IF NOT EXISTS ip_reputation (
     updated_at INTEGER
 );
 
-CREATE INDEX IF NOT EXISTS idx_ip_reputation_threat ON ip_reputation(threat_score);
+-- Also serves get_high_threat_ips' ORDER BY threat_score DESC, last_seen DESC without a sort
+-- (replaces the single-column idx_ip_reputation_threat)
+DROP INDEX IF EXISTS idx_ip_reputation_threat;
+CREATE INDEX IF NOT EXISTS idx_ip_reputation_threat_last_seen ON ip_reputation(threat_score, last_seen);
 CREATE INDEX IF NOT EXISTS idx_ip_reputation_type ON ip_reputation(type);
 CREATE INDEX IF NOT EXISTS idx_ip_reputation_last_seen ON ip_reputation(last_seen);
 CREATE INDEX IF NOT EXISTS idx_ip_reputation_blacklisted ON ip_reputation(is_blacklisted);
@@ -301,6 +310,8 @@ CREATE INDEX IF NOT EXISTS idx_error_traces_type ON error_traces(error_type);
 CREATE INDEX IF NOT EXISTS idx_error_traces_category ON error_traces(error_category);
 CREATE INDEX IF NOT EXISTS idx_error_traces_severity ON error_traces(severity);
 CREATE INDEX IF NOT EXISTS idx_error_traces_timestamp ON error_traces(timestamp);
+-- Covering index for the grouped counts in get_error_patterns
+CREATE INDEX IF NOT EXISTS idx_error_traces_ts_type_category ON error_traces(timestamp, error_type, error_category);
 
 -- Trace Patterns Table
 -- Stores detected patterns across multiple events
@@ -332,3 +343,148 @@ CREATE INDEX IF NOT EXISTS idx_trace_patterns_type ON trace_patterns(pattern_typ
 CREATE INDEX IF NOT EXISTS idx_trace_patterns_time ON trace_patterns(start_time, end_time);
 CREATE INDEX IF NOT EXISTS idx_trace_patterns_severity ON trace_patterns(severity);
 CREATE INDEX IF NOT EXISTS idx_trace_patterns_detected ON trace_patterns(detected_at);
+
+-- =============================================================================
+-- ROW COUNTERS
+-- Exact per-table row counts maintained by triggers, so get_stats() reads
+-- 11 rows instead of running COUNT(*) (a full scan) on every table
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS row_counters (
+    table_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Seed counters from current contents (no-op once a counter exists)
+INSERT OR IGNORE INTO row_counters (table_name, row_count)
+    SELECT 'system_metrics', COUNT(*) FROM system_metrics
+    UNION ALL
+    SELECT 'network_metrics', COUNT(*) FROM network_metrics
+    UNION ALL
+    SELECT 'log_events', COUNT(*) FROM log_events
+    UNION ALL
+    SELECT 'hourly_aggregates', COUNT(*) FROM hourly_aggregates
+    UNION ALL
+    SELECT 'daily_aggregates', COUNT(*) FROM daily_aggregates
+    UNION ALL
+    SELECT 'event_traces', COUNT(*) FROM event_traces
+    UNION ALL
+    SELECT 'process_traces', COUNT(*) FROM process_traces
+    UNION ALL
+    SELECT 'network_traces', COUNT(*) FROM network_traces
+    UNION ALL
+    SELECT 'error_traces', COUNT(*) FROM error_traces
+    UNION ALL
+    SELECT 'ip_reputation', COUNT(*) FROM ip_reputation
+    UNION ALL
+    SELECT 'trace_patterns', COUNT(*) FROM trace_patterns;
+
+CREATE TRIGGER IF NOT EXISTS trg_system_metrics_count_insert AFTER INSERT ON system_metrics
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'system_metrics';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_system_metrics_count_delete AFTER DELETE ON system_metrics
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'system_metrics';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_network_metrics_count_insert AFTER INSERT ON network_metrics
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'network_metrics';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_network_metrics_count_delete AFTER DELETE ON network_metrics
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'network_metrics';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_log_events_count_insert AFTER INSERT ON log_events
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'log_events';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_log_events_count_delete AFTER DELETE ON log_events
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'log_events';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_hourly_aggregates_count_insert AFTER INSERT ON hourly_aggregates
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'hourly_aggregates';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_hourly_aggregates_count_delete AFTER DELETE ON hourly_aggregates
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'hourly_aggregates';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_aggregates_count_insert AFTER INSERT ON daily_aggregates
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'daily_aggregates';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_aggregates_count_delete AFTER DELETE ON daily_aggregates
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'daily_aggregates';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_event_traces_count_insert AFTER INSERT ON event_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'event_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_event_traces_count_delete AFTER DELETE ON event_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'event_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_process_traces_count_insert AFTER INSERT ON process_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'process_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_process_traces_count_delete AFTER DELETE ON process_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'process_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_network_traces_count_insert AFTER INSERT ON network_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'network_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_network_traces_count_delete AFTER DELETE ON network_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'network_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_error_traces_count_insert AFTER INSERT ON error_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'error_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_error_traces_count_delete AFTER DELETE ON error_traces
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'error_traces';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ip_reputation_count_insert AFTER INSERT ON ip_reputation
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'ip_reputation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ip_reputation_count_delete AFTER DELETE ON ip_reputation
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'ip_reputation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_trace_patterns_count_insert AFTER INSERT ON trace_patterns
+BEGIN
+    UPDATE row_counters SET row_count = row_count + 1 WHERE table_name = 'trace_patterns';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_trace_patterns_count_delete AFTER DELETE ON trace_patterns
+BEGIN
+    UPDATE row_counters SET row_count = row_count - 1 WHERE table_name = 'trace_patterns';
+END;
@@ -6,23 +6,163 @@ Optimized for time-series data with proper indexing
 import sqlite3
 import json
 import os
+import queue
+import re
+import threading
+import weakref
+from collections import Counter
+from itertools import product
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Sequence, Tuple
 from contextlib import contextmanager
+from datetime import datetime, timezone
 import time
 
-from logly.storage.models import SystemMetric, NetworkMetric, LogEvent
+from logly.storage.models import (
+    SystemMetric, NetworkMetric, LogEvent,
+    SYSTEM_METRIC_COLUMNS, NETWORK_METRIC_COLUMNS, LOG_EVENT_COLUMNS,
+)
 from logly.utils.logger import get_logger
 from logly.utils.paths import get_db_path, validate_db_path
-from logly.utils.create_db import db_exists, initialize_db_if_needed
+from logly.utils.create_db import db_exists, initialize_db_if_needed, load_schema_sql
 
 
 logger = get_logger(__name__)
 
+# Names of the tables/indexes/triggers declared in schema.sql
+_SCHEMA_OBJECT_RE = re.compile(
+    r"CREATE\s+(?:TABLE|INDEX|TRIGGER)\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+
+def _filter_queries(base: str, filters: Tuple[str, ...], order_by: str) -> Dict[Tuple[bool, ...], str]:
+    """
+    Precompute query text for every combination of optional filters
+
+    Keys are one flag per filter (in order) plus a trailing flag for a
+    bound ``LIMIT ?``, so callers pick a fixed string instead of
+    assembling SQL per call.
+    """
+    queries = {}
+    for mask in product((False, True), repeat=len(filters) + 1):
+        where = "".join(f" AND {f}" for f, enabled in zip(filters, mask) if enabled)
+        limit = " LIMIT ?" if mask[-1] else ""
+        queries[mask] = f"{base}{where} ORDER BY {order_by}{limit}"
+    return queries
+
+
+def _upsert_query(table: str, columns: Tuple[str, ...]) -> str:
+    """INSERT that updates the row in place when the first column (a UNIQUE key) exists"""
+    updates = ", ".join(f"{col} = excluded.{col}" for col in columns[1:])
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({columns[0]}) DO UPDATE SET {updates}"
+    )
+
 
 class SQLiteStore:
     """SQLite-based storage for metrics and logs"""
 
+    # Tables reported by get_stats(), all tracked in row_counters
+    STATS_TABLES = (
+        "system_metrics",
+        "network_metrics",
+        "log_events",
+        "hourly_aggregates",
+        "daily_aggregates",
+        "event_traces",
+        "process_traces",
+        "network_traces",
+        "error_traces",
+        "ip_reputation",
+        "trace_patterns",
+    )
+
+    # Query text for each filter/LIMIT combination of the range getters
+    _SYSTEM_METRICS_QUERIES = _filter_queries(
+        "SELECT * FROM system_metrics WHERE timestamp BETWEEN ? AND ?", (), "timestamp DESC"
+    )
+    _NETWORK_METRICS_QUERIES = _filter_queries(
+        "SELECT * FROM network_metrics WHERE timestamp BETWEEN ? AND ?", (), "timestamp DESC"
+    )
+    _LOG_EVENT_QUERIES = _filter_queries(
+        "SELECT * FROM log_events WHERE timestamp BETWEEN ? AND ?",
+        ("source = ?", "level = ?"),
+        "timestamp DESC",
+    )
+    _TRACE_QUERIES = _filter_queries(
+        "SELECT * FROM event_traces WHERE timestamp BETWEEN ? AND ?",
+        ("source = ?", "severity_score >= ?"),
+        "timestamp DESC",
+    )
+    _ERROR_TRACE_QUERIES = _filter_queries(
+        "SELECT * FROM error_traces WHERE timestamp BETWEEN ? AND ?",
+        ("error_category = ?",),
+        "timestamp DESC",
+    )
+
+    # Shared by the single-row and batch inserts
+    _INSERT_SYSTEM_METRIC = (
+        f"INSERT INTO system_metrics ({', '.join(SYSTEM_METRIC_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(SYSTEM_METRIC_COLUMNS))})"
+    )
+    _INSERT_NETWORK_METRIC = (
+        f"INSERT INTO network_metrics ({', '.join(NETWORK_METRIC_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(NETWORK_METRIC_COLUMNS))})"
+    )
+    _INSERT_LOG_EVENT = (
+        f"INSERT INTO log_events ({', '.join(LOG_EVENT_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(LOG_EVENT_COLUMNS))})"
+    )
+
+    # Aggregates are upserted in place: INSERT OR REPLACE would delete the
+    # old row, and that delete only reaches the row_counters trigger on
+    # connections with recursive_triggers enabled
+    _UPSERT_HOURLY_AGGREGATE = _upsert_query("hourly_aggregates", (
+        "hour_timestamp", "avg_cpu_percent", "max_cpu_percent",
+        "avg_memory_percent", "max_memory_percent", "avg_disk_percent",
+        "total_bytes_sent", "total_bytes_recv", "total_packets_sent",
+        "total_packets_recv", "log_events_count", "failed_login_count",
+        "banned_ip_count", "error_count", "warning_count",
+    ))
+    _UPSERT_DAILY_AGGREGATE = _upsert_query("daily_aggregates", (
+        "date", "avg_cpu_percent", "max_cpu_percent", "avg_memory_percent",
+        "max_memory_percent", "avg_disk_percent", "total_bytes_sent",
+        "total_bytes_recv", "log_events_count", "failed_login_count",
+        "banned_ip_count", "error_count", "warning_count",
+        "unique_ips_banned", "unique_users_failed",
+    ))
+
+    # Per-connection page cache (KiB, applied as a negative cache_size) and
+    # memory-mapped I/O window, sized for the range/GROUP BY read paths
+    CACHE_SIZE_KIB = 65536
+    MMAP_SIZE = 256 * 1024 * 1024
+
+    # Seconds between background WAL checkpoints and PRAGMA optimize runs
+    CHECKPOINT_INTERVAL = 60
+    OPTIMIZE_INTERVAL = 900
+
+    # PRAGMA optimize mask run once when a file database is opened; 0x10000
+    # also covers tables the connection hasn't queried yet (SQLite 3.46+,
+    # ignored by older versions). ANALYZE samples at most ANALYSIS_LIMIT rows
+    # per index so neither run scans whole tables.
+    OPTIMIZE_ON_OPEN = 0x10002
+    ANALYSIS_LIMIT = 400
+
+    # Single-row inserts are group-committed: the open transaction is
+    # committed after this many writes or this many seconds, whichever first
+    COMMIT_BATCH_SIZE = 50
+    COMMIT_DELAY = 1.0
+
+    # Pages copied per step by backup(); other processes can take the
+    # database lock between steps
+    BACKUP_PAGES = 1024
+
+    # Idle read-only connections kept for reuse; extra readers opened under
+    # heavier concurrency are closed when they are handed back
+    READ_POOL_SIZE = 8
+
     def __init__(self, db_path: str):
         """
         Initialize SQLite storage
@@ -45,6 +185,27 @@ class SQLiteStore:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # One long-lived writer guarded by a lock, plus a pool of read-only
+        # connections (WAL lets readers run alongside the writer)
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+        self._reader_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(
+            maxsize=self.READ_POOL_SIZE
+        )
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._readers_opened = 0
+
+        # Grouped single-row writes not yet committed (see _write_connection)
+        self._pending_writes = 0
+        self._flush_timer: Optional[threading.Timer] = None
+
+        # Checkpoints/optimize run off the write path (see _schedule_maintenance)
+        self._last_checkpoint = time.monotonic()
+        self._last_optimize = time.monotonic()
+        self._maintenance_thread: Optional[threading.Thread] = None
+        self._maintenance_lock = threading.Lock()
+
         # In test mode, directly check if the provided path exists
         # In production mode, use db_exists() which checks the hardcoded path
         test_mode = os.environ.get("LOGLY_TEST_MODE") == "1"
@@ -62,71 +223,100 @@ class SQLiteStore:
 
         self._init_database()
 
+        # Long-running stores start with planner statistics refreshed where stale
+        try:
+            self.optimize(self.OPTIMIZE_ON_OPEN)
+        except sqlite3.Error as e:
+            logger.warning(f"PRAGMA optimize on open failed: {e}")
+
     def _init_database(self):
         """
         Initialize database with schema
 
         Note: This method now checks if tables exist before executing schema.
         The heavy lifting of database creation is done by create_db.py module.
+        The schema is idempotent, so it is also re-applied to existing
+        databases that are missing any table, index or trigger it declares.
         """
-        with self._connection() as conn:
-            # Check if tables already exist
-            cursor = conn.execute(
-                "SELECT COUNT(*) FROM sqlite_master WHERE type='table'"
-            )
-            table_count = cursor.fetchone()[0]
-
-            # Only run schema if no tables exist
-            if table_count == 0:
-                schema_path = Path(__file__).parent / "schema.sql"
-                with open(schema_path, "r") as f:
-                    schema = f.read()
-                conn.executescript(schema)
-                conn.commit()
-                logger.info(f"Database schema initialized at {self.db_path}")
-            else:
-                logger.debug(f"Database already initialized with {table_count} tables")
+        schema = load_schema_sql()
+        expected = set(_SCHEMA_OBJECT_RE.findall(schema))
 
-    @contextmanager
-    def _connection(self):
-        """Context manager for database connections with concurrency support"""
-        # Configure connection for thread safety and concurrency
+        # Plain autocommit read, so a healthy database never takes the write lock
+        with self._writer_lock:
+            existing = {
+                row[0] for row in self._get_writer().execute("SELECT name FROM sqlite_master")
+            }
+
+        # Only run schema if something it declares is missing
+        if not expected <= existing:
+            # executescript() commits any open transaction first, so the
+            # transaction is part of the script: the row_counters seed and
+            # the count triggers become visible to other writers together
+            with self._writer_lock:
+                self._commit_locked()
+                conn = self._get_writer()
+                try:
+                    conn.executescript(f"BEGIN IMMEDIATE;\n{schema}\nCOMMIT;")
+                except sqlite3.Error:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            logger.info(f"Database schema initialized at {self.db_path}")
+        else:
+            logger.debug(f"Database already initialized with {len(existing)} schema objects")
+
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply row factory and concurrency PRAGMAs to a read-write connection"""
+        conn.row_factory = sqlite3.Row
+
+        # Enable WAL mode for better concurrent read/write performance
+        # WAL allows multiple readers and one writer simultaneously
+        try:
+            # Free pages are released by incremental_vacuum() instead of a full
+            # VACUUM; the mode can only be chosen while the file is still empty
+            if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            # Force WAL mode before any operations
+            conn.execute("PRAGMA journal_mode=WAL").fetchone()
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{self.CACHE_SIZE_KIB}")
+            conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA busy_timeout=60000")  # 60 seconds in milliseconds
+            # No synchronous auto-checkpoints; see checkpoint()
+            conn.execute("PRAGMA wal_autocheckpoint=0")
+            conn.execute(f"PRAGMA analysis_limit={self.ANALYSIS_LIMIT}")
+            conn.commit()  # Commit pragma changes
+        except sqlite3.OperationalError as e:
+            # If WAL mode fails, continue with default journal mode
+            logger.warning(f"Could not set WAL mode: {e}")
+
+    def _configure_reader(self, conn: sqlite3.Connection):
+        """Apply row factory and read-path PRAGMAs to a read-only connection"""
+        conn.row_factory = sqlite3.Row
+
+        # journal_mode belongs to the database file; cache, mmap and temp
+        # storage are per connection, so readers need their own
+        conn.execute(f"PRAGMA cache_size=-{self.CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+    def _open_with_retry(self, database: str, **kwargs) -> sqlite3.Connection:
+        """Open a connection, retrying with backoff if the file can't be opened yet"""
         # timeout=60 waits up to 60 seconds if database is locked
-        # check_same_thread=False allows connection to be used by different threads (needed for testing)
+        # check_same_thread=False allows connection to be used by different threads
         max_retries = 5
         retry_delay = 0.1  # Start with 100ms
 
         for attempt in range(max_retries):
             try:
-                conn = sqlite3.connect(
-                    self.db_path,
+                return sqlite3.connect(
+                    database,
                     timeout=60.0,  # Increased from 30 to 60 seconds
                     check_same_thread=False,
-                    uri=True  # Enable URI mode for better file handling
+                    uri=True,  # Enable URI mode for better file handling
+                    **kwargs
                 )
-                conn.row_factory = sqlite3.Row
-
-                # Enable WAL mode for better concurrent read/write performance
-                # WAL allows multiple readers and one writer simultaneously
-                try:
-                    # Force WAL mode before any operations
-                    conn.execute("PRAGMA journal_mode=WAL").fetchone()
-                    conn.execute("PRAGMA synchronous=NORMAL")
-                    conn.execute("PRAGMA cache_size=10000")
-                    conn.execute("PRAGMA temp_store=MEMORY")
-                    conn.execute("PRAGMA busy_timeout=60000")  # 60 seconds in milliseconds
-                    conn.execute("PRAGMA wal_autocheckpoint=1000")  # Checkpoint every 1000 pages
-                    conn.commit()  # Commit pragma changes
-                except sqlite3.OperationalError as e:
-                    # If WAL mode fails, continue with default journal mode
-                    logger.warning(f"Could not set WAL mode: {e}")
-
-                try:
-                    yield conn
-                finally:
-                    conn.close()
-                break  # Success, exit retry loop
-
             except sqlite3.OperationalError as e:
                 if "unable to open database file" in str(e) and attempt < max_retries - 1:
                     # Retry with exponential backoff
@@ -134,43 +324,437 @@ class SQLiteStore:
                     time.sleep(retry_delay)
                     retry_delay *= 2
                     continue
-                else:
-                    # Final attempt failed or different error
-                    raise
+                # Final attempt failed or different error
+                raise
+        raise sqlite3.OperationalError("unable to open database file")
+
+    @contextmanager
+    def _connection(self):
+        """
+        Context manager for a short-lived read-write connection
+
+        Used for ad-hoc access outside the regular write/read paths;
+        the connection is configured and closed on every use. Grouped
+        writes are flushed first so the connection sees them.
+        """
+        if self._pending_writes:
+            self.flush()
+
+        conn = self._open_with_retry(str(self.db_path))
+        try:
+            self._configure_connection(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """Return the shared writer, opening it on first use (caller holds _writer_lock)"""
+        if self._writer is None:
+            conn = self._open_with_retry(str(self.db_path), isolation_level=None)
+            try:
+                self._configure_connection(conn)
+            except Exception:
+                conn.close()
+                raise
+            self._writer = conn
+        return self._writer
+
+    @contextmanager
+    def _write_connection(self, deferred: bool = False):
+        """
+        Context manager for the shared writer connection
+
+        The writer is opened once (PRAGMAs applied once) and serialized
+        behind a lock. Each block runs inside a savepoint, so an error only
+        rolls back that block. The transaction is committed on exit unless
+        ``deferred`` is set, in which case the write joins the group commit
+        (COMMIT_BATCH_SIZE writes or COMMIT_DELAY seconds, or flush()).
+
+        Args:
+            deferred: Allow the commit to be grouped with later writes
+        """
+        with self._writer_lock:
+            conn = self._get_writer()
+            if not conn.in_transaction:
+                self._begin_immediate(conn)
+            conn.execute("SAVEPOINT write_block")
+            try:
+                yield conn
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK TO write_block")
+                    conn.execute("RELEASE write_block")
+                    if not self._pending_writes:
+                        conn.execute("ROLLBACK")
+                raise
+            # executescript() commits implicitly, ending the savepoint early
+            if conn.in_transaction:
+                conn.execute("RELEASE write_block")
+
+            if deferred:
+                self._pending_writes += 1
+                if self._pending_writes >= self.COMMIT_BATCH_SIZE:
+                    self._commit_locked()
+                elif self._flush_timer is None:
+                    self._start_flush_timer()
+            else:
+                self._commit_locked()
+
+        self._schedule_maintenance()
+
+    def _begin_immediate(self, conn: sqlite3.Connection):
+        """
+        Start a write transaction, retrying with backoff while the database is locked
+
+        BEGIN IMMEDIATE takes the RESERVED lock up front instead of
+        escalating from a deferred read lock on the first DML statement.
+        """
+        max_retries = 5
+        retry_delay = 0.1  # Start with 100ms
+
+        for attempt in range(max_retries):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if "database is locked" in str(e) and attempt < max_retries - 1:
+                    logger.debug(f"Write lock attempt {attempt + 1} failed, retrying...")
+                    time.sleep(retry_delay)
+                    retry_delay *= 2
+                    continue
+                raise
+
+    def _commit_locked(self):
+        """Commit the writer's open transaction (caller holds _writer_lock)"""
+        if self._writer is not None and self._writer.in_transaction:
+            self._writer.execute("COMMIT")
+        self._pending_writes = 0
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _start_flush_timer(self):
+        """Commit grouped writes after COMMIT_DELAY even if no more writes arrive"""
+        # Weak reference so a pending timer doesn't keep the store alive
+        store_ref = weakref.ref(self)
+
+        def flush_if_alive():
+            store = store_ref()
+            if store is not None:
+                store.flush()
+
+        self._flush_timer = threading.Timer(self.COMMIT_DELAY, flush_if_alive)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self):
+        """Commit any grouped writes that are still pending"""
+        with self._writer_lock:
+            self._commit_locked()
+
+    @contextmanager
+    def _read_connection(self):
+        """
+        Context manager for a pooled read-only connection
+
+        Readers are ``mode=ro`` connections checked out of a LIFO pool, so
+        getters skip the connect/PRAGMA cost, never contend with the writer
+        lock, and concurrent threads each get their own connection. Up to
+        READ_POOL_SIZE idle readers are kept (LIFO keeps the warmest page
+        cache in use); surplus ones are closed on return. Grouped writes are
+        flushed first so reads always see them.
+        """
+        if self._pending_writes:
+            self.flush()
+
+        try:
+            conn = self._reader_pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            self._release_reader(conn)
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open and configure a read-only connection for the pool"""
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        conn = self._open_with_retry(uri, isolation_level=None)
+        try:
+            self._configure_reader(conn)
+        except Exception:
+            conn.close()
+            raise
+        with self._readers_lock:
+            self._readers.append(conn)
+            self._readers_opened += 1
+        return conn
+
+    def _release_reader(self, conn: sqlite3.Connection):
+        """Return a reader to the pool, closing it if the pool is full"""
+        with self._readers_lock:
+            if conn not in self._readers:
+                return  # Already closed by close() while checked out
+            try:
+                self._reader_pool.put_nowait(conn)
+                return
+            except queue.Full:
+                self._readers.remove(conn)
+        conn.close()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """
+        Read connection pool counters
+
+        Returns:
+            Dictionary with open readers, idle pooled readers and readers opened so far
+        """
+        with self._readers_lock:
+            return {
+                "open": len(self._readers),
+                "idle": self._reader_pool.qsize(),
+                "opened": self._readers_opened,
+            }
+
+    def checkpoint(self, mode: str = "TRUNCATE") -> Dict[str, int]:
+        """
+        Checkpoint the WAL into the main database file
+
+        Automatic checkpoints are disabled (wal_autocheckpoint=0); writes
+        trigger a PASSIVE one in the background every CHECKPOINT_INTERVAL
+        seconds, and TRUNCATE (the default) can be called directly before
+        copying the database file.
+
+        PASSIVE never waits on readers, so it runs on its own short-lived
+        connection and writers keep going; the other modes wait on the busy
+        handler and hold the writer lock while they do.
+
+        Args:
+            mode: Checkpoint mode (PASSIVE, FULL, RESTART or TRUNCATE)
+
+        Returns:
+            Dictionary with busy flag, WAL frame count and frames checkpointed
+        """
+        mode = mode.upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+        if mode == "PASSIVE":
+            if self._pending_writes:
+                self.flush()
+            conn = self._open_with_retry(str(self.db_path))
+            try:
+                row = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            finally:
+                conn.close()
+        else:
+            with self._writer_lock:
+                self._commit_locked()
+                row = self._get_writer().execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        self._last_checkpoint = time.monotonic()
+
+        logger.debug(f"WAL checkpoint ({mode}): {row[2]}/{row[1]} frames")
+        return {"busy": row[0], "log_frames": row[1], "checkpointed_frames": row[2]}
+
+    def reconcile_row_counters(self) -> Dict[str, int]:
+        """
+        Reset row_counters to the tables' actual COUNT(*)
+
+        The counters are kept by triggers, so they stay exact for anything
+        written through SQL; this repairs drift left by external writers
+        (e.g. REPLACE on a connection without recursive triggers). Runs in
+        one write transaction so no insert lands between count and update.
+
+        Returns:
+            Corrected counts, keyed by table, for counters that had drifted
+        """
+        corrected = {}
+        with self._write_connection() as conn:
+            counters = dict(conn.execute("SELECT table_name, row_count FROM row_counters").fetchall())
+            for table in self.STATS_TABLES:
+                actual = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                if counters.get(table) != actual:
+                    conn.execute(
+                        "INSERT INTO row_counters (table_name, row_count) VALUES (?, ?) "
+                        "ON CONFLICT(table_name) DO UPDATE SET row_count = excluded.row_count",
+                        (table, actual),
+                    )
+                    corrected[table] = actual
+
+        if corrected:
+            logger.warning(f"Corrected drifted row counters: {corrected}")
+        return corrected
+
+    def optimize(self, mask: Optional[int] = None):
+        """
+        Run PRAGMA optimize to refresh query planner statistics where needed
+
+        Args:
+            mask: PRAGMA optimize bitmask (default SQLite's own, 0xfffe)
+        """
+        pragma = "PRAGMA optimize" if mask is None else f"PRAGMA optimize={int(mask)}"
+        with self._writer_lock:
+            self._commit_locked()
+            self._get_writer().execute(pragma)
+            self._last_optimize = time.monotonic()
+
+    def incremental_vacuum(self, pages: Optional[int] = None) -> int:
+        """
+        Release free pages to the filesystem without rewriting the database
+
+        Unlike VACUUM this needs no scratch copy of the file, so it is safe
+        to run when the disk is nearly full. Requires auto_vacuum=INCREMENTAL,
+        which is set on databases this store creates.
+
+        Args:
+            pages: Maximum number of pages to release (default all)
+
+        Returns:
+            Number of pages released
+        """
+        pragma = "PRAGMA incremental_vacuum"
+        if pages is not None:
+            pragma += f"({int(pages)})"
+        with self._writer_lock:
+            self._commit_locked()
+            conn = self._get_writer()
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            # executescript steps the pragma to completion; execute() frees one page
+            conn.executescript(pragma)
+            released = before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+        logger.debug(f"Incremental vacuum released {released} pages")
+        return released
+
+    def backup(self, dest_path: str, pages: Optional[int] = None) -> Path:
+        """
+        Copy the database to dest_path with SQLite's online backup API
+
+        Grouped writes are committed first. Pages are copied through SQLite
+        rather than the raw file, so committed WAL content is included and
+        the copy is consistent while other connections keep writing.
+
+        Args:
+            dest_path: Database file to create or overwrite
+            pages: Pages copied per step (default BACKUP_PAGES)
+
+        Returns:
+            Path of the backup
+        """
+        dest = sqlite3.connect(str(dest_path))
+        try:
+            with self._writer_lock:
+                self._commit_locked()
+                self._get_writer().backup(dest, pages=pages or self.BACKUP_PAGES)
+        finally:
+            dest.close()
+
+        logger.debug(f"Database backed up to {dest_path}")
+        return Path(dest_path)
+
+    def _schedule_maintenance(self):
+        """Start a background checkpoint/optimize if one is due"""
+        now = time.monotonic()
+        checkpoint_due = now - self._last_checkpoint >= self.CHECKPOINT_INTERVAL
+        optimize_due = now - self._last_optimize >= self.OPTIMIZE_INTERVAL
+        if not (checkpoint_due or optimize_due):
+            return
+
+        with self._maintenance_lock:
+            thread = self._maintenance_thread
+            if thread is not None and thread.is_alive():
+                return
+
+            # Claim the slot now so concurrent writers don't start a second run
+            if checkpoint_due:
+                self._last_checkpoint = now
+            if optimize_due:
+                self._last_optimize = now
+
+            self._maintenance_thread = threading.Thread(
+                target=self._run_maintenance,
+                args=(checkpoint_due, optimize_due),
+                name="logly-db-maintenance",
+                daemon=True,
+            )
+            self._maintenance_thread.start()
+
+    def _run_maintenance(self, checkpoint: bool, optimize: bool):
+        """Background maintenance body, keeps failures off the write path"""
+        try:
+            if checkpoint:
+                self.checkpoint("PASSIVE")
+            if optimize:
+                self.optimize()
+                self.reconcile_row_counters()
+        except sqlite3.Error as e:
+            logger.warning(f"Background database maintenance failed: {e}")
+
+    def close(self):
+        """Close the writer and all pooled reader connections"""
+        thread = self._maintenance_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        with self._writer_lock:
+            if self._writer is not None:
+                self._commit_locked()
+                self._writer.close()
+                self._writer = None
+
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            while True:
+                try:
+                    self._reader_pool.get_nowait()
+                except queue.Empty:
+                    break
+
+    def __del__(self):
+        # Connections sit in a reference cycle with their statement cache,
+        # so close explicitly to checkpoint the WAL as soon as the store goes away
+        try:
+            self.close()
+        except Exception:
+            pass
 
     # System Metrics Operations
     def insert_system_metric(self, metric: SystemMetric) -> int:
         """Insert a system metric record"""
-        with self._connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO system_metrics (
-                    timestamp, cpu_percent, cpu_count, memory_total,
-                    memory_available, memory_percent, disk_total, disk_used,
-                    disk_percent, disk_read_bytes, disk_write_bytes,
-                    load_1min, load_5min, load_15min
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    metric.timestamp,
-                    metric.cpu_percent,
-                    metric.cpu_count,
-                    metric.memory_total,
-                    metric.memory_available,
-                    metric.memory_percent,
-                    metric.disk_total,
-                    metric.disk_used,
-                    metric.disk_percent,
-                    metric.disk_read_bytes,
-                    metric.disk_write_bytes,
-                    metric.load_1min,
-                    metric.load_5min,
-                    metric.load_15min,
-                ),
-            )
-            conn.commit()
+        with self._write_connection(deferred=True) as conn:
+            cursor = conn.execute(self._INSERT_SYSTEM_METRIC, metric.as_insert_tuple())
             return cursor.lastrowid or 0
 
+    def insert_system_metrics(self, metrics: Iterable[SystemMetric]) -> int:
+        """
+        Insert many system metric records in one transaction
+
+        Args:
+            metrics: Metrics to insert
+
+        Returns:
+            Number of rows inserted
+        """
+        return self.insert_system_metrics_iter(metric.as_insert_tuple() for metric in metrics)
+
+    def insert_system_metrics_iter(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Insert raw system metric rows in one transaction
+
+        Rows are consumed lazily by executemany, so a generator of tuples
+        avoids building SystemMetric objects for bulk loads.
+
+        Args:
+            rows: Value tuples in SYSTEM_METRIC_COLUMNS order
+
+        Returns:
+            Number of rows inserted
+        """
+        with self._write_connection() as conn:
+            return conn.executemany(self._INSERT_SYSTEM_METRIC, rows).rowcount
+
     def get_system_metrics(
         self, start_time: int, end_time: int, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
@@ -182,93 +766,66 @@ class SQLiteStore:
             end_time: Unix timestamp end
             limit: Optional limit on number of results
         """
-        query = """
-            SELECT * FROM system_metrics
-            WHERE timestamp BETWEEN ? AND ?
-            ORDER BY timestamp DESC
-        """
-        if limit:
-            query += f" LIMIT {limit}"
+        query = self._SYSTEM_METRICS_QUERIES[(bool(limit),)]
+        params = (start_time, end_time, limit) if limit else (start_time, end_time)
 
-        with self._connection() as conn:
-            cursor = conn.execute(query, (start_time, end_time))
+        with self._read_connection() as conn:
+            cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
     # Network Metrics Operations
     def insert_network_metric(self, metric: NetworkMetric) -> int:
         """Insert a network metric record"""
-        with self._connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO network_metrics (
-                    timestamp, bytes_sent, bytes_recv, packets_sent,
-                    packets_recv, errors_in, errors_out, drops_in,
-                    drops_out, connections_established, connections_listen,
-                    connections_time_wait
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    metric.timestamp,
-                    metric.bytes_sent,
-                    metric.bytes_recv,
-                    metric.packets_sent,
-                    metric.packets_recv,
-                    metric.errors_in,
-                    metric.errors_out,
-                    metric.drops_in,
-                    metric.drops_out,
-                    metric.connections_established,
-                    metric.connections_listen,
-                    metric.connections_time_wait,
-                ),
-            )
-            conn.commit()
+        with self._write_connection(deferred=True) as conn:
+            cursor = conn.execute(self._INSERT_NETWORK_METRIC, metric.as_insert_tuple())
             return cursor.lastrowid or 0
 
+    def insert_network_metrics(self, metrics: Iterable[NetworkMetric]) -> int:
+        """
+        Insert many network metric records in one transaction
+
+        Args:
+            metrics: Metrics to insert
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = (metric.as_insert_tuple() for metric in metrics)
+        with self._write_connection() as conn:
+            return conn.executemany(self._INSERT_NETWORK_METRIC, rows).rowcount
+
     def get_network_metrics(
         self, start_time: int, end_time: int, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Get network metrics within time range"""
-        query = """
-            SELECT * FROM network_metrics
-            WHERE timestamp BETWEEN ? AND ?
-            ORDER BY timestamp DESC
-        """
-        if limit:
-            query += f" LIMIT {limit}"
+        query = self._NETWORK_METRICS_QUERIES[(bool(limit),)]
+        params = (start_time, end_time, limit) if limit else (start_time, end_time)
 
-        with self._connection() as conn:
-            cursor = conn.execute(query, (start_time, end_time))
+        with self._read_connection() as conn:
+            cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
     # Log Events Operations
     def insert_log_event(self, event: LogEvent) -> int:
         """Insert a log event record"""
-        data = event.to_dict()
-
-        with self._connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO log_events (
-                    timestamp, source, level, message, ip_address,
-                    user, service, action, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    data["timestamp"],
-                    data["source"],
-                    data.get("level"),
-                    data["message"],
-                    data.get("ip_address"),
-                    data.get("user"),
-                    data.get("service"),
-                    data.get("action"),
-                    data.get("metadata"),
-                ),
-            )
-            conn.commit()
+        with self._write_connection(deferred=True) as conn:
+            cursor = conn.execute(self._INSERT_LOG_EVENT, event.as_insert_tuple())
             return cursor.lastrowid or 0
 
+    def insert_log_events(self, events: Iterable[LogEvent]) -> int:
+        """
+        Insert many log event records in one transaction
+
+        Args:
+            events: Events to insert
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = (event.as_insert_tuple() for event in events)
+        with self._write_connection() as conn:
+            return conn.executemany(self._INSERT_LOG_EVENT, rows).rowcount
+
     def get_log_events(
         self,
         start_time: int,
@@ -287,23 +844,17 @@ class SQLiteStore:
             level: Filter by log level (INFO, WARNING, ERROR)
             limit: Optional limit on number of results
         """
-        query = "SELECT * FROM log_events WHERE timestamp BETWEEN ? AND ?"
+        mask = (bool(source), bool(level), bool(limit))
+        query = self._LOG_EVENT_QUERIES[mask]
         params: List[Any] = [start_time, end_time]
-
-        if source:
-            query += " AND source = ?"
+        if mask[0]:
             params.append(source)
-
-        if level:
-            query += " AND level = ?"
+        if mask[1]:
             params.append(level)
+        if mask[2]:
+            params.append(limit)
 
-        query += " ORDER BY timestamp DESC"
-
-        if limit:
-            query += f" LIMIT {limit}"
-
-        with self._connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
@@ -317,7 +868,9 @@ class SQLiteStore:
         """
         hour_end = hour_timestamp + 3600  # One hour later
 
-        with self._connection() as conn:
+        # Only the final INSERT OR REPLACE needs the writer; the reads
+        # run on a read-only connection checked out of the shared pool
+        with self._read_connection() as conn:
             # Compute system metrics aggregates
             sys_stats = conn.execute(
                 """
@@ -347,35 +900,36 @@ class SQLiteStore:
                 (hour_timestamp, hour_end),
             ).fetchone()
 
-            # Compute log event counts
+            # Compute log event counts; each selective count reads only its
+            # partial index instead of rescanning the hour of log_events
             log_stats = conn.execute(
                 """
                 SELECT
-                    COUNT(*) as total_events,
-                    SUM(CASE WHEN action = 'failed_login' THEN 1 ELSE 0 END) as failed_logins,
-                    SUM(CASE WHEN action = 'banned' THEN 1 ELSE 0 END) as banned_ips,
-                    SUM(CASE WHEN level = 'ERROR' THEN 1 ELSE 0 END) as errors,
-                    SUM(CASE WHEN level = 'WARNING' THEN 1 ELSE 0 END) as warnings
-                FROM log_events
-                WHERE timestamp >= ? AND timestamp < ?
+                    (SELECT COUNT(*) FROM log_events
+                     WHERE timestamp >= :start AND timestamp < :end) as total_events,
+                    (SELECT COUNT(*) FROM log_events INDEXED BY idx_log_events_failed_login_ts
+                     WHERE action = 'failed_login'
+                       AND timestamp >= :start AND timestamp < :end) as failed_logins,
+                    (SELECT COUNT(*) FROM log_events INDEXED BY idx_log_events_banned_ts
+                     WHERE action = 'banned'
+                       AND timestamp >= :start AND timestamp < :end) as banned_ips,
+                    (SELECT COUNT(*) FROM log_events INDEXED BY idx_log_events_error_ts
+                     WHERE level = 'ERROR'
+                       AND timestamp >= :start AND timestamp < :end) as errors,
+                    (SELECT COUNT(*) FROM log_events INDEXED BY idx_log_events_warning_ts
+                     WHERE level = 'WARNING'
+                       AND timestamp >= :start AND timestamp < :end) as warnings
             """,
-                (hour_timestamp, hour_end),
+                {"start": hour_timestamp, "end": hour_end},
             ).fetchone()
 
-            # Only insert if we have at least some data
-            # COUNT(*) always returns a value, but AVG/SUM return None if no rows
-            if log_stats["total_events"] > 0 or sys_stats["avg_cpu"] is not None or net_stats["total_sent"] is not None:
-                # Insert or replace hourly aggregate
+        # Only insert if we have at least some data
+        # COUNT(*) always returns a value, but AVG/SUM return None if no rows
+        if log_stats["total_events"] > 0 or sys_stats["avg_cpu"] is not None or net_stats["total_sent"] is not None:
+            # Insert or update hourly aggregate
+            with self._write_connection() as conn:
                 conn.execute(
-                    """
-                    INSERT OR REPLACE INTO hourly_aggregates (
-                        hour_timestamp, avg_cpu_percent, max_cpu_percent,
-                        avg_memory_percent, max_memory_percent, avg_disk_percent,
-                        total_bytes_sent, total_bytes_recv, total_packets_sent,
-                        total_packets_recv, log_events_count, failed_login_count,
-                        banned_ip_count, error_count, warning_count
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                    self._UPSERT_HOURLY_AGGREGATE,
                     (
                         hour_timestamp,
                         sys_stats["avg_cpu"],
@@ -394,10 +948,9 @@ class SQLiteStore:
                         log_stats["warnings"] or 0,
                     ),
                 )
-                conn.commit()
-                logger.debug(f"Computed hourly aggregates for timestamp {hour_timestamp}")
-            else:
-                logger.debug(f"No data to aggregate for hour {hour_timestamp}")
+            logger.debug(f"Computed hourly aggregates for timestamp {hour_timestamp}")
+        else:
+            logger.debug(f"No data to aggregate for hour {hour_timestamp}")
 
     def compute_daily_aggregates(self, date_str: str):
         """
@@ -406,9 +959,18 @@ class SQLiteStore:
         Args:
             date_str: Date in YYYY-MM-DD format
         """
-        with self._connection() as conn:
-            # Use hourly aggregates if available, otherwise raw data
-            sys_stats = conn.execute(
+        # Explicit UTC day bounds (what date(ts, 'unixepoch') compared against)
+        # keep the timestamp indexes usable
+        day_start = int(
+            datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+        )
+        day_end = day_start + 86400
+
+        # As for hourly aggregates, the reads use a pooled read-only connection
+        with self._read_connection() as conn:
+            # Roll up the day's hourly aggregates; metric and log event
+            # totals come from the same single range scan
+            day_stats = conn.execute(
                 """
                 SELECT
                     AVG(avg_cpu_percent) as avg_cpu,
@@ -417,25 +979,16 @@ class SQLiteStore:
                     MAX(max_memory_percent) as max_mem,
                     AVG(avg_disk_percent) as avg_disk,
                     SUM(total_bytes_sent) as total_sent,
-                    SUM(total_bytes_recv) as total_recv
-                FROM hourly_aggregates
-                WHERE date(hour_timestamp, 'unixepoch') = ?
-            """,
-                (date_str,),
-            ).fetchone()
-
-            log_stats = conn.execute(
-                """
-                SELECT
+                    SUM(total_bytes_recv) as total_recv,
                     SUM(log_events_count) as total_events,
                     SUM(failed_login_count) as failed_logins,
                     SUM(banned_ip_count) as banned_ips,
                     SUM(error_count) as errors,
                     SUM(warning_count) as warnings
                 FROM hourly_aggregates
-                WHERE date(hour_timestamp, 'unixepoch') = ?
+                WHERE hour_timestamp >= ? AND hour_timestamp < ?
             """,
-                (date_str,),
+                (day_start, day_end),
             ).fetchone()
 
             # Count unique IPs and users for the day
@@ -445,41 +998,33 @@ class SQLiteStore:
                     COUNT(DISTINCT ip_address) as unique_banned_ips,
                     COUNT(DISTINCT user) as unique_failed_users
                 FROM log_events
-                WHERE date(timestamp, 'unixepoch') = ?
+                WHERE timestamp >= ? AND timestamp < ?
             """,
-                (date_str,),
+                (day_start, day_end),
             ).fetchone()
 
-            # Insert or replace daily aggregate
+        # Insert or update daily aggregate
+        with self._write_connection() as conn:
             conn.execute(
-                """
-                INSERT OR REPLACE INTO daily_aggregates (
-                    date, avg_cpu_percent, max_cpu_percent, avg_memory_percent,
-                    max_memory_percent, avg_disk_percent, total_bytes_sent,
-                    total_bytes_recv, log_events_count, failed_login_count,
-                    banned_ip_count, error_count, warning_count,
-                    unique_ips_banned, unique_users_failed
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+                self._UPSERT_DAILY_AGGREGATE,
                 (
                     date_str,
-                    sys_stats["avg_cpu"],
-                    sys_stats["max_cpu"],
-                    sys_stats["avg_mem"],
-                    sys_stats["max_mem"],
-                    sys_stats["avg_disk"],
-                    sys_stats["total_sent"],
-                    sys_stats["total_recv"],
-                    log_stats["total_events"],
-                    log_stats["failed_logins"],
-                    log_stats["banned_ips"],
-                    log_stats["errors"],
-                    log_stats["warnings"],
+                    day_stats["avg_cpu"],
+                    day_stats["max_cpu"],
+                    day_stats["avg_mem"],
+                    day_stats["max_mem"],
+                    day_stats["avg_disk"],
+                    day_stats["total_sent"],
+                    day_stats["total_recv"],
+                    day_stats["total_events"],
+                    day_stats["failed_logins"],
+                    day_stats["banned_ips"],
+                    day_stats["errors"],
+                    day_stats["warnings"],
                     unique_stats["unique_banned_ips"],
                     unique_stats["unique_failed_users"],
                 ),
             )
-            conn.commit()
 
         logger.debug(f"Computed daily aggregates for date {date_str}")
 
@@ -493,7 +1038,7 @@ class SQLiteStore:
         """
         cutoff_time = int(time.time()) - (retention_days * 86400)
 
-        with self._connection() as conn:
+        with self._write_connection() as conn:
             cursor = conn.execute(
                 "DELETE FROM system_metrics WHERE timestamp < ?", (cutoff_time,)
             )
@@ -509,7 +1054,7 @@ class SQLiteStore:
             )
             deleted_log = cursor.rowcount
 
-            conn.commit()
+        self.incremental_vacuum()
 
         logger.info(
             f"Cleaned up old data: {deleted_sys} system metrics, "
@@ -518,36 +1063,26 @@ class SQLiteStore:
 
     def get_stats(self) -> Dict[str, int]:
         """Get database statistics"""
-        with self._connection() as conn:
-            stats = {}
-
-            for table in [
-                "system_metrics",
-                "network_metrics",
-                "log_events",
-                "hourly_aggregates",
-                "daily_aggregates",
-                "event_traces",
-                "process_traces",
-                "network_traces",
-                "error_traces",
-                "ip_reputation",
-                "trace_patterns"
-            ]:
-                try:
-                    count = conn.execute(
-                        f"SELECT COUNT(*) as count FROM {table}"
-                    ).fetchone()
-                    stats[table] = count["count"]
-                except Exception:
-                    # Table might not exist yet
-                    stats[table] = 0
+        stats = {table: 0 for table in self.STATS_TABLES}
 
-            # Database size
-            size = self.db_path.stat().st_size
-            stats["database_size_mb"] = round(size / (1024 * 1024), 2)
+        with self._read_connection() as conn:
+            # Row counts are maintained by triggers (see schema.sql), so this
+            # is a single lookup instead of a COUNT(*) scan per table
+            try:
+                for row in conn.execute(
+                    "SELECT table_name, row_count FROM row_counters"
+                ):
+                    if row["table_name"] in stats:
+                        stats[row["table_name"]] = row["row_count"]
+            except sqlite3.OperationalError:
+                # Counters table might not exist yet
+                pass
 
-            return stats
+        # Database size
+        size = self.db_path.stat().st_size
+        stats["database_size_mb"] = round(size / (1024 * 1024), 2)
+
+        return stats
 
     # =============================================================================
     # TRACER SYSTEM METHODS
@@ -564,7 +1099,7 @@ class SQLiteStore:
         Returns:
             Trace ID
         """
-        with self._connection() as conn:
+        with self._write_connection() as conn:
             cursor = conn.execute("""
                 INSERT INTO event_traces (
                     event_id, timestamp, source, level, severity_score,
@@ -610,41 +1145,42 @@ class SQLiteStore:
             if trace.get('ip_info'):
                 self._update_ip_reputation(conn, trace['ip_info'])
 
-            conn.commit()
             return trace_id
 
+    @staticmethod
+    def _process_trace_row(trace_id: int, proc: Dict, timestamp: int) -> tuple:
+        """Build the process_traces parameter tuple for one process snapshot"""
+        status = proc.get('status', {})
+        stats = proc.get('stats', {})
+        io_stats = proc.get('io', {})
+
+        return (
+            trace_id, proc['pid'], proc.get('name'), proc.get('cmdline'),
+            status.get('state'), proc.get('parent_pid'),
+            status.get('vm_rss', 0), status.get('vm_size', 0),
+            stats.get('utime', 0), stats.get('stime', 0), status.get('threads', 0),
+            io_stats.get('read_bytes', 0), io_stats.get('write_bytes', 0),
+            io_stats.get('read_syscalls', 0), io_stats.get('write_syscalls', 0),
+            timestamp
+        )
+
     def _insert_process_traces(self, conn, trace_id: int, processes: List[Dict], timestamp: int):
         """Insert process trace records"""
-        for proc in processes:
-            status = proc.get('status', {})
-            stats = proc.get('stats', {})
-            io_stats = proc.get('io', {})
-
-            conn.execute("""
-                INSERT INTO process_traces (
-                    trace_id, pid, name, cmdline, state, parent_pid,
-                    memory_rss, memory_vm, cpu_utime, cpu_stime, threads,
-                    read_bytes, write_bytes, read_syscalls, write_syscalls, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trace_id, proc['pid'], proc.get('name'), proc.get('cmdline'),
-                status.get('state'), proc.get('parent_pid'),
-                status.get('vm_rss', 0), status.get('vm_size', 0),
-                stats.get('utime', 0), stats.get('stime', 0), status.get('threads', 0),
-                io_stats.get('read_bytes', 0), io_stats.get('write_bytes', 0),
-                io_stats.get('read_syscalls', 0), io_stats.get('write_syscalls', 0),
-                timestamp
-            ))
+        rows = [self._process_trace_row(trace_id, proc, timestamp) for proc in processes]
+
+        # One prepared statement for the whole batch
+        conn.executemany("""
+            INSERT INTO process_traces (
+                trace_id, pid, name, cmdline, state, parent_pid,
+                memory_rss, memory_vm, cpu_utime, cpu_stime, threads,
+                read_bytes, write_bytes, read_syscalls, write_syscalls, timestamp
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
 
     def _insert_network_traces(self, conn, trace_id: int, connections: List[Dict], timestamp: int):
         """Insert network trace records"""
-        for conn_info in connections:
-            conn.execute("""
-                INSERT INTO network_traces (
-                    trace_id, local_ip, local_port, remote_ip, remote_port,
-                    state, protocol, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        rows = [
+            (
                 trace_id,
                 conn_info.get('local_ip'),
                 conn_info.get('local_port'),
@@ -653,7 +1189,16 @@ class SQLiteStore:
                 conn_info.get('state'),
                 conn_info.get('protocol', 'tcp'),
                 timestamp
-            ))
+            )
+            for conn_info in connections
+        ]
+
+        conn.executemany("""
+            INSERT INTO network_traces (
+                trace_id, local_ip, local_port, remote_ip, remote_port,
+                state, protocol, timestamp
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
 
     def _insert_error_trace(self, conn, trace_id: int, error_info: Dict):
         """Insert error trace record"""
@@ -683,57 +1228,35 @@ class SQLiteStore:
         ip = ip_info['ip']
         now = int(time.time())
 
-        # Check if exists
-        existing = conn.execute(
-            "SELECT * FROM ip_reputation WHERE ip = ?", (ip,)
-        ).fetchone()
-
-        if existing:
-            # Update
-            conn.execute("""
-                UPDATE ip_reputation SET
-                    type = ?,
-                    is_whitelisted = ?,
-                    is_blacklisted = ?,
-                    threat_score = ?,
-                    last_seen = ?,
-                    total_events = total_events + 1,
-                    failed_login_count = ?,
-                    banned_count = ?,
-                    updated_at = ?
-                WHERE ip = ?
-            """, (
-                ip_info.get('type'),
-                1 if ip_info.get('is_whitelisted') else 0,
-                1 if ip_info.get('is_known_malicious') else 0,
-                ip_info.get('threat_score', 0),
-                now,
-                ip_info.get('failed_login_count', 0),
-                ip_info.get('banned_count', 0),
-                now,
-                ip
-            ))
-        else:
-            # Insert
-            conn.execute("""
-                INSERT INTO ip_reputation (
-                    ip, type, is_whitelisted, is_blacklisted, threat_score,
-                    first_seen, last_seen, total_events, failed_login_count,
-                    banned_count, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                ip,
-                ip_info.get('type'),
-                1 if ip_info.get('is_whitelisted') else 0,
-                1 if ip_info.get('is_known_malicious') else 0,
-                ip_info.get('threat_score', 0),
-                now,
-                now,
-                1,
-                ip_info.get('failed_login_count', 0),
-                ip_info.get('banned_count', 0),
-                now
-            ))
+        # Single UPSERT: insert new IPs, bump counters on existing ones
+        conn.execute("""
+            INSERT INTO ip_reputation (
+                ip, type, is_whitelisted, is_blacklisted, threat_score,
+                first_seen, last_seen, total_events, failed_login_count,
+                banned_count, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?, ?)
+            ON CONFLICT(ip) DO UPDATE SET
+                type = excluded.type,
+                is_whitelisted = excluded.is_whitelisted,
+                is_blacklisted = excluded.is_blacklisted,
+                threat_score = excluded.threat_score,
+                last_seen = excluded.last_seen,
+                total_events = ip_reputation.total_events + 1,
+                failed_login_count = excluded.failed_login_count,
+                banned_count = excluded.banned_count,
+                updated_at = excluded.updated_at
+        """, (
+            ip,
+            ip_info.get('type'),
+            1 if ip_info.get('is_whitelisted') else 0,
+            1 if ip_info.get('is_known_malicious') else 0,
+            ip_info.get('threat_score', 0),
+            now,
+            now,
+            ip_info.get('failed_login_count', 0),
+            ip_info.get('banned_count', 0),
+            now
+        ))
 
     def get_traces(self, start_time: int, end_time: int,
                    source: Optional[str] = None,
@@ -752,80 +1275,91 @@ class SQLiteStore:
         Returns:
             List of traces
         """
-        query = "SELECT * FROM event_traces WHERE timestamp BETWEEN ? AND ?"
+        mask = (bool(source), min_severity is not None, bool(limit))
+        query = self._TRACE_QUERIES[mask]
         params: List[Any] = [start_time, end_time]
-
-        if source:
-            query += " AND source = ?"
+        if mask[0]:
             params.append(source)
-
-        if min_severity is not None:
-            query += " AND severity_score >= ?"
+        if mask[1]:
             params.append(min_severity)
+        if mask[2]:
+            params.append(limit)
 
-        query += " ORDER BY timestamp DESC"
-
-        if limit:
-            query += f" LIMIT {limit}"
-
-        with self._connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
-    def get_ip_reputation(self, ip_address: str) -> Optional[Dict[str, Any]]:
-        """Get IP reputation info"""
-        with self._connection() as conn:
+    def get_ip_reputation(self, ip_address: str, raw: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get IP reputation info
+
+        Args:
+            ip_address: IP to look up
+            raw: Return the sqlite3.Row itself instead of copying it to a dict
+        """
+        with self._read_connection() as conn:
             row = conn.execute(
                 "SELECT * FROM ip_reputation WHERE ip = ?",
                 (ip_address,)
             ).fetchone()
 
             if row:
-                return dict(row)
+                return row if raw else dict(row)
         return None
 
-    def get_high_threat_ips(self, threshold: int = 70) -> List[Dict[str, Any]]:
-        """Get IPs with high threat scores"""
-        with self._connection() as conn:
-            cursor = conn.execute("""
+    def get_high_threat_ips(self, threshold: int = 70, raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get IPs with high threat scores
+
+        Args:
+            threshold: Minimum threat score
+            raw: Return sqlite3.Row objects (mapping access by column name)
+                 instead of copying each row to a dict
+        """
+        with self._read_connection() as conn:
+            rows = conn.execute("""
                 SELECT * FROM ip_reputation
                 WHERE threat_score >= ?
                 ORDER BY threat_score DESC, last_seen DESC
-            """, (threshold,))
-            return [dict(row) for row in cursor.fetchall()]
+            """, (threshold,)).fetchall()
+            return rows if raw else [dict(row) for row in rows]
 
     def get_error_patterns(self, start_time: int, end_time: int) -> Dict[str, Any]:
         """Get error pattern statistics"""
-        with self._connection() as conn:
-            # Count by error type
-            by_type = conn.execute("""
-                SELECT error_type, COUNT(*) as count
+        with self._read_connection() as conn:
+            # One grouped scan (covered by idx_error_traces_ts_type_category)
+            # feeds both the by-type and by-category counts
+            rows = conn.execute("""
+                SELECT error_type, error_category, COUNT(*) as count
                 FROM error_traces
                 WHERE timestamp BETWEEN ? AND ?
-                GROUP BY error_type
-                ORDER BY count DESC
+                GROUP BY error_type, error_category
             """, (start_time, end_time)).fetchall()
 
-            # Count by category
-            by_category = conn.execute("""
-                SELECT error_category, COUNT(*) as count
-                FROM error_traces
-                WHERE timestamp BETWEEN ? AND ?
-                GROUP BY error_category
-                ORDER BY count DESC
-            """, (start_time, end_time)).fetchall()
-
-            return {
-                'by_type': [dict(row) for row in by_type],
-                'by_category': [dict(row) for row in by_category],
-            }
+        by_type: Counter = Counter()
+        by_category: Counter = Counter()
+        for error_type, error_category, count in rows:
+            by_type[error_type] += count
+            by_category[error_category] += count
+
+        return {
+            'by_type': [
+                {'error_type': error_type, 'count': count}
+                for error_type, count in by_type.most_common()
+            ],
+            'by_category': [
+                {'error_category': error_category, 'count': count}
+                for error_category, count in by_category.most_common()
+            ],
+        }
 
     def get_error_traces(
         self,
         start_time: int,
         end_time: int,
         category: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        raw: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get individual error trace records within time range
@@ -835,22 +1369,19 @@ class SQLiteStore:
             end_time: End timestamp
             category: Optional error category filter
             limit: Result limit
+            raw: Return sqlite3.Row objects instead of copying each row to a dict
 
         Returns:
             List of error traces
         """
-        query = "SELECT * FROM error_traces WHERE timestamp BETWEEN ? AND ?"
+        mask = (bool(category), bool(limit))
+        query = self._ERROR_TRACE_QUERIES[mask]
         params: List[Any] = [start_time, end_time]
-
-        if category:
-            query += " AND error_category = ?"
+        if mask[0]:
             params.append(category)
+        if mask[1]:
+            params.append(limit)
 
-        query += " ORDER BY timestamp DESC"
-
-        if limit:
-            query += f" LIMIT {limit}"
-
-        with self._connection() as conn:
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        with self._read_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+            return rows if raw else [dict(row) for row in rows]
@@ -3,11 +3,17 @@ Error tracer - traces errors to their sources and contexts
 """
 
 import re
-from typing import Dict, Any, List, Optional
-from collections import Counter
+from bisect import bisect_left
+from typing import Deque, Dict, Any, List, Optional
+from collections import Counter, deque
 
 from logly.utils.logger import get_logger
 
+try:
+    import hyperscan
+except ImportError:  # Optional speedup; the re loop is used without it
+    hyperscan = None
+
 
 logger = get_logger(__name__)
 
@@ -15,15 +21,163 @@ logger = get_logger(__name__)
 class ErrorTracer:
     """Traces errors and exceptions to identify patterns and root causes"""
 
-    def __init__(self):
-        """Initialize error tracer"""
+    # Secondary extractions, compiled once instead of on every trace_error()
+    FILE_LOCATION_PATTERN = re.compile(
+        r'(?:File\s+|at\s+)(["\']?)([/\w.]+\.py)\1.*?(?:line\s+)?(\d+)', re.IGNORECASE
+    )
+    ERROR_CODE_PATTERN = re.compile(r'(?:error|errno|code)[:\s#]+(\d+)', re.IGNORECASE)
+
+    # Most recent errors kept for analysis; older ones are evicted
+    MAX_HISTORY = 100_000
+
+    # Literals every python_exception match contains
+    EXCEPTION_MARKERS = ('Error:', 'Exception:')
+
+    # Columns kept per traced error for analyze_error_patterns()
+    HISTORY_COLUMNS = ('error_type', 'error_category', 'source', 'severity', 'file_path', 'line_number')
+
+    # Upper bounds of the low/medium/high severity buckets (critical above)
+    SEVERITY_BOUNDS = (30, 60, 80)
+
+    # Severity inputs for _calculate_severity()
+    LEVEL_SCORES = {
+        'DEBUG': 0,
+        'INFO': 10,
+        'WARNING': 30,
+        'ERROR': 60,
+        'CRITICAL': 90,
+        'FATAL': 100,
+    }
+    CRITICAL_KEYWORDS = (
+        'fatal', 'critical', 'crash', 'panic', 'segfault',
+        'out of memory', 'disk full', 'deadlock'
+    )
+    DATABASE_KEYWORDS = ('database', 'sql', 'query')
+
+    # High-level category for each error pattern
+    ERROR_CATEGORIES = {
+        'python_exception': 'application',
+        'python_traceback': 'application',
+        'db_connection': 'database',
+        'db_query': 'database',
+        'db_deadlock': 'database',
+        'out_of_memory': 'resource',
+        'memory_leak': 'resource',
+        'disk_full': 'resource',
+        'disk_io': 'resource',
+        'connection_timeout': 'network',
+        'connection_refused': 'network',
+        'network_unreachable': 'network',
+        'permission_denied': 'security',
+        'file_not_found': 'filesystem',
+        'too_many_files': 'resource',
+        'resource_unavailable': 'resource',
+        'segmentation_fault': 'system',
+        'assertion_failed': 'application',
+    }
+
+    # Root cause hints by (category, error_type), falling back to the category
+    ROOT_CAUSE_HINTS = {
+        ('database', 'db_connection'): (
+            'Database service may be down or unreachable',
+            'Check network connectivity to database server',
+            'Verify database credentials and connection string',
+        ),
+        ('database', 'db_deadlock'): (
+            'Multiple transactions competing for same resources',
+            'Review transaction isolation levels',
+            'Optimize query order to avoid deadlocks',
+        ),
+        ('resource', 'out_of_memory'): (
+            'Application consuming too much memory',
+            'Check for memory leaks in application code',
+            'Consider increasing system memory or swap',
+        ),
+        ('resource', 'disk_full'): (
+            'Filesystem has run out of space',
+            'Check for large log files or temporary files',
+            'Review log rotation policies',
+        ),
+        ('resource', 'too_many_files'): (
+            'Process has exceeded open file limit',
+            'Check ulimit settings',
+            'Look for file descriptor leaks',
+        ),
+        ('network', 'connection_timeout'): (
+            'Remote service not responding in time',
+            'Network latency or bandwidth issues',
+            'Service may be overloaded',
+        ),
+        ('network', 'connection_refused'): (
+            'Service not running or not listening on expected port',
+            'Firewall may be blocking connection',
+            'Check service configuration',
+        ),
+    }
+    CATEGORY_ROOT_CAUSE_HINTS = {
+        'security': (
+            'Insufficient permissions to access resource',
+            'Check file/directory ownership and permissions',
+            'Verify process is running with correct user/group',
+        ),
+    }
+
+    # Recovery suggestions, looked up the same way; the general ones always follow
+    _MEMORY_RECOVERY = (
+        'Implement memory monitoring and alerting',
+        'Add automatic process restart on high memory usage',
+        'Profile application to find memory leaks',
+    )
+    RECOVERY_SUGGESTIONS = {
+        ('resource', 'out_of_memory'): _MEMORY_RECOVERY,
+        ('resource', 'memory_leak'): _MEMORY_RECOVERY,
+        ('resource', 'disk_full'): (
+            'Implement automatic log rotation',
+            'Add disk space monitoring and alerts',
+            'Clean up old temporary files regularly',
+        ),
+    }
+    CATEGORY_RECOVERY_SUGGESTIONS = {
+        'database': (
+            'Implement database connection retry logic with exponential backoff',
+            'Add database connection pooling',
+            'Set up database health checks',
+        ),
+        'network': (
+            'Implement retry logic with circuit breaker pattern',
+            'Add connection timeouts to prevent hanging',
+            'Set up health check endpoints',
+        ),
+    }
+    GENERAL_RECOVERY_SUGGESTIONS = (
+        'Add detailed logging around the error location',
+        'Set up alerting for this error type',
+    )
+
+    def __init__(self, max_history: int = MAX_HISTORY):
+        """
+        Initialize error tracer
+
+        Args:
+            max_history: Number of most recent errors to keep in the history
+        """
         self._error_patterns = self._load_error_patterns()
-        self._error_history = []
+        self._pattern_names = list(self._error_patterns)
+        self._hs_database = self._compile_hyperscan(self._error_patterns) if hyperscan else None
+        self._error_history = deque(maxlen=max_history)
+        self._error_columns: Dict[str, Deque[Any]] = {
+            col: deque(maxlen=max_history) for col in self.HISTORY_COLUMNS
+        }
+        # Per-bucket severity counts and (type, file, line) signature counts,
+        # kept in step with the bounded history
+        self._severity_counts = [0] * (len(self.SEVERITY_BOUNDS) + 1)
+        self._signature_counts: Counter = Counter()
 
     def _load_error_patterns(self) -> Dict[str, re.Pattern]:
         """Load regex patterns for error identification"""
         return {
-            # Python exceptions
+            # Python exceptions (kept first: trace_error() reuses their
+            # classification result instead of searching for them again)
             'python_exception': re.compile(r'(\w+(?:Error|Exception)):\s*(.+)'),
             'python_traceback': re.compile(r'Traceback \(most recent call last\)'),
 
@@ -58,6 +212,80 @@ class ErrorTracer:
             'assertion_failed': re.compile(r'assertion.+failed', re.IGNORECASE),
         }
 
+    @staticmethod
+    def _compile_hyperscan(patterns: Dict[str, re.Pattern]):
+        """
+        Compile all error patterns into one Hyperscan block-mode database
+
+        Pattern ids are the dict positions, so the lowest reported id is the
+        pattern the re loop would have picked. Returns None if Hyperscan
+        rejects a pattern, leaving classification on the re loop.
+        """
+        flags = []
+        for pattern in patterns.values():
+            pattern_flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+            if pattern.flags & re.IGNORECASE:
+                pattern_flags |= hyperscan.HS_FLAG_CASELESS
+            flags.append(pattern_flags)
+
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        try:
+            database.compile(
+                expressions=[pattern.pattern.encode('utf-8') for pattern in patterns.values()],
+                ids=list(range(len(patterns))),
+                flags=flags,
+            )
+        except hyperscan.error as e:
+            logger.warning(f"Hyperscan could not compile error patterns, using re: {e}")
+            return None
+        return database
+
+    def _classify(self, error_message: str):
+        """
+        Find the highest-priority error pattern matching the message
+
+        Returns:
+            Tuple of (error type, re match) or (None, None)
+        """
+        if self._hs_database is None:
+            return self._classify_re(error_message)
+
+        try:
+            data = error_message.encode('utf-8')
+        except UnicodeEncodeError:
+            # Lone surrogates (lines decoded with surrogateescape) have no
+            # UTF-8 form for Hyperscan to scan
+            return self._classify_re(error_message)
+
+        matched_ids = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            matched_ids.append(pattern_id)
+
+        self._hs_database.scan(data, match_event_handler=on_match)
+
+        # Confirm candidates with re (in priority order) for the match groups
+        for pattern_id in sorted(matched_ids):
+            error_type = self._pattern_names[pattern_id]
+            match = self._error_patterns[error_type].search(error_message)
+            if match:
+                return error_type, match
+        return None, None
+
+    def _classify_re(self, error_message: str):
+        """Pattern-by-pattern classification in priority order with re"""
+        patterns = iter(self._error_patterns.items())
+        # python_exception (first in priority) can only match where a
+        # word ending in Error/Exception is followed by ':'; skip its
+        # regex when neither literal is present
+        if not any(marker in error_message for marker in self.EXCEPTION_MARKERS):
+            next(patterns)
+        for error_type, pattern in patterns:
+            match = pattern.search(error_message)
+            if match:
+                return error_type, match
+        return None, None
+
     def trace_error(self, error_message: str, source: str = None, level: str = 'ERROR') -> Dict[str, Any]:
         """
         Trace an error message to extract context
@@ -70,6 +298,9 @@ class ErrorTracer:
         Returns:
             Error trace information
         """
+        # Lowercased once and shared with the helpers that need it
+        lowered = error_message.lower()
+
         trace = {
             'message': error_message,
             'source': source,
@@ -81,38 +312,38 @@ class ErrorTracer:
             'line_number': None,
             'error_code': None,
             'has_stacktrace': False,
-            'severity': self._calculate_severity(level, error_message),
+            'severity': self._calculate_severity(level, error_message, lowered),
             'root_cause_hints': [],
             'recovery_suggestions': [],
         }
 
         # Identify error type and category
-        for error_type, pattern in self._error_patterns.items():
-            if pattern.search(error_message):
-                if not trace['error_type']:
-                    trace['error_type'] = error_type
-                trace['error_category'] = self._categorize_error(error_type)
-                break
-
-        # Extract Python exception
-        exception_match = self._error_patterns['python_exception'].search(error_message)
-        if exception_match:
-            trace['exception_type'] = exception_match.group(1)
-            trace['error_details'] = exception_match.group(2)
-
-        # Check for traceback
-        if self._error_patterns['python_traceback'].search(error_message):
+        error_type, type_match = self._classify(error_message)
+        if error_type:
+            trace['error_type'] = error_type
+            # Inlined _categorize_error() lookup, saving a call per error
+            trace['error_category'] = self.ERROR_CATEGORIES.get(error_type, 'unknown')
+
+        # The loop tries python_exception, then python_traceback, first, so
+        # any other result means neither matched
+        if trace['error_type'] == 'python_exception':
+            trace['exception_type'] = type_match.group(1)
+            trace['error_details'] = type_match.group(2)
+            trace['has_stacktrace'] = bool(
+                self._error_patterns['python_traceback'].search(error_message)
+            )
+        elif trace['error_type'] == 'python_traceback':
             trace['has_stacktrace'] = True
 
         # Extract file and line number
-        file_match = re.search(r'(?:File\s+|at\s+)(["\']?)([/\w.]+\.py)\1.*?(?:line\s+)?(\d+)', error_message, re.IGNORECASE)
+        file_match = self.FILE_LOCATION_PATTERN.search(error_message)
         if file_match:
             trace['file_path'] = file_match.group(2)
             if file_match.group(3):
                 trace['line_number'] = int(file_match.group(3))
 
         # Extract error codes
-        code_match = re.search(r'(?:error|errno|code)[:\s#]+(\d+)', error_message, re.IGNORECASE)
+        code_match = self.ERROR_CODE_PATTERN.search(error_message)
         if code_match:
             trace['error_code'] = code_match.group(1)
 
@@ -122,161 +353,70 @@ class ErrorTracer:
         # Add recovery suggestions
         trace['recovery_suggestions'] = self._suggest_recovery(trace)
 
-        # Store in history
+        # Store in history, taking the evicted error (if any) out of the counts
+        columns = self._error_columns
+        severities = columns['severity']
+        if severities.maxlen == 0:
+            # max_history=0 keeps no history, so nothing is counted either
+            return trace
+        if severities and len(severities) == severities.maxlen:
+            self._severity_counts[bisect_left(self.SEVERITY_BOUNDS, severities[0])] -= 1
+            evicted = (columns['error_type'][0], columns['file_path'][0], columns['line_number'][0])
+            self._signature_counts[evicted] -= 1
+            if not self._signature_counts[evicted]:
+                del self._signature_counts[evicted]
+        self._severity_counts[bisect_left(self.SEVERITY_BOUNDS, trace['severity'])] += 1
+        self._signature_counts[trace['error_type'], trace['file_path'], trace['line_number']] += 1
+
         self._error_history.append(trace)
+        for col, values in columns.items():
+            values.append(trace.get(col))
 
         return trace
 
     def _categorize_error(self, error_type: str) -> str:
         """Categorize error into high-level categories"""
-        categories = {
-            'python_exception': 'application',
-            'python_traceback': 'application',
-            'db_connection': 'database',
-            'db_query': 'database',
-            'db_deadlock': 'database',
-            'out_of_memory': 'resource',
-            'memory_leak': 'resource',
-            'disk_full': 'resource',
-            'disk_io': 'resource',
-            'connection_timeout': 'network',
-            'connection_refused': 'network',
-            'network_unreachable': 'network',
-            'permission_denied': 'security',
-            'file_not_found': 'filesystem',
-            'too_many_files': 'resource',
-            'resource_unavailable': 'resource',
-            'segmentation_fault': 'system',
-            'assertion_failed': 'application',
-        }
-        return categories.get(error_type, 'unknown')
+        return self.ERROR_CATEGORIES.get(error_type, 'unknown')
 
-    def _calculate_severity(self, level: str, message: str) -> int:
+    def _calculate_severity(self, level: str, message: str, lowered: Optional[str] = None) -> int:
         """
         Calculate error severity (0-100)
 
         Args:
             level: Error level
             message: Error message
+            lowered: ``message.lower()``, if the caller already has it
 
         Returns:
             Severity score
         """
         # Base score on level
-        level_scores = {
-            'DEBUG': 0,
-            'INFO': 10,
-            'WARNING': 30,
-            'ERROR': 60,
-            'CRITICAL': 90,
-            'FATAL': 100,
-        }
-        score = level_scores.get(level.upper(), 50)
+        score = self.LEVEL_SCORES.get(level.upper(), 50)
+
+        if lowered is None:
+            lowered = message.lower()
 
         # Increase for critical keywords
-        critical_keywords = [
-            'fatal', 'critical', 'crash', 'panic', 'segfault',
-            'out of memory', 'disk full', 'deadlock'
-        ]
-        for keyword in critical_keywords:
-            if keyword in message.lower():
-                score += 15
-                break
+        if any(keyword in lowered for keyword in self.CRITICAL_KEYWORDS):
+            score += 15
 
         # Increase for database errors
-        if any(word in message.lower() for word in ['database', 'sql', 'query']):
+        if any(word in lowered for word in self.DATABASE_KEYWORDS):
             score += 10
 
-        return min(score, 100)
+        return score if score < 100 else 100
 
     def _identify_root_causes(self, trace: Dict[str, Any]) -> List[str]:
         """Identify potential root causes for an error"""
-        hints = []
-
-        error_type = trace.get('error_type')
-        category = trace.get('error_category')
-        message = trace.get('message', '').lower()
-
-        # Database errors
-        if category == 'database':
-            if error_type == 'db_connection':
-                hints.append('Database service may be down or unreachable')
-                hints.append('Check network connectivity to database server')
-                hints.append('Verify database credentials and connection string')
-            elif error_type == 'db_deadlock':
-                hints.append('Multiple transactions competing for same resources')
-                hints.append('Review transaction isolation levels')
-                hints.append('Optimize query order to avoid deadlocks')
-
-        # Resource errors
-        elif category == 'resource':
-            if error_type == 'out_of_memory':
-                hints.append('Application consuming too much memory')
-                hints.append('Check for memory leaks in application code')
-                hints.append('Consider increasing system memory or swap')
-            elif error_type == 'disk_full':
-                hints.append('Filesystem has run out of space')
-                hints.append('Check for large log files or temporary files')
-                hints.append('Review log rotation policies')
-            elif error_type == 'too_many_files':
-                hints.append('Process has exceeded open file limit')
-                hints.append('Check ulimit settings')
-                hints.append('Look for file descriptor leaks')
-
-        # Network errors
-        elif category == 'network':
-            if error_type == 'connection_timeout':
-                hints.append('Remote service not responding in time')
-                hints.append('Network latency or bandwidth issues')
-                hints.append('Service may be overloaded')
-            elif error_type == 'connection_refused':
-                hints.append('Service not running or not listening on expected port')
-                hints.append('Firewall may be blocking connection')
-                hints.append('Check service configuration')
-
-        # Permission errors
-        elif category == 'security':
-            hints.append('Insufficient permissions to access resource')
-            hints.append('Check file/directory ownership and permissions')
-            hints.append('Verify process is running with correct user/group')
-
-        return hints
+        key = (trace.get('error_category'), trace.get('error_type'))
+        hints = self.ROOT_CAUSE_HINTS.get(key) or self.CATEGORY_ROOT_CAUSE_HINTS.get(key[0], ())
+        return list(hints)
 
     def _suggest_recovery(self, trace: Dict[str, Any]) -> List[str]:
         """Suggest recovery actions for an error"""
-        suggestions = []
-
-        error_type = trace.get('error_type')
-        category = trace.get('error_category')
-
-        # Database errors
-        if category == 'database':
-            suggestions.append('Implement database connection retry logic with exponential backoff')
-            suggestions.append('Add database connection pooling')
-            suggestions.append('Set up database health checks')
-
-        # Resource errors
-        elif category == 'resource':
-            if error_type in ['out_of_memory', 'memory_leak']:
-                suggestions.append('Implement memory monitoring and alerting')
-                suggestions.append('Add automatic process restart on high memory usage')
-                suggestions.append('Profile application to find memory leaks')
-            elif error_type == 'disk_full':
-                suggestions.append('Implement automatic log rotation')
-                suggestions.append('Add disk space monitoring and alerts')
-                suggestions.append('Clean up old temporary files regularly')
-
-        # Network errors
-        elif category == 'network':
-            suggestions.append('Implement retry logic with circuit breaker pattern')
-            suggestions.append('Add connection timeouts to prevent hanging')
-            suggestions.append('Set up health check endpoints')
-
-        # General suggestions
-        suggestions.append('Add detailed logging around the error location')
-        suggestions.append('Set up alerting for this error type')
-
-        return suggestions
+        key = (trace.get('error_category'), trace.get('error_type'))
+        suggestions = self.RECOVERY_SUGGESTIONS.get(key) or self.CATEGORY_RECOVERY_SUGGESTIONS.get(key[0], ())
+        return [*suggestions, *self.GENERAL_RECOVERY_SUGGESTIONS]
 
     def analyze_error_patterns(self, time_window: int = 3600) -> Dict[str, Any]:
         """
@@ -306,33 +446,15 @@ class ErrorTracer:
             'recurring_errors': [],
         }
 
-        error_signatures = Counter()
-
-        for trace in self._error_history:
-            # Count by type and category
-            if trace.get('error_type'):
-                analysis['by_type'][trace['error_type']] += 1
-
-            if trace.get('error_category'):
-                analysis['by_category'][trace['error_category']] += 1
-
-            if trace.get('source'):
-                analysis['by_source'][trace['source']] += 1
+        columns = self._error_columns
 
-            # Count by severity
-            severity = trace.get('severity', 0)
-            if severity <= 30:
-                analysis['by_severity']['low'] += 1
-            elif severity <= 60:
-                analysis['by_severity']['medium'] += 1
-            elif severity <= 80:
-                analysis['by_severity']['high'] += 1
-            else:
-                analysis['by_severity']['critical'] += 1
+        # Count by type, category and source (C-level Counter over each column)
+        analysis['by_type'].update(filter(None, columns['error_type']))
+        analysis['by_category'].update(filter(None, columns['error_category']))
+        analysis['by_source'].update(filter(None, columns['source']))
 
-            # Create error signature for recurring detection
-            signature = f"{trace.get('error_type')}:{trace.get('file_path')}:{trace.get('line_number')}"
-            error_signatures[signature] += 1
+        # Severity buckets are counted as errors are traced
+        analysis['by_severity'] = dict(zip(analysis['by_severity'], self._severity_counts))
 
         # Find top errors
         analysis['top_errors'] = [
@@ -340,10 +462,11 @@ class ErrorTracer:
             for error_type, count in analysis['by_type'].most_common(10)
         ]
 
-        # Find recurring errors (same signature multiple times)
+        # Find recurring errors (same type, file and line multiple times);
+        # signatures are counted as errors are traced
         analysis['recurring_errors'] = [
-            {'signature': sig, 'count': count}
-            for sig, count in error_signatures.items()
+            {'signature': f"{error_type}:{file_path}:{line_number}", 'count': count}
+            for (error_type, file_path, line_number), count in self._signature_counts.items()
             if count > 1
         ]
 
@@ -351,8 +474,12 @@ class ErrorTracer:
 
     def get_error_timeline(self) -> List[Dict[str, Any]]:
         """Get chronological error timeline"""
-        return self._error_history.copy()
+        return list(self._error_history)
 
     def clear_history(self):
         """Clear error history"""
         self._error_history.clear()
+        for values in self._error_columns.values():
+            values.clear()
+        self._severity_counts = [0] * len(self._severity_counts)
+        self._signature_counts.clear()
@@ -2,8 +2,9 @@
 Event tracer - traces events to their sources and contexts
 """
 
-import re
-from typing import Dict, Any, List, Optional
+from collections import Counter
+from operator import attrgetter
+from typing import Dict, Any, List, Optional, Tuple
 
 from logly.storage.models import LogEvent
 from logly.utils.logger import get_logger
@@ -15,23 +16,58 @@ logger = get_logger(__name__)
 class EventTracer:
     """Traces events to their sources, processes, and contexts"""
 
+    # Base severity score for each log level
+    LEVEL_SCORES = {
+        'DEBUG': 0,
+        'INFO': 10,
+        'WARNING': 30,
+        'ERROR': 60,
+        'CRITICAL': 90,
+    }
+
+    # Actions that raise an event's severity
+    SECURITY_ACTIONS = frozenset(('ban', 'failed_login', 'unauthorized'))
+
+    # Causality keyword families. 'out of memory' and 'no space' are left
+    # out because 'memory' and 'space' already match them.
+    MEMORY_KEYWORDS = ('memory', 'oom')
+    DISK_KEYWORDS = ('disk', 'space')
+
+    # Services commonly involved alongside each log source
+    SERVICE_RELATIONSHIPS = {
+        'fail2ban': ('ssh', 'nginx', 'apache', 'auth'),
+        'nginx': ('django', 'gunicorn', 'uwsgi', 'php-fpm'),
+        'apache': ('django', 'php', 'wsgi'),
+        'django': ('postgresql', 'mysql', 'redis', 'nginx', 'celery'),
+        'auth': ('ssh', 'fail2ban', 'pam'),
+        'postgresql': ('django', 'pgbouncer'),
+        'mysql': ('django', 'wordpress'),
+        'docker': ('nginx', 'redis', 'postgresql'),
+    }
+
     def __init__(self):
         """Initialize event tracer"""
-        self._service_patterns = self._load_service_patterns()
+        self._service_keywords = self._load_service_keywords()
+
+    def _load_service_keywords(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        Load keywords for identifying services in lowercased messages
 
-    def _load_service_patterns(self) -> Dict[str, re.Pattern]:
-        """Load regex patterns for identifying services"""
+        Plain substring checks: the optional ``[pid]`` suffix in log lines
+        doesn't change whether a service is mentioned, and str ``in`` is
+        several times faster than running a regex per service.
+        """
         return {
-            'nginx': re.compile(r'nginx(?:\[\d+\])?', re.IGNORECASE),
-            'apache': re.compile(r'apache2?(?:\[\d+\])?', re.IGNORECASE),
-            'django': re.compile(r'(?:django|gunicorn|uwsgi)(?:\[\d+\])?', re.IGNORECASE),
-            'postgresql': re.compile(r'postgres(?:ql)?(?:\[\d+\])?', re.IGNORECASE),
-            'mysql': re.compile(r'mysql(?:d)?(?:\[\d+\])?', re.IGNORECASE),
-            'redis': re.compile(r'redis(?:-server)?(?:\[\d+\])?', re.IGNORECASE),
-            'ssh': re.compile(r'sshd?(?:\[\d+\])?', re.IGNORECASE),
-            'fail2ban': re.compile(r'fail2ban(?:-server)?(?:\[\d+\])?', re.IGNORECASE),
-            'systemd': re.compile(r'systemd(?:\[\d+\])?', re.IGNORECASE),
-            'docker': re.compile(r'docker(?:d)?(?:\[\d+\])?', re.IGNORECASE),
+            'nginx': ('nginx',),
+            'apache': ('apache',),
+            'django': ('django', 'gunicorn', 'uwsgi'),
+            'postgresql': ('postgres',),
+            'mysql': ('mysql',),
+            'redis': ('redis',),
+            'ssh': ('ssh',),
+            'fail2ban': ('fail2ban',),
+            'systemd': ('systemd',),
+            'docker': ('docker',),
         }
 
     def trace_event(self, log_event: LogEvent) -> Dict[str, Any]:
@@ -82,20 +118,11 @@ class EventTracer:
         Returns:
             Severity score
         """
-        score = 0
-
         # Base score on log level
-        level_scores = {
-            'DEBUG': 0,
-            'INFO': 10,
-            'WARNING': 30,
-            'ERROR': 60,
-            'CRITICAL': 90,
-        }
-        score = level_scores.get(log_event.level or 'INFO', 10)
+        score = self.LEVEL_SCORES.get(log_event.level or 'INFO', 10)
 
         # Increase for security events
-        if log_event.action in ['ban', 'failed_login', 'unauthorized']:
+        if log_event.action in self.SECURITY_ACTIONS:
             score += 20
 
         # Increase for repeated events (if metadata indicates)
@@ -103,34 +130,22 @@ class EventTracer:
             score += 10
 
         # Cap at 100
-        return min(score, 100)
+        return score if score < 100 else 100
 
     def _identify_related_services(self, log_event: LogEvent) -> List[str]:
         """Identify services related to this event"""
-        related = []
-
         # Based on source
-        service_relationships = {
-            'fail2ban': ['ssh', 'nginx', 'apache', 'auth'],
-            'nginx': ['django', 'gunicorn', 'uwsgi', 'php-fpm'],
-            'apache': ['django', 'php', 'wsgi'],
-            'django': ['postgresql', 'mysql', 'redis', 'nginx', 'celery'],
-            'auth': ['ssh', 'fail2ban', 'pam'],
-            'postgresql': ['django', 'pgbouncer'],
-            'mysql': ['django', 'wordpress'],
-            'docker': ['nginx', 'redis', 'postgresql'],
-        }
-
-        if log_event.source in service_relationships:
-            related.extend(service_relationships[log_event.source])
+        related = set(self.SERVICE_RELATIONSHIPS.get(log_event.source, ()))
 
         # Based on message content
-        for service_name, pattern in self._service_patterns.items():
-            if pattern.search(log_event.message):
-                if service_name not in related:
-                    related.append(service_name)
+        message = log_event.message.lower()
+        related.update(
+            service_name
+            for service_name, keywords in self._service_keywords.items()
+            if any(keyword in message for keyword in keywords)
+        )
 
-        return list(set(related))  # Remove duplicates
+        return list(related)
 
     def _trace_causality(self, log_event: LogEvent) -> Optional[Dict[str, Any]]:
         """
@@ -143,6 +158,7 @@ class EventTracer:
             Causality chain information
         """
         causality = {}
+        message = log_event.message.lower()
 
         # For failed logins -> ban chain
         if log_event.action == 'ban' and log_event.source == 'fail2ban':
@@ -165,8 +181,8 @@ class EventTracer:
             causality['root_cause'] = 'invalid_credentials'
 
         # For connection errors
-        elif log_event.level == 'ERROR' and 'connection' in log_event.message.lower():
-            if 'timeout' in log_event.message.lower():
+        elif log_event.level == 'ERROR' and 'connection' in message:
+            if 'timeout' in message:
                 causality['trigger'] = 'connection_timeout'
                 causality['chain'] = [
                     {'step': 'connection_attempt', 'service': log_event.service},
@@ -175,7 +191,7 @@ class EventTracer:
                 ]
                 causality['root_cause'] = 'network_latency_or_service_unresponsive'
 
-            elif 'refused' in log_event.message.lower():
+            elif 'refused' in message:
                 causality['trigger'] = 'connection_refused'
                 causality['chain'] = [
                     {'step': 'connection_attempt', 'service': log_event.service},
@@ -185,7 +201,7 @@ class EventTracer:
 
         # For memory errors
         elif log_event.level in ['ERROR', 'CRITICAL']:
-            if any(keyword in log_event.message.lower() for keyword in ['memory', 'oom', 'out of memory']):
+            if any(keyword in message for keyword in self.MEMORY_KEYWORDS):
                 causality['trigger'] = 'memory_exhaustion'
                 causality['chain'] = [
                     {'step': 'memory_allocation_request', 'service': log_event.service},
@@ -194,7 +210,7 @@ class EventTracer:
                 ]
                 causality['root_cause'] = 'memory_leak_or_insufficient_resources'
 
-            elif any(keyword in log_event.message.lower() for keyword in ['disk', 'space', 'no space']):
+            elif any(keyword in message for keyword in self.DISK_KEYWORDS):
                 causality['trigger'] = 'disk_space_exhausted'
                 causality['chain'] = [
                     {'step': 'write_operation_attempted', 'service': log_event.service},
@@ -215,39 +231,20 @@ class EventTracer:
         Returns:
             Pattern analysis
         """
+        def count(field: str, skip_empty: bool = True) -> Counter:
+            values = map(attrgetter(field), events)
+            return Counter(filter(None, values) if skip_empty else values)
+
+        # Each Counter is one C-level pass over the events
         patterns = {
             'total_events': len(events),
-            'by_source': {},
-            'by_level': {},
-            'by_action': {},
-            'ip_frequency': {},
-            'user_frequency': {},
-            'service_frequency': {},
+            'by_source': count('source', skip_empty=False),
+            'by_level': count('level'),
+            'by_action': count('action'),
+            'ip_frequency': count('ip_address'),
+            'user_frequency': count('user'),
+            'service_frequency': count('service'),
             'time_distribution': {},
         }
 
-        for event in events:
-            # Count by source
-            patterns['by_source'][event.source] = patterns['by_source'].get(event.source, 0) + 1
-
-            # Count by level
-            if event.level:
-                patterns['by_level'][event.level] = patterns['by_level'].get(event.level, 0) + 1
-
-            # Count by action
-            if event.action:
-                patterns['by_action'][event.action] = patterns['by_action'].get(event.action, 0) + 1
-
-            # Count by IP
-            if event.ip_address:
-                patterns['ip_frequency'][event.ip_address] = patterns['ip_frequency'].get(event.ip_address, 0) + 1
-
-            # Count by user
-            if event.user:
-                patterns['user_frequency'][event.user] = patterns['user_frequency'].get(event.user, 0) + 1
-
-            # Count by service
-            if event.service:
-                patterns['service_frequency'][event.service] = patterns['service_frequency'].get(event.service, 0) + 1
-
         return patterns
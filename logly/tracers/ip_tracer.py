@@ -2,25 +2,124 @@
 IP tracer - traces IP addresses to their origin and reputation
 """
 
+import functools
+import heapq
+import ipaddress
 import re
+import socket
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from collections import defaultdict
+from typing import Dict, Any, Optional, List, Tuple
+from collections import Counter, OrderedDict, defaultdict
 
 from logly.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
+# Keys of the dict returned by IPTracer.trace_ip(), in order
+IP_TRACE_FIELDS = (
+    'ip', 'type', 'is_local', 'is_private', 'is_whitelisted',
+    'is_known_malicious', 'reverse_dns', 'first_seen', 'last_seen',
+    'activity_count', 'failed_login_count', 'banned_count', 'threat_score',
+)
+
+_ip_trace_values = attrgetter(*IP_TRACE_FIELDS)
+
+
+def _network_masks(*cidrs: str) -> Tuple[Tuple[int, int], ...]:
+    """(network, netmask) integer pairs for CIDR blocks"""
+    networks = map(ipaddress.ip_network, cidrs)
+    return tuple((int(net.network_address), int(net.netmask)) for net in networks)
+
+
+@functools.lru_cache(maxsize=65536)
+def _subnet_for(ip: str) -> Optional[str]:
+    """Class C subnet of an IPv4 address, memoized across calls"""
+    if ':' in ip:  # IPv6
+        return None
+
+    parts = ip.split('.')
+    if len(parts) >= 3:
+        return f"{parts[0]}.{parts[1]}.{parts[2]}.0/24"
+
+    return None
+
+
+class IPTrace:
+    """Cached trace of one IP address
+
+    Slotted rather than a dict per address, so large IP caches stay compact.
+    """
+
+    __slots__ = IP_TRACE_FIELDS
+
+    def __init__(
+        self,
+        ip: str,
+        type: str,
+        is_local: bool = False,
+        is_private: bool = False,
+        is_whitelisted: bool = False,
+        is_known_malicious: bool = False,
+        reverse_dns: Optional[str] = None,
+        first_seen: Optional[float] = None,
+        last_seen: Optional[float] = None,
+        activity_count: int = 0,
+        failed_login_count: int = 0,
+        banned_count: int = 0,
+        threat_score: int = 0,
+    ):
+        self.ip = ip
+        self.type = type
+        self.is_local = is_local
+        self.is_private = is_private
+        self.is_whitelisted = is_whitelisted
+        self.is_known_malicious = is_known_malicious
+        self.reverse_dns = reverse_dns
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.activity_count = activity_count
+        self.failed_login_count = failed_login_count
+        self.banned_count = banned_count
+        self.threat_score = threat_score
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return dict(zip(IP_TRACE_FIELDS, _ip_trace_values(self)))
+
 
 class IPTracer:
     """Traces IP addresses to determine origin, type, and behavior patterns"""
 
-    def __init__(self):
-        """Initialize IP tracer"""
-        self._ip_cache = {}
+    # Most recently used IP traces kept in the cache; older ones are evicted
+    MAX_CACHE_SIZE = 100_000
+
+    LOCAL_ADDRESSES = frozenset(('127.0.0.1', '::1', 'localhost', '0.0.0.0'))
+
+    # Private ranges, matched as ``address & netmask == network`` on the
+    # parsed integer address
+    PRIVATE_V4_NETWORKS = _network_masks('10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16')
+    PRIVATE_V6_NETWORKS = _network_masks('fc00::/7', 'fe80::/10')  # unique local, link-local
+
+    # Threat score at which an IP is exported as high threat and, once
+    # reached through activity, marked as known malicious
+    HIGH_THREAT_SCORE = 70
+
+    def __init__(self, max_cache_size: int = MAX_CACHE_SIZE):
+        """
+        Initialize IP tracer
+
+        Args:
+            max_cache_size: Number of IP traces to keep, least recently used evicted first
+        """
+        self._ip_cache: "OrderedDict[str, IPTrace]" = OrderedDict()
+        self._max_cache_size = max_cache_size
         self._known_malicious = set()
         self._whitelisted = set()
+        # Cached traces scoring HIGH_THREAT_SCORE or more, kept in step with
+        # every score change and eviction so exports skip the full cache
+        self._high_threat: Dict[str, IPTrace] = {}
 
     def trace_ip(self, ip_address: str) -> Dict[str, Any]:
         """
@@ -32,39 +131,55 @@ class IPTracer:
         Returns:
             IP trace information
         """
-        # Check cache
-        if ip_address in self._ip_cache:
-            return self._ip_cache[ip_address]
-
-        trace = {
-            'ip': ip_address,
-            'type': self._classify_ip(ip_address),
-            'is_local': self._is_local_ip(ip_address),
-            'is_private': self._is_private_ip(ip_address),
-            'is_whitelisted': ip_address in self._whitelisted,
-            'is_known_malicious': ip_address in self._known_malicious,
-            'reverse_dns': None,
-            'first_seen': None,
-            'last_seen': None,
-            'activity_count': 0,
-            'failed_login_count': 0,
-            'banned_count': 0,
-            'threat_score': 0,
-        }
+        return self._get_trace(ip_address).to_dict()
+
+    def _get_trace(self, ip_address: str) -> IPTrace:
+        """Cached trace record for an IP, creating it on first sight"""
+        # Check cache, marking a hit as most recently used
+        cached = self._ip_cache.get(ip_address)
+        if cached is not None:
+            self._ip_cache.move_to_end(ip_address)
+            return cached
+
+        # Each check runs once; the classification reuses the results
+        is_local = self._is_local_ip(ip_address)
+        is_private = self._is_private_ip(ip_address)
+
+        trace = IPTrace(
+            ip_address,
+            self._classify_ip(ip_address, is_local, is_private),
+            is_local=is_local,
+            is_private=is_private,
+            is_whitelisted=ip_address in self._whitelisted,
+            is_known_malicious=ip_address in self._known_malicious,
+        )
 
         # Calculate threat score
-        trace['threat_score'] = self._calculate_threat_score(trace)
+        trace.threat_score = self._calculate_threat_score(trace)
 
-        # Cache it
+        # Cache it, evicting the least recently used trace if full
         self._ip_cache[ip_address] = trace
+        self._track_threat(trace)
+        if len(self._ip_cache) > self._max_cache_size:
+            evicted_ip, _ = self._ip_cache.popitem(last=False)
+            self._high_threat.pop(evicted_ip, None)
 
         return trace
 
-    def _classify_ip(self, ip: str) -> str:
-        """Classify IP address type"""
-        if self._is_local_ip(ip):
+    def _classify_ip(
+        self, ip: str, is_local: Optional[bool] = None, is_private: Optional[bool] = None
+    ) -> str:
+        """
+        Classify IP address type
+
+        Args:
+            ip: IP address
+            is_local: ``_is_local_ip(ip)``, if the caller already has it
+            is_private: ``_is_private_ip(ip)``, if the caller already has it
+        """
+        if is_local if is_local is not None else self._is_local_ip(ip):
             return 'localhost'
-        elif self._is_private_ip(ip):
+        elif is_private if is_private is not None else self._is_private_ip(ip):
             return 'private'
         elif self._is_cloud_provider(ip):
             return 'cloud'
@@ -73,26 +188,24 @@ class IPTracer:
 
     def _is_local_ip(self, ip: str) -> bool:
         """Check if IP is localhost"""
-        return ip in ['127.0.0.1', '::1', 'localhost', '0.0.0.0']
+        return ip in self.LOCAL_ADDRESSES
 
     def _is_private_ip(self, ip: str) -> bool:
-        """Check if IP is in private range"""
-        if ip.startswith('192.168.'):
-            return True
-        if ip.startswith('10.'):
-            return True
-        if ip.startswith('172.'):
-            octets = ip.split('.')
-            if len(octets) >= 2:
-                try:
-                    second = int(octets[1])
-                    return 16 <= second <= 31
-                except ValueError:
-                    pass
-        if ip.startswith('fc00:') or ip.startswith('fd00:'):  # IPv6 private
-            return True
-        if ip.startswith('fe80:'):  # IPv6 link-local
-            return True
+        """Check if IP is in a private (or IPv6 link-local) range"""
+        if ':' in ip:
+            # Drop any zone index (fe80::1%eth0) before parsing
+            family, networks, ip = socket.AF_INET6, self.PRIVATE_V6_NETWORKS, ip.partition('%')[0]
+        else:
+            family, networks = socket.AF_INET, self.PRIVATE_V4_NETWORKS
+
+        try:
+            address = int.from_bytes(socket.inet_pton(family, ip), 'big')
+        except (OSError, ValueError):
+            return False
+
+        for network, netmask in networks:
+            if address & netmask == network:
+                return True
         return False
 
     def _is_cloud_provider(self, ip: str) -> bool:
@@ -102,7 +215,7 @@ class IPTracer:
         # For now, this is just a placeholder
         return False
 
-    def _calculate_threat_score(self, trace: Dict[str, Any]) -> int:
+    def _calculate_threat_score(self, trace: IPTrace) -> int:
         """
         Calculate threat score (0-100) for an IP
 
@@ -112,23 +225,20 @@ class IPTracer:
         Returns:
             Threat score
         """
-        score = 0
-
         # Base scoring
-        if trace['is_known_malicious']:
-            score += 90
-        elif trace['is_whitelisted']:
-            score = 0
-        elif trace['is_local'] or trace['is_private']:
+        if trace.is_known_malicious:
+            score = 90
+        elif trace.is_whitelisted or trace.is_local or trace.is_private:
             score = 0
         else:
             score = 10  # Unknown external IPs get base score
 
-        # Add points for suspicious activity
-        score += min(trace['failed_login_count'] * 5, 30)
-        score += min(trace['banned_count'] * 20, 40)
+        # Add points for suspicious activity (capped at 30 and 40)
+        failed = trace.failed_login_count * 5
+        banned = trace.banned_count * 20
+        score += (failed if failed < 30 else 30) + (banned if banned < 40 else 40)
 
-        return min(score, 100)
+        return score if score < 100 else 100
 
     def update_ip_activity(self, ip_address: str, activity_type: str):
         """
@@ -138,38 +248,51 @@ class IPTracer:
             ip_address: IP address
             activity_type: Type of activity (e.g., 'failed_login', 'banned')
         """
-        if ip_address not in self._ip_cache:
-            self.trace_ip(ip_address)
-
-        trace = self._ip_cache[ip_address]
-        trace['activity_count'] += 1
+        # Traces (or refreshes) the cached entry so active IPs stay resident
+        trace = self._get_trace(ip_address)
+        trace.activity_count += 1
 
         if activity_type == 'failed_login':
-            trace['failed_login_count'] += 1
+            trace.failed_login_count += 1
         elif activity_type == 'banned':
-            trace['banned_count'] += 1
+            trace.banned_count += 1
 
         # Recalculate threat score
-        trace['threat_score'] = self._calculate_threat_score(trace)
+        trace.threat_score = self._calculate_threat_score(trace)
 
         # Auto-mark as malicious if threshold exceeded
-        if trace['threat_score'] >= 70:
+        if trace.threat_score >= self.HIGH_THREAT_SCORE:
             self._known_malicious.add(ip_address)
-            trace['is_known_malicious'] = True
+            trace.is_known_malicious = True
+
+        self._track_threat(trace)
+
+    def _track_threat(self, trace: IPTrace):
+        """Add or drop a cached trace from the high-threat index after a score change"""
+        if trace.threat_score >= self.HIGH_THREAT_SCORE:
+            self._high_threat[trace.ip] = trace
+        else:
+            self._high_threat.pop(trace.ip, None)
 
     def whitelist_ip(self, ip_address: str):
         """Add IP to whitelist"""
         self._whitelisted.add(ip_address)
-        if ip_address in self._ip_cache:
-            self._ip_cache[ip_address]['is_whitelisted'] = True
-            self._ip_cache[ip_address]['threat_score'] = 0
+        trace = self._ip_cache.get(ip_address)
+        if trace is not None:
+            self._ip_cache.move_to_end(ip_address)
+            trace.is_whitelisted = True
+            trace.threat_score = 0
+            self._track_threat(trace)
 
     def blacklist_ip(self, ip_address: str):
         """Add IP to blacklist"""
         self._known_malicious.add(ip_address)
-        if ip_address in self._ip_cache:
-            self._ip_cache[ip_address]['is_known_malicious'] = True
-            self._ip_cache[ip_address]['threat_score'] = 100
+        trace = self._ip_cache.get(ip_address)
+        if trace is not None:
+            self._ip_cache.move_to_end(ip_address)
+            trace.is_known_malicious = True
+            trace.threat_score = 100
+            self._track_threat(trace)
 
     def analyze_ip_patterns(self, ip_addresses: List[str]) -> Dict[str, Any]:
         """
@@ -181,8 +304,11 @@ class IPTracer:
         Returns:
             Pattern analysis
         """
+        # Work per distinct IP, weighting the counts by occurrences
+        ip_activity = Counter(ip_addresses)
+
         patterns = {
-            'total_ips': len(set(ip_addresses)),
+            'total_ips': len(ip_activity),
             'by_type': defaultdict(int),
             'by_subnet': defaultdict(int),
             'by_country_code': defaultdict(int),  # Placeholder
@@ -190,30 +316,27 @@ class IPTracer:
             'high_activity_ips': [],
         }
 
-        ip_activity = defaultdict(int)
-
-        for ip in ip_addresses:
-            ip_activity[ip] += 1
-            trace = self.trace_ip(ip)
+        for ip, count in ip_activity.items():
+            trace = self._get_trace(ip)
 
             # Count by type
-            patterns['by_type'][trace['type']] += 1
+            patterns['by_type'][trace.type] += count
 
             # Count by subnet (Class C for IPv4)
-            subnet = self._get_subnet(ip)
+            subnet = _subnet_for(ip)
             if subnet:
-                patterns['by_subnet'][subnet] += 1
+                patterns['by_subnet'][subnet] += count
 
-            # Identify suspicious IPs
-            if trace['threat_score'] >= 50 and ip not in patterns['suspicious_ips']:
+            # Identify suspicious IPs (once each)
+            if trace.threat_score >= 50:
                 patterns['suspicious_ips'].append({
                     'ip': ip,
-                    'threat_score': trace['threat_score'],
-                    'type': trace['type'],
+                    'threat_score': trace.threat_score,
+                    'type': trace.type,
                 })
 
         # Find high-activity IPs
-        for ip, count in sorted(ip_activity.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for ip, count in heapq.nlargest(10, ip_activity.items(), key=itemgetter(1)):
             patterns['high_activity_ips'].append({
                 'ip': ip,
                 'count': count,
@@ -228,14 +351,7 @@ class IPTracer:
 
     def _get_subnet(self, ip: str) -> Optional[str]:
         """Get Class C subnet for IPv4"""
-        if ':' in ip:  # IPv6
-            return None
-
-        parts = ip.split('.')
-        if len(parts) >= 3:
-            return f"{parts[0]}.{parts[1]}.{parts[2]}.0/24"
-
-        return None
+        return _subnet_for(ip)
 
     def detect_ip_sweep(self, ip_addresses: List[str], threshold: int = 10) -> List[str]:
         """
@@ -248,12 +364,13 @@ class IPTracer:
         Returns:
             List of suspicious subnets
         """
-        subnet_counts = defaultdict(int)
+        subnet_counts = Counter()
 
-        for ip in ip_addresses:
-            subnet = self._get_subnet(ip)
+        # One subnet lookup per distinct IP, weighted by its occurrences
+        for ip, count in Counter(ip_addresses).items():
+            subnet = _subnet_for(ip)
             if subnet:
-                subnet_counts[subnet] += 1
+                subnet_counts[subnet] += count
 
         suspicious_subnets = [
             subnet for subnet, count in subnet_counts.items()
@@ -291,14 +408,14 @@ class IPTracer:
             'high_threat_ips': [
                 {
                     'ip': ip,
-                    'threat_score': trace['threat_score'],
-                    'activity_count': trace['activity_count'],
+                    'threat_score': trace.threat_score,
+                    'activity_count': trace.activity_count,
                 }
-                for ip, trace in self._ip_cache.items()
-                if trace['threat_score'] >= 70
+                for ip, trace in self._high_threat.items()
             ],
         }
 
     def clear_cache(self):
         """Clear IP cache"""
         self._ip_cache.clear()
+        self._high_threat.clear()
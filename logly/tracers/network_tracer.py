@@ -2,9 +2,14 @@
 Network tracer - traces network connections and traffic
 """
 
+from collections import Counter
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import functools
 import socket
+import struct
+import time
 
 from logly.utils.logger import get_logger
 
@@ -12,12 +17,75 @@ from logly.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# Hosts keep a small set of addresses in their connection tables, so the
+# same hex words come back in every snapshot; decode each one once
+@functools.lru_cache(maxsize=4096)
+def _hex_to_ipv4(ip_hex: str) -> str:
+    """Dotted IPv4 address from a little-endian 32-bit hex word"""
+    return socket.inet_ntoa(bytes.fromhex(ip_hex)[::-1])
+
+
+@functools.lru_cache(maxsize=4096)
+def _hex_to_ipv6(ip_hex: str) -> str:
+    """IPv6 address from four little-endian 32-bit hex words"""
+    packed = struct.pack('>4I', *struct.unpack('<4I', bytes.fromhex(ip_hex)))
+    return socket.inet_ntop(socket.AF_INET6, packed)
+
+
 class NetworkTracer:
     """Traces network connections and their relationships"""
 
-    def __init__(self):
-        """Initialize network tracer"""
-        self._connection_cache = {}
+    # Seconds a /proc/net/tcp[6] snapshot is reused by get_all_connections()
+    CONNECTION_TTL = 0.25
+
+    # Common local ports for each traceable service
+    SERVICE_PORTS = {
+        'ssh': frozenset((22,)),
+        'http': frozenset((80, 8000, 8080)),
+        'https': frozenset((443, 8443)),
+        'postgresql': frozenset((5432,)),
+        'mysql': frozenset((3306,)),
+        'redis': frozenset((6379,)),
+        'mongodb': frozenset((27017,)),
+        'nginx': frozenset((80, 443, 8000, 8080)),
+        'django': frozenset((8000, 8080)),
+    }
+
+    # States broken out by get_connection_stats(); the rest count as 'other'
+    STAT_STATES = {
+        'ESTABLISHED': 'established',
+        'LISTEN': 'listen',
+        'TIME_WAIT': 'time_wait',
+        'CLOSE_WAIT': 'close_wait',
+        'SYN_SENT': 'syn_sent',
+        'SYN_RECV': 'syn_recv',
+    }
+
+    # TCP state codes used in /proc/net/tcp[6]
+    TCP_STATES = {
+        '01': 'ESTABLISHED',
+        '02': 'SYN_SENT',
+        '03': 'SYN_RECV',
+        '04': 'FIN_WAIT1',
+        '05': 'FIN_WAIT2',
+        '06': 'TIME_WAIT',
+        '07': 'CLOSE',
+        '08': 'CLOSE_WAIT',
+        '09': 'LAST_ACK',
+        '0A': 'LISTEN',
+        '0B': 'CLOSING',
+    }
+
+    def __init__(self, connection_ttl: float = CONNECTION_TTL):
+        """
+        Initialize network tracer
+
+        Args:
+            connection_ttl: Seconds to reuse a connection snapshot before re-reading /proc
+        """
+        self._connection_ttl = connection_ttl
+        self._connections: Optional[List[Dict[str, Any]]] = None
+        self._connections_loaded_at = 0.0
 
     def trace_connection(self, local_addr: str, remote_addr: str) -> Dict[str, Any]:
         """
@@ -62,9 +130,25 @@ class NetworkTracer:
         """
         Get all active network connections
 
+        The lookups below all start here, so one snapshot of /proc is shared
+        for up to ``connection_ttl`` seconds; call refresh() to force a re-read.
+
         Returns:
             List of connection information
         """
+        now = time.monotonic()
+        if self._connections is None or now - self._connections_loaded_at >= self._connection_ttl:
+            self._connections = self._load_connections()
+            self._connections_loaded_at = now
+
+        return list(self._connections)
+
+    def refresh(self):
+        """Drop the cached connection snapshot"""
+        self._connections = None
+
+    def _load_connections(self) -> List[Dict[str, Any]]:
+        """Read and parse /proc/net/tcp and /proc/net/tcp6"""
         connections = []
 
         # Parse TCP connections (IPv4 and IPv6)
@@ -74,14 +158,12 @@ class NetworkTracer:
                 continue
 
             try:
-                with open(tcp_path, 'r') as f:
-                    # Skip header
-                    next(f)
-
-                    for line in f:
-                        conn = self._parse_connection_line(line, tcp_file)
-                        if conn:
-                            connections.append(conn)
+                # One read per file, then parse every line after the header
+                lines = tcp_path.read_text().splitlines()[1:]
+                parse = self._parse_connection_line
+                connections.extend(
+                    conn for conn in (parse(line, tcp_file) for line in lines) if conn
+                )
 
             except Exception as e:
                 logger.debug(f"Error reading {tcp_file}: {e}")
@@ -104,27 +186,12 @@ class NetworkTracer:
             local_ip, local_port = self._parse_hex_address(local_addr, source_file)
             remote_ip, remote_port = self._parse_hex_address(remote_addr, source_file)
 
-            # Map state codes
-            state_map = {
-                '01': 'ESTABLISHED',
-                '02': 'SYN_SENT',
-                '03': 'SYN_RECV',
-                '04': 'FIN_WAIT1',
-                '05': 'FIN_WAIT2',
-                '06': 'TIME_WAIT',
-                '07': 'CLOSE',
-                '08': 'CLOSE_WAIT',
-                '09': 'LAST_ACK',
-                '0A': 'LISTEN',
-                '0B': 'CLOSING',
-            }
-
             return {
                 'local_ip': local_ip,
                 'local_port': local_port,
                 'remote_ip': remote_ip,
                 'remote_port': remote_port,
-                'state': state_map.get(state, state),
+                'state': self.TCP_STATES.get(state, state),
                 'inode': inode,
             }
 
@@ -147,20 +214,15 @@ class NetworkTracer:
             ip_hex, port_hex = hex_addr.split(':')
             port = int(port_hex, 16)
 
-            # IPv4
+            # IPv4 (stored as a little-endian 32-bit hex word)
             if 'tcp6' not in source_file and len(ip_hex) == 8:
-                ip_int = int(ip_hex, 16)
-                ip = '.'.join([
-                    str((ip_int >> 0) & 0xFF),
-                    str((ip_int >> 8) & 0xFF),
-                    str((ip_int >> 16) & 0xFF),
-                    str((ip_int >> 24) & 0xFF),
-                ])
-                return ip, port
-
-            # IPv6 (simplified - just return hex for now)
-            else:
-                return ip_hex, port
+                return _hex_to_ipv4(ip_hex), port
+
+            # IPv6 (four little-endian 32-bit words)
+            if len(ip_hex) == 32:
+                return _hex_to_ipv6(ip_hex), port
+
+            return ip_hex, port
 
         except Exception:
             return hex_addr, 0
@@ -250,34 +312,12 @@ class NetworkTracer:
             Connection statistics
         """
         all_connections = self.get_all_connections()
+        counts = Counter(map(itemgetter('state'), all_connections))
 
-        stats = {
-            'total': len(all_connections),
-            'established': 0,
-            'listen': 0,
-            'time_wait': 0,
-            'close_wait': 0,
-            'syn_sent': 0,
-            'syn_recv': 0,
-            'other': 0,
-        }
-
-        for conn in all_connections:
-            state = conn['state'].lower()
-            if state == 'established':
-                stats['established'] += 1
-            elif state == 'listen':
-                stats['listen'] += 1
-            elif state == 'time_wait':
-                stats['time_wait'] += 1
-            elif state == 'close_wait':
-                stats['close_wait'] += 1
-            elif state == 'syn_sent':
-                stats['syn_sent'] += 1
-            elif state == 'syn_recv':
-                stats['syn_recv'] += 1
-            else:
-                stats['other'] += 1
+        stats = {'total': len(all_connections)}
+        for state, field in self.STAT_STATES.items():
+            stats[field] = counts.pop(state, 0)
+        stats['other'] = sum(counts.values())
 
         return stats
 
@@ -291,25 +331,9 @@ class NetworkTracer:
         Returns:
             List of connections for the service
         """
-        # Common service ports
-        service_ports = {
-            'ssh': [22],
-            'http': [80, 8000, 8080],
-            'https': [443, 8443],
-            'postgresql': [5432],
-            'mysql': [3306],
-            'redis': [6379],
-            'mongodb': [27017],
-            'nginx': [80, 443, 8000, 8080],
-            'django': [8000, 8080],
-        }
-
-        ports = service_ports.get(service_name.lower(), [])
+        ports = self.SERVICE_PORTS.get(service_name.lower())
         if not ports:
             return []
 
-        connections = []
-        for port in ports:
-            connections.extend(self.find_connections_by_port(port, local=True))
-
-        return connections
+        # One pass over the connections instead of a scan per port
+        return [conn for conn in self.get_all_connections() if conn['local_port'] in ports]
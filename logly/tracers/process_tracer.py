@@ -2,8 +2,13 @@
 Process tracer - traces system processes and their resource usage
 """
 
+import functools
+import os
+import re
+import time
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from logly.utils.logger import get_logger
 
@@ -11,12 +16,59 @@ from logly.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _per_snapshot(read):
+    """Memoize a per-PID /proc reader for the tracer's current snapshot window"""
+    @functools.wraps(read)
+    def cached(self, pid: int):
+        cache = self._snapshot_cache()
+        key = (read.__name__, pid)
+        if key not in cache:
+            cache[key] = read(self, pid)
+        return cache[key]
+    return cached
+
+
 class ProcessTracer:
     """Traces system processes and their relationships"""
 
-    def __init__(self):
-        """Initialize process tracer"""
+    # Seconds a snapshot derived from /proc is reused before re-reading
+    SNAPSHOT_TTL = 0.5
+
+    # /proc/[pid]/status fields kept by _get_status(), and their output keys
+    STATUS_FIELDS = {
+        'Name': 'name',
+        'State': 'state',
+        'PPid': 'ppid',
+        'Uid': 'uid',
+        'VmSize': 'vm_size',
+        'VmRSS': 'vm_rss',
+        'Threads': 'threads',
+        'voluntary_ctxt_switches': 'voluntary_switches',
+        'nonvoluntary_ctxt_switches': 'nonvoluntary_switches',
+    }
+    STATUS_PATTERN = re.compile(r'^(' + '|'.join(STATUS_FIELDS) + r'):[ \t]*(.*)$', re.MULTILINE)
+
+    def __init__(self, snapshot_ttl: float = SNAPSHOT_TTL):
+        """
+        Initialize process tracer
+
+        Args:
+            snapshot_ttl: Seconds to reuse /proc snapshots before re-reading them
+        """
         self._proc_path = Path('/proc')
+        self._snapshot_ttl = snapshot_ttl
+        self._children_index: Optional[Dict[int, List[int]]] = None
+        self._children_index_at = 0.0
+        self._proc_cache: Dict[Tuple[str, int], Any] = {}
+        self._proc_cache_at = 0.0
+
+    def _snapshot_cache(self) -> Dict[Tuple[str, int], Any]:
+        """Per-PID reads for the current snapshot window, reset once it expires"""
+        now = time.monotonic()
+        if now - self._proc_cache_at >= self._snapshot_ttl:
+            self._proc_cache = {}
+            self._proc_cache_at = now
+        return self._proc_cache
 
     def trace_process(self, pid: int) -> Optional[Dict[str, Any]]:
         """
@@ -85,59 +137,59 @@ class ProcessTracer:
 
         return traces
 
+    @_per_snapshot
     def _get_cmdline(self, pid: int) -> Optional[str]:
         """Get process command line"""
         try:
-            cmdline_path = self._proc_path / str(pid) / 'cmdline'
-            if cmdline_path.exists():
-                cmdline = cmdline_path.read_text()
-                return cmdline.replace('\x00', ' ').strip()
+            # Raw bytes skip the text-mode reader; args are NUL-separated
+            cmdline = (self._proc_path / str(pid) / 'cmdline').read_bytes()
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.debug(f"Error reading cmdline for {pid}: {e}")
-        return None
+            return None
+        return cmdline.replace(b'\x00', b' ').decode('utf-8', 'replace').strip()
 
+    @_per_snapshot
+    def _get_name(self, pid: int) -> Optional[str]:
+        """Get process name from /proc/[pid]/comm (what status reports as Name)"""
+        try:
+            comm = (self._proc_path / str(pid) / 'comm').read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Error reading name for {pid}: {e}")
+            return None
+        return comm.decode('utf-8', 'replace').rstrip('\n')
+
+    @_per_snapshot
     def _get_status(self, pid: int) -> Dict[str, Any]:
         """Get process status"""
         status = {}
 
         try:
-            status_path = self._proc_path / str(pid) / 'status'
-            if status_path.exists():
-                content = status_path.read_text()
-
-                for line in content.split('\n'):
-                    if ':' not in line:
-                        continue
-
-                    key, value = line.split(':', 1)
-                    key = key.strip().lower()
-                    value = value.strip()
-
-                    # Parse specific fields
-                    if key == 'name':
-                        status['name'] = value
-                    elif key == 'state':
-                        status['state'] = value.split()[0]
-                    elif key == 'ppid':
-                        status['ppid'] = int(value)
-                    elif key == 'uid':
-                        status['uid'] = value
-                    elif key == 'vmsize':
-                        status['vm_size'] = self._parse_memory(value)
-                    elif key == 'vmrss':
-                        status['vm_rss'] = self._parse_memory(value)
-                    elif key == 'threads':
-                        status['threads'] = int(value)
-                    elif key == 'voluntary_ctxt_switches':
-                        status['voluntary_switches'] = int(value)
-                    elif key == 'nonvoluntary_ctxt_switches':
-                        status['nonvoluntary_switches'] = int(value)
-
+            content = (self._proc_path / str(pid) / 'status').read_bytes().decode('utf-8', 'replace')
+
+            # Only the wanted lines are matched; the rest of the file is skipped in C
+            for field, value in self.STATUS_PATTERN.findall(content):
+                key = self.STATUS_FIELDS[field]
+                if key in ('name', 'uid'):
+                    status[key] = value.strip()
+                elif key == 'state':
+                    status[key] = value.split()[0]
+                elif key in ('vm_size', 'vm_rss'):
+                    status[key] = self._parse_memory(value)
+                else:
+                    status[key] = int(value)
+
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.debug(f"Error reading status for {pid}: {e}")
 
         return status
 
+    @_per_snapshot
     def _get_stats(self, pid: int) -> Dict[str, Any]:
         """Get process statistics from /proc/[pid]/stat"""
         stats = {}
@@ -170,6 +222,7 @@ class ProcessTracer:
 
         return stats
 
+    @_per_snapshot
     def _get_io_stats(self, pid: int) -> Dict[str, Any]:
         """Get process I/O statistics"""
         io_stats = {}
@@ -204,16 +257,24 @@ class ProcessTracer:
     def _count_open_files(self, pid: int) -> int:
         """Count open files for a process"""
         try:
-            fd_dir = self._proc_path / str(pid) / 'fd'
-            if fd_dir.exists():
-                return len(list(fd_dir.iterdir()))
+            # Count directory entries without building Path objects or a list
+            with os.scandir(self._proc_path / str(pid) / 'fd') as entries:
+                return sum(1 for _ in entries)
         except Exception:
-            pass
-        return 0
+            return 0
 
     def _get_child_processes(self, pid: int) -> List[int]:
         """Get child processes of a PID"""
-        children = []
+        now = time.monotonic()
+        if self._children_index is None or now - self._children_index_at >= self._snapshot_ttl:
+            self._children_index = self._build_children_index()
+            self._children_index_at = now
+
+        return list(self._children_index.get(pid, ()))
+
+    def _build_children_index(self) -> Dict[int, List[int]]:
+        """Map each parent PID to its children with one pass over /proc/[pid]/stat"""
+        children = defaultdict(list)
 
         try:
             for entry in self._proc_path.iterdir():
@@ -221,21 +282,17 @@ class ProcessTracer:
                     continue
 
                 try:
-                    stat_path = entry / 'stat'
-                    if stat_path.exists():
-                        content = stat_path.read_text()
-                        rparen = content.rfind(')')
-                        if rparen != -1:
-                            fields = content[rparen+2:].split()
-                            if len(fields) >= 2:
-                                ppid = int(fields[1])
-                                if ppid == pid:
-                                    children.append(int(entry.name))
+                    content = (entry / 'stat').read_text()
+                    rparen = content.rfind(')')
+                    if rparen != -1:
+                        fields = content[rparen+2:].split()
+                        if len(fields) >= 2:
+                            children[int(fields[1])].append(int(entry.name))
                 except Exception:
                     continue
 
         except Exception as e:
-            logger.debug(f"Error finding children of {pid}: {e}")
+            logger.debug(f"Error indexing child processes: {e}")
 
         return children
 
@@ -254,9 +311,8 @@ class ProcessTracer:
         pids = []
 
         try:
-            for entry in self._proc_path.iterdir():
-                if entry.name.isdigit():
-                    pids.append(int(entry.name))
+            with os.scandir(self._proc_path) as entries:
+                pids = [int(entry.name) for entry in entries if entry.name.isdigit()]
         except Exception as e:
             logger.error(f"Error listing processes: {e}")
 
@@ -265,20 +321,19 @@ class ProcessTracer:
     def find_process_by_name(self, name: str) -> List[int]:
         """Find processes by name"""
         matching_pids = []
+        name = name.lower()
 
         for pid in self.get_all_processes():
-            cmdline = self._get_cmdline(pid)
-            status = self._get_status(pid)
-
             # Check cmdline
-            if cmdline and name.lower() in cmdline.lower():
+            cmdline = self._get_cmdline(pid)
+            if cmdline and name in cmdline.lower():
                 matching_pids.append(pid)
                 continue
 
-            # Check process name
-            if status and status.get('name'):
-                if name.lower() in status['name'].lower():
-                    matching_pids.append(pid)
+            # Check process name (only read when the cmdline misses)
+            process_name = self._get_name(pid)
+            if process_name and name in process_name.lower():
+                matching_pids.append(pid)
 
         return matching_pids
 
@@ -10,6 +10,7 @@ from logly.utils.system_storage import (
     check_storage_critical,
     get_free_space_mb,
     get_free_space_gb,
+    clear_storage_cache,
 )
 from logly.utils.paths import (
     get_project_root,
@@ -37,6 +38,7 @@ __all__ = [
     "check_storage_critical",
     "get_free_space_mb",
     "get_free_space_gb",
+    "clear_storage_cache",
     # Path utilities (HARDCODED paths)
     "get_project_root",
     "get_logs_dir",
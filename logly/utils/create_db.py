@@ -3,7 +3,12 @@ Database initialization utility for Logly
 Creates and initializes the SQLite database with schema if it doesn't exist
 """
 
+import functools
+import importlib.resources
+import logging
+import os
 import sqlite3
+import stat
 from pathlib import Path
 from typing import Optional
 
@@ -14,6 +19,24 @@ from logly.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def load_schema_sql() -> str:
+    """
+    Text of the packaged logly/storage/schema.sql, read once per process
+
+    Raises:
+        FileNotFoundError: If schema.sql is not installed with the package
+    """
+    try:
+        # importlib.resources.files() is Python 3.9+; read_text() is the 3.8 API
+        if hasattr(importlib.resources, "files"):
+            resource = importlib.resources.files("logly.storage").joinpath("schema.sql")
+            return resource.read_text(encoding="utf-8")
+        return importlib.resources.read_text("logly.storage", "schema.sql", encoding="utf-8")
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Schema file not found in logly.storage: {e}")
+
+
 def db_exists() -> bool:
     """
     Check if the database file exists
@@ -21,8 +44,11 @@ def db_exists() -> bool:
     Returns:
         True if database file exists, False otherwise
     """
-    db_path = get_db_path()
-    return db_path.exists() and db_path.is_file()
+    # One stat() answers both "exists" and "is a regular file"
+    try:
+        return stat.S_ISREG(os.stat(get_db_path()).st_mode)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
 
 
 def create_database(force: bool = False) -> Path:
@@ -62,28 +88,28 @@ def create_database(force: bool = False) -> Path:
     # Ensure db directory exists
     db_dir = get_db_dir()
     db_dir.mkdir(parents=True, exist_ok=True)
-    logger.debug(f"Database directory ensured at {db_dir}")
-
-    # Find schema.sql file
-    # Schema is located at logly/storage/schema.sql
-    schema_path = Path(__file__).parent.parent / "storage" / "schema.sql"
+    logger.debug("Database directory ensured at %s", db_dir)
 
-    if not schema_path.exists():
-        raise FileNotFoundError(f"Schema file not found at {schema_path}")
+    # Schema is packaged as logly/storage/schema.sql
+    schema_sql = load_schema_sql()
 
     logger.info(f"Creating database at {db_path}")
 
+    conn = None
     try:
-        # Create database connection
-        conn = sqlite3.connect(db_path)
+        # Create database connection (autocommit; the schema transaction is explicit)
+        conn = sqlite3.connect(db_path, isolation_level=None)
 
-        # Read and execute schema
-        with open(schema_path, "r") as f:
-            schema_sql = f.read()
+        # Journal and sync settings first, so the schema is written under them;
+        # auto_vacuum can only be chosen before WAL and the first table
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
 
+        # One transaction for the whole schema instead of one per statement
         logger.debug("Executing database schema")
-        conn.executescript(schema_sql)
-        conn.commit()
+        conn.executescript(f"BEGIN IMMEDIATE;\n{schema_sql}\nCOMMIT;")
 
         # Verify tables were created
         cursor = conn.execute(
@@ -92,7 +118,8 @@ def create_database(force: bool = False) -> Path:
         tables = [row[0] for row in cursor.fetchall()]
 
         logger.info(f"Database created successfully with {len(tables)} tables")
-        logger.debug(f"Tables created: {', '.join(tables)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tables created: %s", ", ".join(tables))
 
         conn.close()
 
@@ -100,9 +127,12 @@ def create_database(force: bool = False) -> Path:
 
     except sqlite3.Error as e:
         logger.error(f"Failed to create database: {e}")
-        # Clean up partial database file if it was created
-        if db_path.exists():
-            db_path.unlink()
+        if conn is not None:
+            conn.close()
+        # Clean up partial database files if they were created
+        for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+            if path.exists():
+                path.unlink()
         raise
 
 
@@ -118,52 +148,69 @@ def initialize_db_if_needed() -> Path:
     """
     if db_exists():
         db_path = get_db_path()
-        logger.debug(f"Database already exists at {db_path}")
+        logger.debug("Database already exists at %s", db_path)
         return db_path
 
     logger.info("Database does not exist - initializing new database")
     return create_database(force=False)
 
 
-def get_db_info() -> Optional[dict]:
+def get_db_info(conn: Optional[sqlite3.Connection] = None) -> Optional[dict]:
     """
     Get information about the existing database
 
+    Args:
+        conn: Open connection to the database to query (e.g. a SQLiteStore
+            reader); path and size then describe that connection's database.
+            The hardcoded database is opened briefly when omitted
+
     Returns:
         Dictionary with database info or None if database doesn't exist
     """
-    if not db_exists():
-        return None
-
-    db_path = get_db_path()
+    own_conn = conn is None
+    if own_conn:
+        if not db_exists():
+            return None
+        db_path = str(get_db_path())
+    else:
+        # file is empty for in-memory databases
+        db_path = conn.execute(
+            "SELECT file FROM pragma_database_list WHERE name = 'main'"
+        ).fetchone()[0] or ":memory:"
 
     try:
-        conn = sqlite3.connect(db_path)
+        if own_conn:
+            conn = sqlite3.connect(db_path)
 
-        # Get table count
-        cursor = conn.execute(
-            "SELECT COUNT(*) FROM sqlite_master WHERE type='table'"
-        )
-        table_count = cursor.fetchone()[0]
-
-        # Get schema version from metadata
+        # Table count and schema version in one round trip; databases
+        # without a metadata table fall back to the count alone
         try:
-            cursor = conn.execute(
-                "SELECT value FROM metadata WHERE key='schema_version'"
-            )
-            schema_version = cursor.fetchone()
-            schema_version = schema_version[0] if schema_version else "unknown"
-        except sqlite3.Error:
+            table_count, schema_version = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM sqlite_master WHERE type='table'), "
+                "(SELECT value FROM metadata WHERE key='schema_version')"
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            if "no such table" not in str(e):
+                raise
+            table_count = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type='table'"
+            ).fetchone()[0]
+            schema_version = None
+        if schema_version is None:
             schema_version = "unknown"
 
-        # Get database size
-        size_bytes = db_path.stat().st_size
+        # Get database size; a caller's connection may not be a plain file,
+        # so measure it in pages (committed WAL pages included)
+        if own_conn:
+            size_bytes = os.stat(db_path).st_size
+        else:
+            size_bytes = conn.execute(
+                "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+            ).fetchone()[0]
         size_mb = round(size_bytes / (1024 * 1024), 2)
 
-        conn.close()
-
         return {
-            "path": str(db_path),
+            "path": db_path,
             "exists": True,
             "size_bytes": size_bytes,
             "size_mb": size_mb,
@@ -174,10 +221,13 @@ def get_db_info() -> Optional[dict]:
     except sqlite3.Error as e:
         logger.error(f"Failed to get database info: {e}")
         return {
-            "path": str(db_path),
+            "path": db_path,
             "exists": True,
             "error": str(e)
         }
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
 
 if __name__ == "__main__":
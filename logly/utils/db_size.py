@@ -3,9 +3,19 @@ Database size utility
 Calculate and report SQLite database file sizes
 """
 
+import os
 from pathlib import Path
 from typing import Dict, Union
 
+from logly.utils.system_storage import format_bytes
+
+
+# Exact reciprocals of the unit sizes (powers of two), so multiplying by
+# them rounds the same as dividing
+_INV_KB = 1 / (1 << 10)
+_INV_MB = 1 / (1 << 20)
+_INV_GB = 1 / (1 << 30)
+
 
 def get_db_size(db_path: Union[str, Path]) -> Dict[str, float]:
     """
@@ -22,9 +32,10 @@ def get_db_size(db_path: Union[str, Path]) -> Dict[str, float]:
         - size_gb: Size in gigabytes (float)
         - exists: Whether the file exists (bool)
     """
-    path = Path(db_path)
-
-    if not path.exists():
+    # A single stat answers both "does it exist" and "how big is it"
+    try:
+        size_bytes = os.stat(db_path).st_size
+    except (FileNotFoundError, NotADirectoryError):
         return {
             "size_bytes": 0,
             "size_kb": 0.0,
@@ -33,35 +44,17 @@ def get_db_size(db_path: Union[str, Path]) -> Dict[str, float]:
             "exists": False,
         }
 
-    size_bytes = path.stat().st_size
-
     return {
         "size_bytes": size_bytes,
-        "size_kb": round(size_bytes / 1024, 2),
-        "size_mb": round(size_bytes / (1024 * 1024), 2),
-        "size_gb": round(size_bytes / (1024 * 1024 * 1024), 3),
+        "size_kb": round(size_bytes * _INV_KB, 2),
+        "size_mb": round(size_bytes * _INV_MB, 2),
+        "size_gb": round(size_bytes * _INV_GB, 3),
         "exists": True,
     }
 
 
-def format_size(size_bytes: Union[int, float]) -> str:
-    """
-    Format bytes to human-readable string with appropriate unit
-
-    Args:
-        size_bytes: Size in bytes
-
-    Returns:
-        Formatted string like "1.23 MB" or "456.78 KB"
-    """
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+# One formatter for every size shown to users; "B" through "TB"
+format_size = format_bytes
 
 
 def get_db_info(db_path: Union[str, Path]) -> Dict[str, Union[str, int, float, bool]]:
@@ -74,11 +67,10 @@ def get_db_info(db_path: Union[str, Path]) -> Dict[str, Union[str, int, float, b
     Returns:
         Dictionary with path, size info, and formatted size string
     """
-    path = Path(db_path)
-    size_info = get_db_size(path)
+    size_info = get_db_size(db_path)
 
     return {
-        "path": str(path.absolute()),
+        "path": os.path.abspath(db_path),
         "exists": size_info["exists"],
         "size_bytes": size_info["size_bytes"],
         "size_mb": size_info["size_mb"],
@@ -5,13 +5,51 @@ Always logs verbosely (DEBUG level) without filtering
 """
 
 import logging
-from datetime import datetime
+import logging.handlers
+import time
+from datetime import date
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from logly.utils.paths import get_logs_dir
 
 
+class DailyFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    File handler that switches to a new date-named file at midnight
+
+    Rollover timing comes from TimedRotatingFileHandler (one float
+    comparison per record); instead of renaming the finished file, the
+    handler opens the next day's ``{name}-YYYY-MM-DD.log``.
+    """
+
+    def __init__(self, log_dir: Path, name: str):
+        self.log_dir = log_dir
+        self.name_prefix = name
+        self._cached_date: Optional[date] = None
+        self._cached_filename: Optional[Path] = None
+        super().__init__(self.dated_filename(), when='midnight')
+
+    def dated_filename(self) -> Path:
+        """Log file for the current date, rebuilt only when the date changes"""
+        today = date.today()
+        if today != self._cached_date:
+            self._cached_filename = self.log_dir / f"{self.name_prefix}-{today.isoformat()}.log"
+            self._cached_date = today
+        return self._cached_filename
+
+    def doRollover(self):
+        """Close today's file and continue in the new day's file"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        self.baseFilename = str(self.dated_filename().absolute())
+        self.rolloverAt = self.computeRollover(int(time.time()))
+        if not self.delay:
+            self.stream = self._open()
+
+
 class DailyRotatingLogger:
     """Logger that creates new files daily based on date"""
 
@@ -26,49 +64,37 @@ class DailyRotatingLogger:
         self.log_dir = get_logs_dir()
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.name = name
-        self.current_date = None
-        self.file_handler = None
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)  # Always verbose
         self.logger.propagate = True  # Propagate to root logger for testing
+        self._child_loggers: Dict[str, logging.Logger] = {}
         self._setup_handler()
 
     def _get_log_filename(self) -> Path:
         """Generate log filename based on current date"""
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        return self.log_dir / f"{self.name}-{date_str}.log"
+        return self.file_handler.dated_filename()
 
     def _setup_handler(self):
-        """Setup or rotate file handler based on date"""
-        current_date = datetime.now().date()
-
-        # Check if we need to rotate (new day)
-        if self.current_date != current_date:
-            # Remove old handler if exists
-            if self.file_handler:
-                self.logger.removeHandler(self.file_handler)
-                self.file_handler.close()
-
-            # Create new handler for today
-            log_file = self._get_log_filename()
-            self.file_handler = logging.FileHandler(log_file, mode='a')
-
-            # Verbose format with all details
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            self.file_handler.setFormatter(formatter)
+        """Attach the midnight-rotating file handler"""
+        self.file_handler = DailyFileHandler(self.log_dir, self.name)
+
+        # Verbose format with all details
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        self.file_handler.setFormatter(formatter)
 
-            self.logger.addHandler(self.file_handler)
-            self.current_date = current_date
+        self.logger.addHandler(self.file_handler)
 
-            # Log rotation event
-            self.logger.info(f"Log rotation: New log file created at {log_file}")
+        self.logger.info(f"Log rotation: New log file created at {self.file_handler.baseFilename}")
 
     def get_logger(self, module_name: str) -> logging.Logger:
         """
-        Get logger for a module, ensuring daily rotation
+        Get logger for a module
+
+        Rotation happens in the file handler as records are written, so
+        this is a dictionary lookup after the first call per module.
 
         Args:
             module_name: Name of the module requesting logger
@@ -76,11 +102,12 @@ class DailyRotatingLogger:
         Returns:
             Logger instance that will write to daily rotated files
         """
-        # Check if rotation needed (midnight passed)
-        self._setup_handler()
-
-        # Return child logger for the module
-        return logging.getLogger(f"{self.name}.{module_name}")
+        child = self._child_loggers.get(module_name)
+        if child is None:
+            child = self._child_loggers.setdefault(
+                module_name, logging.getLogger(f"{self.name}.{module_name}")
+            )
+        return child
 
 
 # Singleton instance
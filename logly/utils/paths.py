@@ -3,10 +3,73 @@ Path utilities for Logly
 Provides hardcoded paths for logs and database that cannot be changed
 """
 
+import functools
 import os
+import threading
 from pathlib import Path
 
 
+# This file is at: logly/utils/paths.py
+# Navigate up: paths.py -> utils -> logly -> project_root
+_PROJECT_ROOT = Path(__file__).parent.parent.parent.resolve()
+_LOGS_DIR = _PROJECT_ROOT / "logs"
+_DB_DIR = _PROJECT_ROOT / "db"
+_DB_PATH = _DB_DIR / "logly.db"
+
+# Snapshot of LOGLY_TEST_MODE; tests flip it with set_test_mode()
+_TEST_MODE: bool = os.environ.get("LOGLY_TEST_MODE") == "1"
+
+# Set once the logs/db directories have been created; reset by refresh()
+_DIRS_READY = False
+_dirs_lock = threading.Lock()
+
+
+def _ensure_dirs_once():
+    """Create the logs and db directories on first use"""
+    global _DIRS_READY
+    with _dirs_lock:
+        if not _DIRS_READY:
+            _LOGS_DIR.mkdir(parents=True, exist_ok=True)
+            _DB_DIR.mkdir(parents=True, exist_ok=True)
+            _DIRS_READY = True
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_absolute(path: str) -> Path:
+    """Resolved form of an absolute path string, memoized per string"""
+    return Path(path).resolve()
+
+
+def _resolve(path: str) -> Path:
+    """Resolved absolute form of a path string"""
+    # Relative paths depend on the current directory, so only absolute
+    # ones are memoized
+    if not os.path.isabs(path):
+        return Path(path).resolve()
+    return _resolve_absolute(path)
+
+
+def refresh():
+    """Forget memoized path resolutions and re-create directories on next use"""
+    global _DIRS_READY
+    _resolve_absolute.cache_clear()
+    _DIRS_READY = False
+
+
+def set_test_mode(flag: bool):
+    """
+    Enable or disable test mode for path validation
+
+    LOGLY_TEST_MODE is read once at import; call this when the variable
+    is changed afterwards (the test suite does so in conftest.py).
+
+    Args:
+        flag: True to allow any db/log path, False to enforce hardcoded paths
+    """
+    global _TEST_MODE
+    _TEST_MODE = bool(flag)
+
+
 def get_project_root() -> Path:
     """
     Get absolute path to project root (auto-detected using __file__)
@@ -21,11 +84,9 @@ def get_project_root() -> Path:
                 └── paths.py                <- this file (__file__)
 
     Returns:
-        Absolute Path to project root
+        Absolute Path to project root (resolved once at import)
     """
-    # This file is at: logly/utils/paths.py
-    # Navigate up: paths.py -> utils -> logly -> project_root
-    return Path(__file__).parent.parent.parent.resolve()
+    return _PROJECT_ROOT
 
 
 def get_logs_dir() -> Path:
@@ -33,14 +94,14 @@ def get_logs_dir() -> Path:
     Get logs directory path (HARDCODED to logly/logs)
 
     This path CANNOT be changed via configuration.
-    The directory will be created automatically if it doesn't exist.
+    The directory is created on first use (again after refresh()).
 
     Returns:
         Absolute Path to logs directory: {project_root}/logs/
     """
-    logs_dir = get_project_root() / "logs"
-    logs_dir.mkdir(parents=True, exist_ok=True)
-    return logs_dir
+    if not _DIRS_READY:
+        _ensure_dirs_once()
+    return _LOGS_DIR
 
 
 def get_db_dir() -> Path:
@@ -48,14 +109,14 @@ def get_db_dir() -> Path:
     Get database directory path (HARDCODED to logly/db)
 
     This path CANNOT be changed via configuration.
-    The directory will be created automatically if it doesn't exist.
+    The directory is created on first use (again after refresh()).
 
     Returns:
         Absolute Path to database directory: {project_root}/db/
     """
-    db_dir = get_project_root() / "db"
-    db_dir.mkdir(parents=True, exist_ok=True)
-    return db_dir
+    if not _DIRS_READY:
+        _ensure_dirs_once()
+    return _DB_DIR
 
 
 def get_db_path() -> Path:
@@ -63,19 +124,21 @@ def get_db_path() -> Path:
     Get database file path (HARDCODED to logly/db/logly.db)
 
     This path CANNOT be changed via configuration.
-    The parent directory will be created automatically if it doesn't exist.
+    The parent directory is created on first use (again after refresh()).
 
     Returns:
         Absolute Path to database file: {project_root}/db/logly.db
     """
-    return get_db_dir() / "logly.db"
+    if not _DIRS_READY:
+        _ensure_dirs_once()
+    return _DB_PATH
 
 
 def validate_db_path(db_path: str) -> bool:
     """
     Validate that a database path matches the hardcoded expected path
 
-    In test mode (LOGLY_TEST_MODE environment variable set), allows any path.
+    In test mode (LOGLY_TEST_MODE=1 at import, or set_test_mode(True)), allows any path.
     Otherwise, enforces hardcoded path.
 
     Args:
@@ -85,19 +148,17 @@ def validate_db_path(db_path: str) -> bool:
         True if path matches expected path or in test mode, False otherwise
     """
     # Allow any path in test mode
-    if os.environ.get("LOGLY_TEST_MODE") == "1":
+    if _TEST_MODE:
         return True
 
-    expected = get_db_path()
-    provided = Path(db_path).resolve()
-    return provided == expected
+    return _resolve(str(db_path)) == _DB_PATH
 
 
 def validate_log_dir(log_dir: str) -> bool:
     """
     Validate that a log directory matches the hardcoded expected path
 
-    In test mode (LOGLY_TEST_MODE environment variable set), allows any path.
+    In test mode (LOGLY_TEST_MODE=1 at import, or set_test_mode(True)), allows any path.
     Otherwise, enforces hardcoded path.
 
     Args:
@@ -107,9 +168,7 @@ def validate_log_dir(log_dir: str) -> bool:
         True if path matches expected path or in test mode, False otherwise
     """
     # Allow any path in test mode
-    if os.environ.get("LOGLY_TEST_MODE") == "1":
+    if _TEST_MODE:
         return True
 
-    expected = get_logs_dir()
-    provided = Path(log_dir).resolve()
-    return provided == expected
+    return _resolve(str(log_dir)) == _LOGS_DIR
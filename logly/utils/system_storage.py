@@ -4,7 +4,64 @@ Check filesystem storage space and usage
 """
 
 import os
-from typing import Dict, Union
+import time
+from typing import Dict, Tuple, Union
+
+
+_KB = 1 << 10
+_MB = 1 << 20
+_GB = 1 << 30
+_TB = 1 << 40
+
+# Seconds a statvfs result is reused for the same path; usage moves slowly
+# and pollers would otherwise pay one syscall per call
+STORAGE_CACHE_TTL = 1.0
+
+# path -> (time.monotonic() of the statvfs, (total, free, used))
+_storage_cache: Dict[str, Tuple[float, Tuple[int, int, int]]] = {}
+
+
+def clear_storage_cache():
+    """Drop cached statvfs results so the next call reads the filesystem"""
+    _storage_cache.clear()
+
+
+def _raw_statvfs(path: str) -> Tuple[int, int, int]:
+    """
+    (total, free, used) bytes of the filesystem holding path
+
+    Results are reused for STORAGE_CACHE_TTL seconds; failures are not cached.
+
+    Raises:
+        OSError: If the path doesn't exist or can't be accessed
+    """
+    path = os.fspath(path)  # str and Path callers share one cache entry
+    now = time.monotonic()
+    cached = _storage_cache.get(path)
+    if cached is not None and now - cached[0] < STORAGE_CACHE_TTL:
+        return cached[1]
+
+    try:
+        stat = os.statvfs(path)
+    except Exception as e:
+        raise OSError(f"Failed to get storage info for {path}: {e}")
+
+    total = stat.f_blocks * stat.f_frsize
+    free = stat.f_bavail * stat.f_frsize
+    usage = (total, free, total - free)
+    _storage_cache[path] = (now, usage)
+    return usage
+
+
+def _usage_at_least(path: str, threshold_percent: float) -> bool:
+    """Whether usage of path's filesystem is at or above threshold_percent"""
+    try:
+        total, _, used = _raw_statvfs(path)
+    except OSError:
+        return False
+
+    percent_used = 100.0 * used / total if total > 0 else 0.0
+    return percent_used >= threshold_percent
 
 
 def get_storage_info(path: str = "/") -> Dict[str, Union[str, int, float]]:
@@ -25,25 +82,19 @@ def get_storage_info(path: str = "/") -> Dict[str, Union[str, int, float]]:
     Raises:
         OSError: If the path doesn't exist or can't be accessed
     """
-    try:
-        stat = os.statvfs(path)
-        total = stat.f_blocks * stat.f_frsize
-        free = stat.f_bavail * stat.f_frsize
-        used = total - free
-
-        percent_used = 0.0
-        if total > 0:
-            percent_used = round(100.0 * used / total, 2)
-
-        return {
-            "path": path,
-            "total_bytes": total,
-            "free_bytes": free,
-            "used_bytes": used,
-            "percent_used": percent_used,
-        }
-    except Exception as e:
-        raise OSError(f"Failed to get storage info for {path}: {e}")
+    total, free, used = _raw_statvfs(path)
+
+    percent_used = 0.0
+    if total > 0:
+        percent_used = round(100.0 * used / total, 2)
+
+    return {
+        "path": path,
+        "total_bytes": total,
+        "free_bytes": free,
+        "used_bytes": used,
+        "percent_used": percent_used,
+    }
 
 
 def format_bytes(size_bytes: Union[int, float]) -> str:
@@ -56,16 +107,16 @@ def format_bytes(size_bytes: Union[int, float]) -> str:
     Returns:
         Formatted string like "1.23 GB" or "456.78 MB"
     """
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
-    elif size_bytes < 1024 * 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    if size_bytes < _KB:
+        return f"{int(size_bytes)} B"  # whole bytes, even for float input
+    elif size_bytes < _MB:
+        return f"{size_bytes / _KB:.2f} KB"
+    elif size_bytes < _GB:
+        return f"{size_bytes / _MB:.2f} MB"
+    elif size_bytes < _TB:
+        return f"{size_bytes / _GB:.2f} GB"
     else:
-        return f"{size_bytes / (1024 * 1024 * 1024 * 1024):.2f} TB"
+        return f"{size_bytes / _TB:.2f} TB"
 
 
 def get_storage_summary(path: str = "/") -> Dict[str, str]:
@@ -78,12 +129,8 @@ def get_storage_summary(path: str = "/") -> Dict[str, str]:
     Returns:
         Dictionary with human-readable formatted values
     """
-    info = get_storage_info(path)
-
-    total_bytes = int(info["total_bytes"])
-    used_bytes = int(info["used_bytes"])
-    free_bytes = int(info["free_bytes"])
-    percent_used = float(info["percent_used"])
+    total_bytes, free_bytes, used_bytes = _raw_statvfs(path)
+    percent_used = round(100.0 * used_bytes / total_bytes, 2) if total_bytes > 0 else 0.0
 
     return {
         "path": path,
@@ -105,11 +152,7 @@ def check_storage_warning(path: str = "/", threshold_percent: float = 90.0) -> b
     Returns:
         True if storage usage is above threshold, False otherwise
     """
-    try:
-        info = get_storage_info(path)
-        return float(info["percent_used"]) >= threshold_percent
-    except OSError:
-        return False
+    return _usage_at_least(path, threshold_percent)
 
 
 def check_storage_critical(path: str = "/", threshold_percent: float = 95.0) -> bool:
@@ -123,11 +166,7 @@ def check_storage_critical(path: str = "/", threshold_percent: float = 95.0) ->
     Returns:
         True if storage usage is above critical threshold, False otherwise
     """
-    try:
-        info = get_storage_info(path)
-        return float(info["percent_used"]) >= threshold_percent
-    except OSError:
-        return False
+    return _usage_at_least(path, threshold_percent)
 
 
 def get_free_space_mb(path: str = "/") -> float:
@@ -140,9 +179,7 @@ def get_free_space_mb(path: str = "/") -> float:
     Returns:
         Free space in MB
     """
-    info = get_storage_info(path)
-    free_bytes = int(info["free_bytes"])
-    return round(free_bytes / (1024 * 1024), 2)
+    return round(_raw_statvfs(path)[1] / _MB, 2)
 
 
 def get_free_space_gb(path: str = "/") -> float:
@@ -155,6 +192,4 @@ def get_free_space_gb(path: str = "/") -> float:
     Returns:
         Free space in GB
     """
-    info = get_storage_info(path)
-    free_bytes = int(info["free_bytes"])
-    return round(free_bytes / (1024 * 1024 * 1024), 2)
+    return round(_raw_statvfs(path)[1] / _GB, 2)
@@ -8,22 +8,22 @@ from pathlib import Path
 import threading
 
 from logly.storage.sqlite_store import SQLiteStore
-from logly.storage.models import SystemMetric
 
 def insert_metrics(store, thread_id, count=10):
-    """Insert metrics from a thread"""
-    for i in range(count):
-        metric = SystemMetric.now(
-            cpu_percent=10.0 + thread_id,
-            memory_percent=50.0 + i,
-            disk_percent=70.0
-        )
-        try:
-            store.insert_system_metric(metric)
-            print(f"Thread {thread_id}: Inserted metric {i+1}/{count}")
-        except Exception as e:
-            print(f"Thread {thread_id}: ERROR - {e}")
-        time.sleep(0.05)  # Small delay
+    """Insert metrics from a thread as one batch of raw rows"""
+    now = int(time.time())
+    # Values in SYSTEM_METRIC_COLUMNS order: only cpu, memory and disk percent set
+    rows = (
+        (now, 10.0 + thread_id, None, None, None, 50.0 + i, None, None, 70.0,
+         None, None, None, None, None)
+        for i in range(count)
+    )
+    try:
+        inserted = store.insert_system_metrics_iter(rows)
+        visible = len(store.get_system_metrics(0, int(time.time()) + 60))
+        print(f"Thread {thread_id}: Inserted {inserted}/{count} metrics, {visible} visible")
+    except Exception as e:
+        print(f"Thread {thread_id}: ERROR - {e}")
 
 def main():
     print("Testing database concurrency...")
@@ -56,6 +56,7 @@ def main():
 
         elapsed = time.time() - start_time
         print(f"\nAll threads completed in {elapsed:.2f} seconds")
+        print(f"Read pool: {store.pool_stats()}")
 
         # Verify all metrics were inserted
         with store._connection() as conn:
@@ -3,18 +3,27 @@ Pytest configuration and fixtures for Logly tests
 Provides shared test fixtures and utilities for all test types
 """
 
+import datetime
+import functools
 import os
+import sqlite3
 import sys
 import tempfile
 import shutil
 from pathlib import Path
-from unittest.mock import Mock, MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, patch
 import pytest
 import time
 
 # Add the project root to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from logly.storage.models import LogEvent, NetworkMetric, SystemMetric  # noqa: E402
+from logly.storage.sqlite_store import SQLiteStore  # noqa: E402
+from logly.utils import paths  # noqa: E402
+from logly.utils.create_db import load_schema_sql  # noqa: E402
+
 
 # ============================================================================
 # TEST MODE CONFIGURATION
@@ -28,10 +37,12 @@ def enable_test_mode():
     This allows tests to use custom database paths instead of hardcoded paths
     """
     os.environ["LOGLY_TEST_MODE"] = "1"
+    paths.set_test_mode(True)  # paths reads the variable once at import
     yield
     # Clean up after all tests
     if "LOGLY_TEST_MODE" in os.environ:
         del os.environ["LOGLY_TEST_MODE"]
+    paths.set_test_mode(False)
 
 
 # ============================================================================
@@ -103,14 +114,16 @@ logs:
 # MOCK DATA FIXTURES
 # ============================================================================
 
+# Model fixtures are built once per session (tests treat them as read-only),
+# all stamped relative to this session start time
+BASE_TS = int(time.time())
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def mock_system_metric():
     """Create a mock SystemMetric object"""
-    from logly.storage.models import SystemMetric
-
     return SystemMetric(
-        timestamp=int(time.time()),
+        timestamp=BASE_TS,
         cpu_percent=45.5,
         cpu_count=4,
         memory_total=8589934592,  # 8GB
@@ -127,13 +140,11 @@ def mock_system_metric():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_network_metric():
     """Create a mock NetworkMetric object"""
-    from logly.storage.models import NetworkMetric
-
     return NetworkMetric(
-        timestamp=int(time.time()),
+        timestamp=BASE_TS,
         bytes_sent=1000000,
         bytes_recv=2000000,
         packets_sent=1000,
@@ -148,13 +159,11 @@ def mock_network_metric():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_log_event():
     """Create a mock LogEvent object"""
-    from logly.storage.models import LogEvent
-
     return LogEvent(
-        timestamp=int(time.time()),
+        timestamp=BASE_TS,
         source="test_source",
         message="Test log message",
         level="INFO",
@@ -166,51 +175,41 @@ def mock_log_event():
     )
 
 
-@pytest.fixture
+# Shared, read-only events behind the mock_log_events fixture
+MOCK_LOG_EVENTS = (
+    LogEvent(
+        timestamp=BASE_TS - 300,
+        source="fail2ban",
+        message="[sshd] Ban 192.168.1.100",
+        level="WARNING",
+        ip_address="192.168.1.100",
+        service="sshd",
+        action="ban",
+    ),
+    LogEvent(
+        timestamp=BASE_TS - 200,
+        source="auth",
+        message="Failed password for testuser from 192.168.1.101",
+        level="WARNING",
+        ip_address="192.168.1.101",
+        user="testuser",
+        service="ssh",
+        action="failed_login",
+    ),
+    LogEvent(
+        timestamp=BASE_TS - 100,
+        source="syslog",
+        message="Error: Connection timeout",
+        level="ERROR",
+        service="nginx",
+    ),
+)
+
+
+@pytest.fixture(scope="session")
 def mock_log_events():
-    """Create multiple mock LogEvent objects"""
-    from logly.storage.models import LogEvent
-
-    base_time = int(time.time())
-    events = []
-
-    # Create various types of log events
-    events.append(
-        LogEvent(
-            timestamp=base_time - 300,
-            source="fail2ban",
-            message="[sshd] Ban 192.168.1.100",
-            level="WARNING",
-            ip_address="192.168.1.100",
-            service="sshd",
-            action="ban",
-        )
-    )
-
-    events.append(
-        LogEvent(
-            timestamp=base_time - 200,
-            source="auth",
-            message="Failed password for testuser from 192.168.1.101",
-            level="WARNING",
-            ip_address="192.168.1.101",
-            user="testuser",
-            service="ssh",
-            action="failed_login",
-        )
-    )
-
-    events.append(
-        LogEvent(
-            timestamp=base_time - 100,
-            source="syslog",
-            message="Error: Connection timeout",
-            level="ERROR",
-            service="nginx",
-        )
-    )
-
-    return events
+    """Create multiple mock LogEvent objects (a list, like LogParser.collect())"""
+    return list(MOCK_LOG_EVENTS)
 
 
 # ============================================================================
@@ -218,65 +217,53 @@ def mock_log_events():
 # ============================================================================
 
 
-@pytest.fixture
-def mock_proc_files(temp_dir):
-    """Create mock /proc filesystem structure"""
-    proc_dir = temp_dir / "proc"
-    proc_dir.mkdir(exist_ok=True)
-
-    # Mock /proc/stat
-    stat_file = proc_dir / "stat"
-    stat_file.write_text("cpu  100 200 300 400 500 600 700 0 0 0\n")
-
-    # Mock /proc/meminfo
-    meminfo_file = proc_dir / "meminfo"
-    meminfo_file.write_text("""MemTotal:        8388608 kB
+# Relative path -> content of the mock /proc files (ASCII, written as bytes)
+MOCK_PROC_FILES = {
+    "stat": b"cpu  100 200 300 400 500 600 700 0 0 0\n",
+    "meminfo": b"""MemTotal:        8388608 kB
 MemFree:         4194304 kB
 MemAvailable:    4194304 kB
 Buffers:          524288 kB
 Cached:          1048576 kB
-""")
-
-    # Mock /proc/loadavg
-    loadavg_file = proc_dir / "loadavg"
-    loadavg_file.write_text("1.50 2.00 1.80 2/150 1234\n")
-
-    # Mock /proc/net/dev
-    net_dev_dir = proc_dir / "net"
-    net_dev_dir.mkdir(exist_ok=True)
-    net_dev_file = net_dev_dir / "dev"
-    net_dev_file.write_text("""Inter-|   Receive                                                |  Transmit
+""",
+    "loadavg": b"1.50 2.00 1.80 2/150 1234\n",
+    "net/dev": b"""Inter-|   Receive                                                |  Transmit
  face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
     lo: 1000000  1000    0    0    0     0          0         0  1000000  1000    0    0    0     0       0          0
   eth0: 2000000  2000    5    3    0     0          0         0  1000000  1500    2    1    0     0       0          0
-""")
-
-    # Mock /proc/net/tcp
-    tcp_file = net_dev_dir / "tcp"
-    tcp_file.write_text("""  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+""",
+    "net/tcp": b"""  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
    0: 0100007F:0050 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 12345 1 0000000000000000 100 0 0 10 0
    1: 0100007F:0051 0100007F:9999 01 00000000:00000000 00:00000000 00000000     0        0 12346 1 0000000000000000 100 0 0 10 0
-""")
+""",
+    "diskstats": b"   8       0 sda 1000 0 8000 100 2000 0 16000 200 0 100 300\n",
+}
 
-    # Mock /proc/diskstats
-    diskstats_file = proc_dir / "diskstats"
-    diskstats_file.write_text(
-        "   8       0 sda 1000 0 8000 100 2000 0 16000 200 0 100 300\n"
-    )
+
+@pytest.fixture(scope="session")
+def mock_proc_files(tmp_path_factory):
+    """Create mock /proc filesystem structure (shared, treat as read-only)"""
+    proc_dir = tmp_path_factory.mktemp("proc")
+    (proc_dir / "net").mkdir()
+    for relative_path, content in MOCK_PROC_FILES.items():
+        (proc_dir / relative_path).write_bytes(content)
 
     yield proc_dir
 
 
-@pytest.fixture
-def mock_log_file(temp_dir):
-    """Create a mock log file with sample content"""
-    log_file = temp_dir / "test.log"
-    log_content = """2025-01-15 10:00:00 server sshd[1234]: Failed password for invalid user admin from 192.168.1.100
+# Content of the mock_log_file fixture
+MOCK_LOG_BYTES = b"""2025-01-15 10:00:00 server sshd[1234]: Failed password for invalid user admin from 192.168.1.100
 2025-01-15 10:01:00 server fail2ban[5678]: [sshd] Ban 192.168.1.100
 2025-01-15 10:02:00 server nginx[9012]: Error: Connection timeout
 2025-01-15 10:03:00 server sshd[1234]: Accepted publickey for user1 from 192.168.1.101
 """
-    log_file.write_text(log_content)
+
+
+@pytest.fixture(scope="session")
+def mock_log_file(tmp_path_factory):
+    """Create a mock log file with sample content (shared, treat as read-only)"""
+    log_file = tmp_path_factory.mktemp("logs") / "test.log"
+    log_file.write_bytes(MOCK_LOG_BYTES)
     yield str(log_file)
 
 
@@ -285,18 +272,47 @@ def mock_log_file(temp_dir):
 # ============================================================================
 
 
+@pytest.fixture(scope="session")
+def schema_template():
+    """In-memory database with schema.sql applied once per test session"""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.executescript(load_schema_sql())
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def accept_any_db_path():
+    """Let SQLiteStore open test database paths for the whole session"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("logly.storage.sqlite_store.validate_db_path", lambda db_path: True)
+        yield
+
+
 @pytest.fixture
-def test_store(temp_db_path):
-    """Create a test SQLiteStore instance with mocked path validation"""
-    from logly.storage.sqlite_store import SQLiteStore
+def test_store(schema_template, temp_db_path):
+    """Create a file-backed test SQLiteStore instance"""
+    def copy_schema(store):
+        # Page copy of the session template instead of re-running the DDL;
+        # test data needn't survive a power cut, so skip the fsyncs
+        with store._writer_lock:
+            writer = store._get_writer()
+            schema_template.backup(writer)
+            writer.execute("PRAGMA synchronous=OFF")
+
+    with patch.object(SQLiteStore, "_init_database", copy_schema):
+        store = SQLiteStore(temp_db_path)
+    yield store
+    store.close()
+
 
-    # Mock the path validation to accept our temp path
-    with patch("logly.storage.sqlite_store.validate_db_path", return_value=True):
-        with patch(
-            "logly.storage.sqlite_store.get_db_path", return_value=Path(temp_db_path)
-        ):
-            store = SQLiteStore(temp_db_path)
-            yield store
+@pytest.fixture
+def file_store(temp_db_path):
+    """Create a test SQLiteStore through the real schema setup and default PRAGMAs"""
+    store = SQLiteStore(temp_db_path)
+    yield store
+    store.close()
 
 
 @pytest.fixture
@@ -304,9 +320,11 @@ def populated_store(
     test_store, mock_system_metric, mock_network_metric, mock_log_event
 ):
     """Create a store with some test data"""
+    # Single-row inserts are group-committed, so this is one transaction
     test_store.insert_system_metric(mock_system_metric)
     test_store.insert_network_metric(mock_network_metric)
     test_store.insert_log_event(mock_log_event)
+    test_store.flush()
     yield test_store
 
 
@@ -315,47 +333,51 @@ def populated_store(
 # ============================================================================
 
 
-@pytest.fixture
+# Contents of the mock_config fixture; shared by every test, do not mutate
+MOCK_CONFIG = {
+    "database": {"path": "/tmp/test.db", "retention_days": 7},
+    "collection": {"system_metrics": 60, "network_metrics": 60, "log_parsing": 300},
+    "system": {"enabled": True, "metrics": ["cpu_percent", "memory_percent"]},
+    "network": {"enabled": True, "metrics": ["bytes_sent", "bytes_recv"]},
+    "logs": {
+        "enabled": True,
+        "sources": {"test": {"path": "/tmp/test.log", "enabled": True}},
+    },
+    "aggregation": {
+        "enabled": True,
+        "intervals": ["hourly", "daily"],
+        "keep_raw_data_days": 7,
+    },
+    "export": {"default_format": "csv", "timestamp_format": "%Y-%m-%d %H:%M:%S"},
+    "tracing": {
+        "enabled": True,
+        "trace_processes": True,
+        "trace_network": True,
+        "trace_ips": True,
+        "trace_errors": True,
+    },
+    "logging": {"level": "INFO"},
+}
+
+
+@pytest.fixture(scope="session")
 def mock_config():
-    """Create a mock Config object"""
-    config_dict = {
-        "database": {"path": "/tmp/test.db", "retention_days": 7},
-        "collection": {"system_metrics": 60, "network_metrics": 60, "log_parsing": 300},
-        "system": {"enabled": True, "metrics": ["cpu_percent", "memory_percent"]},
-        "network": {"enabled": True, "metrics": ["bytes_sent", "bytes_recv"]},
-        "logs": {
-            "enabled": True,
-            "sources": {"test": {"path": "/tmp/test.log", "enabled": True}},
-        },
-        "aggregation": {
-            "enabled": True,
-            "intervals": ["hourly", "daily"],
-            "keep_raw_data_days": 7,
-        },
-        "export": {"default_format": "csv", "timestamp_format": "%Y-%m-%d %H:%M:%S"},
-        "tracing": {
-            "enabled": True,
-            "trace_processes": True,
-            "trace_network": True,
-            "trace_ips": True,
-            "trace_errors": True,
-        },
-        "logging": {"level": "INFO"},
-    }
-
-    mock_config = Mock()
-    mock_config.config = config_dict
-    mock_config.get = lambda key, default=None: config_dict.get(key, default)
-    mock_config.get_database_config = lambda: config_dict["database"]
-    mock_config.get_collection_config = lambda: config_dict["collection"]
-    mock_config.get_system_config = lambda: config_dict["system"]
-    mock_config.get_network_config = lambda: config_dict["network"]
-    mock_config.get_logs_config = lambda: config_dict["logs"]
-    mock_config.get_aggregation_config = lambda: config_dict["aggregation"]
-    mock_config.get_export_config = lambda: config_dict["export"]
-    mock_config.get_logging_config = lambda: config_dict["logging"]
-
-    yield mock_config
+    """Create a stand-in Config object backed by MOCK_CONFIG"""
+    def section(key):
+        return functools.partial(MOCK_CONFIG.__getitem__, key)
+
+    yield SimpleNamespace(
+        config=MappingProxyType(MOCK_CONFIG),
+        get=MOCK_CONFIG.get,
+        get_database_config=section("database"),
+        get_collection_config=section("collection"),
+        get_system_config=section("system"),
+        get_network_config=section("network"),
+        get_logs_config=section("logs"),
+        get_aggregation_config=section("aggregation"),
+        get_export_config=section("export"),
+        get_logging_config=section("logging"),
+    )
 
 
 # ============================================================================
@@ -371,50 +393,19 @@ def mock_time():
         yield fixed_time
 
 
-@pytest.fixture
-def mock_datetime():
-    """Mock datetime.now() for consistent timestamps"""
-    from datetime import datetime
+class FrozenDatetime(datetime.datetime):
+    """datetime whose now() is pinned to FROZEN_NOW; everything else is stock"""
 
-    fixed_datetime = datetime(2025, 1, 15, 12, 0, 0)
-    with patch("datetime.datetime") as mock_dt:
-        mock_dt.now.return_value = fixed_datetime
-        mock_dt.fromtimestamp = datetime.fromtimestamp
-        yield fixed_datetime
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW if tz is None else FROZEN_NOW.replace(tzinfo=tz)
 
 
-# ============================================================================
-# CLEANUP FIXTURES
-# ============================================================================
+FROZEN_NOW = FrozenDatetime(2025, 1, 15, 12, 0, 0)
 
 
-@pytest.fixture(autouse=True)
-def cleanup_after_test():
-    """Automatically clean up after each test"""
-    yield
-    # Clean up any temp files created during tests
-    import gc
-
-    gc.collect()
-
-
-# ============================================================================
-# TEST MARKERS
-# ============================================================================
-
-
-def pytest_configure(config):
-    """Register custom markers"""
-    config.addinivalue_line(
-        "markers", "unit: Unit tests that test individual components"
-    )
-    config.addinivalue_line(
-        "markers", "integration: Integration tests that test component interactions"
-    )
-    config.addinivalue_line(
-        "markers", "e2e: End-to-end tests that test complete workflows"
-    )
-    config.addinivalue_line("markers", "slow: Tests that take a long time to run")
-    config.addinivalue_line(
-        "markers", "requires_root: Tests that require root privileges"
-    )
+@pytest.fixture
+def mock_datetime(monkeypatch):
+    """Freeze datetime.now() for consistent timestamps"""
+    monkeypatch.setattr(datetime, "datetime", FrozenDatetime)
+    yield FROZEN_NOW
@@ -26,6 +26,14 @@ from logly.storage.models import SystemMetric, NetworkMetric, LogEvent
 from logly.core.scheduler import Scheduler
 from logly.exporters.json_exporter import JSONExporter
 
+# Level 1 compresses SQLite pages ~15x faster than the default 9 at about
+# the same size; copies stream in 1 MiB chunks instead of read()-ing it all
+BACKUP_GZIP_LEVEL = 1
+COPY_CHUNK_SIZE = 1 << 20
+
+# Maintenance rewrites the file with VACUUM only past this share of free pages
+VACUUM_FREE_RATIO = 0.25
+
 
 class TestE2EDisasterRecovery:
     """End-to-end tests for disaster recovery and maintenance operations"""
@@ -66,22 +74,23 @@ class TestE2EDisasterRecovery:
             print("→ Creating historical monitoring data...")
             base_time = int(time.time()) - 3600  # 1 hour ago
 
-            for i in range(100):
-                metric = SystemMetric(
+            store.insert_system_metrics(
+                SystemMetric(
                     timestamp=base_time + i * 30,  # Every 30 seconds
                     cpu_percent=30.0 + (i % 20),
                     memory_percent=40.0 + (i % 15),
                     disk_percent=50.0 + (i % 10),
                 )
-                store.insert_system_metric(metric)
-
-                if i % 5 == 0:  # Every 5th metric, add network
-                    net_metric = NetworkMetric(
-                        timestamp=base_time + i * 30,
-                        bytes_sent=1024 * i,
-                        bytes_recv=2048 * i,
-                    )
-                    store.insert_network_metric(net_metric)
+                for i in range(100)
+            )
+            store.insert_network_metrics(
+                NetworkMetric(
+                    timestamp=base_time + i * 30,
+                    bytes_sent=1024 * i,
+                    bytes_recv=2048 * i,
+                )
+                for i in range(0, 100, 5)  # Every 5th metric, add network
+            )
 
             # Record data statistics before corruption
             with store._connection() as conn:
@@ -105,10 +114,14 @@ class TestE2EDisasterRecovery:
             print("→ Creating automated backup...")
             backup_file = backup_dir / f"backup_{int(time.time())}.db.gz"
 
-            # Create compressed backup
-            with open(db_path, "rb") as f_in:
-                with gzip.open(backup_file, "wb") as f_out:
-                    f_out.write(f_in.read())
+            # Online backup of the live database (includes committed WAL pages)
+            snapshot = store.backup(str(backup_dir / "snapshot.db"))
+
+            # Create compressed backup, streamed at the fastest gzip level
+            with open(snapshot, "rb") as f_in:
+                with gzip.open(backup_file, "wb", compresslevel=BACKUP_GZIP_LEVEL) as f_out:
+                    shutil.copyfileobj(f_in, f_out, COPY_CHUNK_SIZE)
+            snapshot.unlink()
 
             backup_size = backup_file.stat().st_size / 1024  # KB
             print(f"✓ Backup created: {backup_file.name} ({backup_size:.1f} KB)")
@@ -117,13 +130,14 @@ class TestE2EDisasterRecovery:
             print("→ Simulating database corruption...")
 
             # Add some new data first
-            for i in range(10):
-                metric = SystemMetric(
+            store.insert_system_metrics(
+                SystemMetric(
                     timestamp=int(time.time()) + i,
                     cpu_percent=50.0,
                     memory_percent=60.0,
                 )
-                store.insert_system_metric(metric)
+                for i in range(10)
+            )
 
             # Close connection properly
             del store
@@ -167,7 +181,7 @@ class TestE2EDisasterRecovery:
             # Decompress and restore
             with gzip.open(latest_backup, "rb") as f_in:
                 with open(db_path, "wb") as f_out:
-                    f_out.write(f_in.read())
+                    shutil.copyfileobj(f_in, f_out, COPY_CHUNK_SIZE)
 
             print(f"✓ Restored from backup: {latest_backup.name}")
 
@@ -175,8 +189,8 @@ class TestE2EDisasterRecovery:
             restored_store = SQLiteStore(str(db_path))
 
             with restored_store._connection() as conn:
-                # Run integrity check
-                integrity = conn.execute("PRAGMA integrity_check").fetchone()[0]
+                # quick_check: page/B-tree structure without index cross-validation
+                integrity = conn.execute("PRAGMA quick_check").fetchone()[0]
                 assert integrity == "ok", f"Integrity check failed: {integrity}"
 
                 # Verify data matches original
@@ -204,13 +218,14 @@ class TestE2EDisasterRecovery:
 
             # Add new metrics post-recovery
             recovery_time = int(time.time())
-            for i in range(5):
-                metric = SystemMetric(
+            restored_store.insert_system_metrics(
+                SystemMetric(
                     timestamp=recovery_time + i * 10,
                     cpu_percent=35.0 + i,
                     memory_percent=45.0 + i,
                 )
-                restored_store.insert_system_metric(metric)
+                for i in range(5)
+            )
 
             print("✓ Monitoring resumed successfully")
 
@@ -333,21 +348,17 @@ class TestE2EDisasterRecovery:
             # Add lots of historical data
             base_time = int(time.time()) - (7 * 24 * 3600)  # 7 days ago
 
-            metrics_added = 0
-            for day in range(7):
-                for hour in range(24):
-                    for minute in range(0, 60, 5):  # Every 5 minutes
-                        timestamp = (
-                            base_time + (day * 86400) + (hour * 3600) + (minute * 60)
-                        )
-                        metric = SystemMetric(
-                            timestamp=timestamp,
-                            cpu_percent=30.0 + (hour % 24),
-                            memory_percent=40.0 + (minute % 30),
-                            disk_percent=50.0 + (day * 5),  # Disk usage growing
-                        )
-                        store.insert_system_metric(metric)
-                        metrics_added += 1
+            metrics_added = store.insert_system_metrics(
+                SystemMetric(
+                    timestamp=base_time + (day * 86400) + (hour * 3600) + (minute * 60),
+                    cpu_percent=30.0 + (hour % 24),
+                    memory_percent=40.0 + (minute % 30),
+                    disk_percent=50.0 + (day * 5),  # Disk usage growing
+                )
+                for day in range(7)
+                for hour in range(24)
+                for minute in range(0, 60, 5)  # Every 5 minutes
+            )
 
             # Check database size
             db_size_mb = os.path.getsize(db_path) / (1024 * 1024)
@@ -398,11 +409,12 @@ class TestE2EDisasterRecovery:
                 deleted = conn.execute(
                     "DELETE FROM system_metrics WHERE timestamp < ?", (cutoff_time,)
                 )
+                conn.commit()
 
-            # VACUUM must be run outside of a transaction
-            conn = sqlite3.connect(str(db_path))
-            conn.execute("VACUUM")  # Reclaim space
-            conn.close()
+            # Release the freed pages in place; VACUUM would need a full
+            # copy of the database in free space the disk no longer has
+            store.incremental_vacuum()
+            store.checkpoint()
 
             # Check new size
             new_db_size_mb = os.path.getsize(db_path) / (1024 * 1024)
@@ -427,9 +439,9 @@ class TestE2EDisasterRecovery:
                 archive_data = [dict(row) for row in old_data]
 
                 # Compress and save
-                import gzip
-
-                with gzip.open(archive_file, "wt", encoding="utf-8") as f:
+                with gzip.open(
+                    archive_file, "wt", encoding="utf-8", compresslevel=BACKUP_GZIP_LEVEL
+                ) as f:
                     json.dump(archive_data, f)
 
                 archive_size_kb = archive_file.stat().st_size / 1024
@@ -666,7 +678,7 @@ class TestE2EDisasterRecovery:
             print("→ Creating pre-maintenance backup...")
 
             backup_file = Path(workspace) / f"pre_maintenance_{int(time.time())}.db"
-            shutil.copy2(db_path, backup_file)
+            store.backup(str(backup_file))
             backup_size = backup_file.stat().st_size / 1024
 
             print(f"✓ Backup created: {backup_file.name} ({backup_size:.1f} KB)")
@@ -718,9 +730,13 @@ class TestE2EDisasterRecovery:
 
                 # Database optimization
                 if "optimization" in task.lower():
+                    # Re-analyzes only tables whose statistics have drifted
+                    store.optimize(SQLiteStore.OPTIMIZE_ON_OPEN)
                     with store._connection() as conn:
-                        conn.execute("ANALYZE")
-                        conn.execute("VACUUM")
+                        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+                        if free_pages > page_count * VACUUM_FREE_RATIO:
+                            conn.execute("VACUUM")
 
                 print("✓")
 
@@ -738,7 +754,7 @@ class TestE2EDisasterRecovery:
 
             # Run health checks
             with store._connection() as conn:
-                integrity = conn.execute("PRAGMA integrity_check").fetchone()[0]
+                integrity = conn.execute("PRAGMA quick_check").fetchone()[0]
                 health_checks["Database integrity"] = integrity == "ok"
 
             health_checks["Configuration valid"] = config.config is not None
@@ -931,6 +947,8 @@ class TestE2EDisasterRecovery:
             base_time = int(time.time()) - (3 * 24 * 3600)  # 3 days of data
 
             # Add historical data
+            system_metrics = []
+            network_metrics = []
             for day in range(3):
                 for hour in range(24):
                     for minute in range(0, 60, 10):
@@ -939,21 +957,23 @@ class TestE2EDisasterRecovery:
                         )
 
                         # System metrics
-                        metric = SystemMetric(
+                        system_metrics.append(SystemMetric(
                             timestamp=timestamp,
                             cpu_percent=30.0 + (hour % 24),
                             memory_percent=40.0 + (minute % 20),
-                        )
-                        old_store.insert_system_metric(metric)
+                        ))
 
                         # Network metrics every 30 minutes
                         if minute % 30 == 0:
-                            net_metric = NetworkMetric(
+                            network_metrics.append(NetworkMetric(
                                 timestamp=timestamp,
                                 bytes_sent=1024 * hour * minute,
                                 bytes_recv=2048 * hour * minute,
-                            )
-                            old_store.insert_network_metric(net_metric)
+                            ))
+
+            # One transaction per table instead of a commit group per 50 rows
+            old_store.insert_system_metrics(system_metrics)
+            old_store.insert_network_metrics(network_metrics)
 
             with old_store._connection() as conn:
                 old_count = conn.execute(
@@ -1168,7 +1188,7 @@ class TestE2EDisasterRecovery:
             print("→ Preserving old database as backup...")
 
             backup_path = Path(workspace) / f"logly_v1_backup_{cutover_time}.db"
-            shutil.copy2(old_db, backup_path)
+            old_store.backup(backup_path)
 
             print(f"✓ Old database backed up: {backup_path.name}")
 
@@ -283,6 +283,9 @@ class TestConfigCLIIntegration:
                 )
                 store.insert_log_event(event)
 
+            # Commit grouped inserts so the status command's store sees them
+            store.flush()
+
             # Step 2 & 3: Run status command and capture output
             import io
             import contextlib
@@ -62,6 +62,7 @@ class TestCLI:
         cli.cmd_collect(args)
 
         mock_scheduler_instance.run_once.assert_called_once()
+        mock_store_instance.close.assert_called_once()
 
     @pytest.mark.unit
     @patch('logly.cli.SQLiteStore')
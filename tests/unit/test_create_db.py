@@ -3,6 +3,7 @@ Unit tests for logly.utils.create_db module
 Tests database creation and initialization functionality
 """
 
+import os
 import pytest
 import sqlite3
 from unittest.mock import patch
@@ -11,6 +12,7 @@ from logly.utils.create_db import (
     db_exists,
     create_database,
     initialize_db_if_needed,
+    load_schema_sql,
     get_db_info
 )
 
@@ -42,6 +44,20 @@ class TestDatabaseCreation:
         with patch('logly.utils.create_db.get_db_path', return_value=db_dir):
             assert db_exists() is False
 
+    @pytest.mark.unit
+    def test_db_exists_single_stat(self, temp_dir):
+        """Test that existence and file type come from one stat call"""
+        db_path = temp_dir / "test.db"
+        db_path.touch()
+
+        with patch('logly.utils.create_db.get_db_path', return_value=db_path), \
+                patch('logly.utils.create_db.os.stat', wraps=os.stat) as mock_stat:
+            assert db_exists() is True
+            assert mock_stat.call_count == 1
+
+        with patch('logly.utils.create_db.get_db_path', return_value=db_path / "child.db"):
+            assert db_exists() is False  # parent is a file: NotADirectoryError
+
     @pytest.mark.unit
     def test_create_database_creates_db_file(self, temp_dir):
         """Test create_database creates the database file"""
@@ -151,16 +167,16 @@ class TestDatabaseCreation:
 
         with patch('logly.utils.create_db.get_db_path', return_value=db_path):
             with patch('logly.utils.create_db.get_db_dir', return_value=temp_dir):
-                # Create a temporary file for __file__ and make schema path not exist
-                fake_module_dir = temp_dir / "utils"
-                fake_module_dir.mkdir()
-
-                # Patch __file__ within the module
-                with patch('logly.utils.create_db.__file__', str(fake_module_dir / "create_db.py")):
-                    # The schema should be at temp_dir/storage/schema.sql (which doesn't exist)
+                load_schema_sql.cache_clear()
+                # Make the packaged schema resource unreadable
+                with patch('importlib.resources.files', side_effect=FileNotFoundError("schema.sql"), create=True), \
+                        patch('importlib.resources.read_text', side_effect=FileNotFoundError("schema.sql")):
                     with pytest.raises(FileNotFoundError, match="Schema file not found"):
                         create_database()
 
+                assert not db_path.exists()
+                load_schema_sql.cache_clear()
+
     @pytest.mark.unit
     def test_create_database_cleans_up_on_failure(self, temp_dir):
         """Test create_database cleans up partial database on failure"""
@@ -168,8 +184,8 @@ class TestDatabaseCreation:
 
         with patch('logly.utils.create_db.get_db_path', return_value=db_path):
             with patch('logly.utils.create_db.get_db_dir', return_value=temp_dir):
-                # Mock schema read to raise an error
-                with patch('builtins.open', side_effect=sqlite3.Error("SQL error")):
+                # Make schema execution fail
+                with patch('logly.utils.create_db.load_schema_sql', return_value="NOT VALID SQL;"):
                     with pytest.raises(sqlite3.Error):
                         create_database()
 
@@ -265,6 +281,42 @@ class TestDatabaseCreation:
                 assert info['table_count'] >= 12
                 assert info['schema_version'] == '2.0'
 
+    @pytest.mark.unit
+    def test_get_db_info_uses_given_connection(self, temp_dir):
+        """Test get_db_info queries a caller's connection and leaves it open"""
+        db_path = temp_dir / "test.db"
+
+        with patch('logly.utils.create_db.get_db_path', return_value=db_path):
+            with patch('logly.utils.create_db.get_db_dir', return_value=temp_dir):
+                create_database()
+
+                conn = sqlite3.connect(db_path)
+                with patch('logly.utils.create_db.sqlite3.connect') as mock_connect:
+                    info = get_db_info(conn)
+
+                mock_connect.assert_not_called()
+                assert info['schema_version'] == '2.0'
+                assert info['table_count'] >= 12
+                assert conn.execute("SELECT 1").fetchone() == (1,)
+                conn.close()
+
+    @pytest.mark.unit
+    def test_get_db_info_describes_connection_database(self, temp_dir):
+        """Test that path and size come from the given connection, not the hardcoded database"""
+        other_path = temp_dir / "other.db"
+        conn = sqlite3.connect(other_path)
+        conn.execute("CREATE TABLE t (x)")
+        conn.commit()
+
+        with patch('logly.utils.create_db.get_db_path', return_value=temp_dir / "missing.db"):
+            info = get_db_info(conn)
+        conn.close()
+
+        assert info['path'] == str(other_path)
+        assert info['size_bytes'] == other_path.stat().st_size
+        assert info['table_count'] == 1
+        assert info['schema_version'] == 'unknown'
+
     @pytest.mark.unit
     def test_get_db_info_calculates_size_correctly(self, temp_dir):
         """Test get_db_info calculates file size correctly"""
@@ -435,24 +487,26 @@ class TestDatabaseCreation:
         results = []
 
         def init_db():
-            with patch('logly.utils.create_db.get_db_path', return_value=db_path):
-                with patch('logly.utils.create_db.get_db_dir', return_value=temp_dir):
-                    try:
-                        result = initialize_db_if_needed()
-                        results.append(result)
-                    except Exception as e:
-                        results.append(e)
+            try:
+                result = initialize_db_if_needed()
+                results.append(result)
+            except Exception as e:
+                results.append(e)
 
         # Create multiple threads
         threads = [threading.Thread(target=init_db) for _ in range(5)]
 
-        # Start all threads
-        for t in threads:
-            t.start()
+        # Patch once around all threads: patch() itself is not thread-safe,
+        # and per-thread unpatching would leak the real path into other threads
+        with patch('logly.utils.create_db.get_db_path', return_value=db_path):
+            with patch('logly.utils.create_db.get_db_dir', return_value=temp_dir):
+                # Start all threads
+                for t in threads:
+                    t.start()
 
-        # Wait for all threads
-        for t in threads:
-            t.join()
+                # Wait for all threads
+                for t in threads:
+                    t.join()
 
         # All should succeed and return the same path
         assert len(results) == 5
@@ -3,8 +3,10 @@ Unit tests for logly.utils.db_size module
 Tests database size calculation and formatting
 """
 
+import os
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 from logly.utils.db_size import get_db_size, format_size, get_db_info
 
 
@@ -24,6 +26,18 @@ class TestDBSize:
         assert size_info["size_kb"] == 1.0
         assert size_info["size_mb"] == 0.0
 
+    @pytest.mark.unit
+    def test_get_db_size_single_stat(self, temp_db_path):
+        """Test that size and existence come from one stat call"""
+        Path(temp_db_path).write_bytes(b"x" * 3 * 1024 * 1024)
+
+        with patch("logly.utils.db_size.os.stat", wraps=os.stat) as mock_stat:
+            size_info = get_db_size(temp_db_path)
+
+        assert mock_stat.call_count == 1
+        assert size_info["size_mb"] == 3.0
+        assert size_info["size_gb"] == 0.003
+
     @pytest.mark.unit
     def test_get_db_size_nonexistent_file(self):
         """Test getting size of non-existent file"""
@@ -54,6 +68,11 @@ class TestDBSize:
         """Test formatting gigabytes"""
         assert "GB" in format_size(2 * 1024 * 1024 * 1024)
 
+    @pytest.mark.unit
+    def test_format_size_tb(self):
+        """Test formatting terabytes with the shared formatter"""
+        assert format_size(2 * 1024 ** 4) == "2.00 TB"
+
     @pytest.mark.unit
     def test_get_db_info(self, temp_db_path):
         """Test getting comprehensive database info"""
@@ -2,10 +2,41 @@
 Unit tests for logly.tracers.error_tracer module
 """
 
+import re
+from types import SimpleNamespace
+from unittest.mock import patch
+
 import pytest
 from logly.tracers.error_tracer import ErrorTracer
 
 
+class _FakeHyperscanDatabase:
+    """Block-mode database stand-in that runs the compiled expressions with re"""
+
+    def __init__(self, mode):
+        self.patterns = []
+
+    def compile(self, expressions, ids, flags):
+        self.patterns = [
+            (pattern_id, re.compile(expr.decode('utf-8'), re.IGNORECASE if flag & 8 else 0))
+            for expr, pattern_id, flag in zip(expressions, ids, flags)
+        ]
+
+    def scan(self, data, match_event_handler):
+        text = data.decode('utf-8')
+        # Report the highest id first; _classify must still prefer the lowest
+        for pattern_id, pattern in reversed(self.patterns):
+            match = pattern.search(text)
+            if match:
+                match_event_handler(pattern_id, match.start(), match.end(), 0, None)
+
+
+FAKE_HYPERSCAN = SimpleNamespace(
+    HS_FLAG_SINGLEMATCH=1, HS_FLAG_UTF8=2, HS_FLAG_UCP=4, HS_FLAG_CASELESS=8,
+    HS_MODE_BLOCK=1, error=Exception, Database=_FakeHyperscanDatabase,
+)
+
+
 class TestErrorTracer:
     """Test suite for ErrorTracer"""
 
@@ -38,3 +69,211 @@ class TestErrorTracer:
         category = tracer._categorize_error("ConnectionError")
         
         assert category is not None
+
+    @pytest.mark.unit
+    def test_trace_error_type_follows_pattern_priority(self):
+        """Test that the first matching pattern wins, wherever it occurs"""
+        tracer = ErrorTracer()
+
+        trace = tracer.trace_error(
+            "connection refused by db\nValueError: bad value at /app/main.py line 42"
+        )
+
+        assert trace["error_type"] == "python_exception"
+        assert trace["error_category"] == "application"
+        assert trace["exception_type"] == "ValueError"
+        assert trace["file_path"] == "/app/main.py"
+        assert trace["line_number"] == 42
+
+    @pytest.mark.unit
+    def test_trace_error_detects_traceback_with_exception(self):
+        """Test that exception details and the traceback flag are both extracted"""
+        tracer = ErrorTracer()
+
+        trace = tracer.trace_error(
+            'Traceback (most recent call last):\n  File "/app/db.py", line 7\nKeyError: user_id'
+        )
+
+        assert trace["error_type"] == "python_exception"
+        assert trace["exception_type"] == "KeyError"
+        assert trace["error_details"] == "user_id"
+        assert trace["has_stacktrace"] is True
+        assert trace["file_path"] == "/app/db.py"
+        assert trace["line_number"] == 7
+
+    @pytest.mark.unit
+    def test_analyze_error_patterns(self):
+        """Test counts, severity buckets and recurring signatures"""
+        tracer = ErrorTracer()
+
+        for _ in range(2):
+            tracer.trace_error('deadlock detected at /app/db.py line 12', 'postgres', 'ERROR')
+        tracer.trace_error('Permission denied', 'nginx', 'WARNING')
+        tracer.trace_error('fatal: out of memory', None, 'CRITICAL')
+
+        analysis = tracer.analyze_error_patterns()
+
+        assert analysis['total_errors'] == 4
+        assert analysis['by_type']['db_deadlock'] == 2
+        assert analysis['by_category']['security'] == 1
+        assert analysis['by_source'] == {'postgres': 2, 'nginx': 1}
+        assert analysis['by_severity'] == {'low': 1, 'medium': 0, 'high': 2, 'critical': 1}
+        assert analysis['top_errors'][0] == {'type': 'db_deadlock', 'count': 2}
+        assert analysis['recurring_errors'] == [
+            {'signature': 'db_deadlock:/app/db.py:12', 'count': 2}
+        ]
+
+        tracer.clear_history()
+        assert tracer.analyze_error_patterns()['total_errors'] == 0
+        assert tracer.analyze_error_patterns()['by_severity']['high'] == 0
+
+    @pytest.mark.unit
+    def test_hyperscan_classification_matches_re(self):
+        """Test that the Hyperscan path picks the same error type as the re loop"""
+        pytest.importorskip("hyperscan")
+
+        messages = [
+            "connection refused by db\nValueError: bad value",
+            "Traceback (most recent call last)",
+            "Out of memory: killed process 42",
+            "write failed: No space left on device",
+            "all good here",
+        ]
+
+        tracer = ErrorTracer()
+        fallback = ErrorTracer()
+        fallback._hs_database = None
+
+        for message in messages:
+            assert tracer._classify(message)[0] == fallback._classify(message)[0]
+
+    @pytest.mark.unit
+    def test_hyperscan_path_follows_pattern_priority(self):
+        """Test the Hyperscan path against the re loop with a stubbed Hyperscan"""
+        with patch("logly.tracers.error_tracer.hyperscan", FAKE_HYPERSCAN):
+            tracer = ErrorTracer()
+        assert tracer._hs_database is not None
+        fallback = ErrorTracer()
+        fallback._hs_database = None
+
+        messages = [
+            "connection refused by db\nValueError: bad value",
+            "Traceback (most recent call last)\nMemoryError: out of memory",
+            "query failed: deadlock detected",
+            "DISK FULL on /var",
+            "all good here",
+        ]
+        for message in messages:
+            hs_type, hs_match = tracer._classify(message)
+            re_type, re_match = fallback._classify(message)
+            assert hs_type == re_type
+            assert (hs_match and hs_match.group(0)) == (re_match and re_match.group(0))
+
+        # Lone surrogates can't be UTF-8 encoded for scanning; the re loop takes over
+        surrogate = "ValueError: bad byte \udcff"
+        assert tracer._classify(surrogate)[0] == 'python_exception'
+        assert tracer.trace_error(surrogate)['exception_type'] == 'ValueError'
+
+    @pytest.mark.unit
+    def test_calculate_severity(self):
+        """Test level base scores plus keyword bumps, capped at 100"""
+        tracer = ErrorTracer()
+
+        assert tracer._calculate_severity('WARNING', 'disk nearly full') == 30
+        assert tracer._calculate_severity('ERROR', 'Worker CRASHED') == 75
+        assert tracer._calculate_severity('ERROR', 'SQL deadlock detected') == 85
+        assert tracer._calculate_severity('unknown', 'query slow') == 60
+        assert tracer._calculate_severity('CRITICAL', 'Fatal database error') == 100
+
+    @pytest.mark.unit
+    def test_root_causes_and_recovery_lookup(self):
+        """Test type-specific hints, category fallbacks and general suggestions"""
+        tracer = ErrorTracer()
+
+        deadlock = {'error_category': 'database', 'error_type': 'db_deadlock'}
+        assert tracer._identify_root_causes(deadlock)[0] == 'Multiple transactions competing for same resources'
+        assert tracer._suggest_recovery(deadlock)[0].startswith('Implement database connection retry')
+
+        security = {'error_category': 'security', 'error_type': 'permission_denied'}
+        assert len(tracer._identify_root_causes(security)) == 3
+
+        leak = {'error_category': 'resource', 'error_type': 'memory_leak'}
+        assert tracer._identify_root_causes(leak) == []
+        assert tracer._suggest_recovery(leak)[0] == 'Implement memory monitoring and alerting'
+
+        unknown = {'error_category': 'application', 'error_type': 'assertion_failed'}
+        assert tracer._suggest_recovery(unknown) == list(ErrorTracer.GENERAL_RECOVERY_SUGGESTIONS)
+
+        # Returned lists are fresh copies of the class constants
+        tracer._identify_root_causes(deadlock).append('extra')
+        assert len(tracer._identify_root_causes(deadlock)) == 3
+
+    @pytest.mark.unit
+    def test_error_history_is_bounded(self):
+        """Test that the oldest errors are evicted once max_history is reached"""
+        tracer = ErrorTracer(max_history=3)
+
+        for i in range(5):
+            tracer.trace_error(f"Error {i}: connection refused")
+
+        timeline = tracer.get_error_timeline()
+        assert isinstance(timeline, list)
+        assert [trace['message'] for trace in timeline] == [f"Error {i}: connection refused" for i in range(2, 5)]
+        assert tracer.analyze_error_patterns()['total_errors'] == 3
+        assert sum(tracer.analyze_error_patterns()['by_type'].values()) == 3
+
+    @pytest.mark.unit
+    def test_severity_buckets_follow_evictions(self):
+        """Test that evicted errors leave their severity bucket"""
+        tracer = ErrorTracer(max_history=2)
+
+        tracer.trace_error("fatal crash", level='CRITICAL')   # critical
+        tracer.trace_error("minor glitch", level='WARNING')   # low
+        tracer.trace_error("request failed", level='ERROR')   # medium, evicts critical
+
+        assert tracer.analyze_error_patterns()['by_severity'] == {
+            'low': 1, 'medium': 1, 'high': 0, 'critical': 0,
+        }
+
+        tracer.clear_history()
+        assert sum(tracer.analyze_error_patterns()['by_severity'].values()) == 0
+
+    @pytest.mark.unit
+    def test_classify_skips_exception_regex_without_markers(self):
+        """Test that messages without Error:/Exception: fall through to later patterns"""
+        tracer = ErrorTracer()
+        tracer._hs_database = None
+
+        assert tracer._classify("Disk full: ENOSPC on /var")[0] == 'disk_full'
+        assert tracer._classify("CustomError raised without colon, permission denied")[0] == 'permission_denied'
+        assert tracer._classify("worker died: KeyError: 'id'")[1].group(1) == 'KeyError'
+        assert tracer._classify("all good") == (None, None)
+
+    @pytest.mark.unit
+    def test_recurring_errors_follow_evictions(self):
+        """Test that recurring signatures are counted over the bounded history only"""
+        tracer = ErrorTracer(max_history=2)
+        message = 'File "/app/main.py", line 7: ValueError: bad'
+
+        tracer.trace_error(message)
+        tracer.trace_error(message)
+        assert tracer.analyze_error_patterns()['recurring_errors'] == [
+            {'signature': 'python_exception:/app/main.py:7', 'count': 2}
+        ]
+
+        tracer.trace_error("disk full")
+        assert tracer.analyze_error_patterns()['recurring_errors'] == []
+
+    @pytest.mark.unit
+    def test_zero_history_keeps_counts_empty(self):
+        """Test that max_history=0 traces errors without counting them"""
+        tracer = ErrorTracer(max_history=0)
+        message = 'File "/app/main.py", line 7: ValueError: bad'
+
+        assert tracer.trace_error(message)['error_type'] == 'python_exception'
+        tracer.trace_error(message)
+
+        analysis = tracer.analyze_error_patterns()
+        assert analysis['total_errors'] == 0
+        assert sum(analysis['by_severity'].values()) == 0
+        assert analysis['recurring_errors'] == []
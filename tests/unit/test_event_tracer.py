@@ -49,3 +49,55 @@ class TestEventTracer:
         
         assert score > 0
         assert score <= 100
+
+    @pytest.mark.unit
+    def test_identify_related_services_from_message(self):
+        """Test that services mentioned in the message are detected case-insensitively"""
+        tracer = EventTracer()
+        event = LogEvent(
+            timestamp=1000000,
+            source="syslog",
+            message="NGINX[12]: gunicorn worker timed out talking to PostgreSQL and redis-server",
+            level="ERROR"
+        )
+
+        related = tracer._identify_related_services(event)
+
+        assert sorted(related) == ["django", "nginx", "postgresql", "redis"]
+
+    @pytest.mark.unit
+    def test_extract_event_patterns(self):
+        """Test per-field counts, skipping empty values except for source"""
+        tracer = EventTracer()
+        events = [
+            LogEvent(timestamp=1, source="auth", message="a", level="ERROR", ip_address="1.2.3.4", user="root"),
+            LogEvent(timestamp=2, source="auth", message="b", level="ERROR", ip_address="1.2.3.4"),
+            LogEvent(timestamp=3, source="syslog", message="c", level=None, action="ban", service="sshd"),
+        ]
+
+        patterns = tracer.extract_event_patterns(events)
+
+        assert patterns["total_events"] == 3
+        assert patterns["by_source"] == {"auth": 2, "syslog": 1}
+        assert patterns["by_level"] == {"ERROR": 2}
+        assert patterns["by_action"] == {"ban": 1}
+        assert patterns["ip_frequency"] == {"1.2.3.4": 2}
+        assert patterns["user_frequency"] == {"root": 1}
+        assert patterns["service_frequency"] == {"sshd": 1}
+
+    @pytest.mark.unit
+    def test_trace_causality_keyword_families(self):
+        """Test connection, memory and disk causality triggers"""
+        tracer = EventTracer()
+
+        def trigger(message, level="ERROR"):
+            event = LogEvent(timestamp=1, source="app", message=message, level=level, service="api")
+            causality = tracer._trace_causality(event)
+            return causality['trigger'] if causality else None
+
+        assert trigger("Connection TIMEOUT to db") == 'connection_timeout'
+        assert trigger("connection refused by upstream") == 'connection_refused'
+        assert trigger("Worker killed: Out Of Memory", level="CRITICAL") == 'memory_exhaustion'
+        assert trigger("OOM killer invoked") == 'memory_exhaustion'
+        assert trigger("write failed: No space left on device") == 'disk_space_exhausted'
+        assert trigger("disk quota exceeded", level="WARNING") is None
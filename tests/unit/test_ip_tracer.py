@@ -3,7 +3,7 @@ Unit tests for logly.tracers.ip_tracer module
 """
 
 import pytest
-from logly.tracers.ip_tracer import IPTracer
+from logly.tracers.ip_tracer import IP_TRACE_FIELDS, IPTrace, IPTracer
 
 
 class TestIPTracer:
@@ -44,3 +44,121 @@ class TestIPTracer:
         ip_type = tracer._classify_ip("127.0.0.1")
         
         assert ip_type == "localhost"
+
+    @pytest.mark.unit
+    def test_is_private_ip_cidr_boundaries(self):
+        """Test private range edges and IPv6 unique-local/link-local blocks"""
+        tracer = IPTracer()
+
+        assert tracer._is_private_ip("172.16.0.1")
+        assert tracer._is_private_ip("172.31.255.255")
+        assert not tracer._is_private_ip("172.32.0.1")
+        assert not tracer._is_private_ip("192.169.0.1")
+        assert tracer._is_private_ip("fd12:3456::1")
+        assert tracer._is_private_ip("fe80::1%eth0")
+        assert not tracer._is_private_ip("2001:db8::1")
+        assert not tracer._is_private_ip("10.not.an.ip")
+
+        trace = tracer.trace_ip("10.1.2.3")
+        assert (trace["type"], trace["is_private"], trace["is_local"]) == ("private", True, False)
+
+    @pytest.mark.unit
+    def test_ip_cache_evicts_least_recently_used(self):
+        """Test that the cache is bounded and keeps recently used IPs"""
+        tracer = IPTracer(max_cache_size=2)
+
+        tracer.trace_ip("1.1.1.1")
+        tracer.trace_ip("2.2.2.2")
+        tracer.update_ip_activity("1.1.1.1", "failed_login")  # refreshes 1.1.1.1
+        tracer.trace_ip("3.3.3.3")
+
+        assert list(tracer._ip_cache) == ["1.1.1.1", "3.3.3.3"]
+        assert tracer.trace_ip("1.1.1.1")["failed_login_count"] == 1
+
+    @pytest.mark.unit
+    def test_analyze_ip_patterns_weights_distinct_ips(self):
+        """Test per-occurrence counts, deduplicated suspicious IPs and top activity"""
+        tracer = IPTracer()
+        tracer.blacklist_ip("5.5.5.5")
+
+        patterns = tracer.analyze_ip_patterns(
+            ["5.5.5.5", "10.0.0.1", "5.5.5.5", "10.0.0.2", "5.5.5.5"]
+        )
+
+        assert patterns["total_ips"] == 3
+        assert patterns["by_type"] == {"public": 3, "private": 2}
+        assert patterns["by_subnet"] == {"5.5.5.0/24": 3, "10.0.0.0/24": 2}
+        assert [entry["ip"] for entry in patterns["suspicious_ips"]] == ["5.5.5.5"]
+        assert patterns["high_activity_ips"] == [
+            {"ip": "5.5.5.5", "count": 3},
+            {"ip": "10.0.0.1", "count": 1},
+            {"ip": "10.0.0.2", "count": 1},
+        ]
+
+    @pytest.mark.unit
+    def test_calculate_threat_score(self):
+        """Test base scores, activity caps and the overall cap"""
+        tracer = IPTracer()
+
+        def score(malicious=False, whitelisted=False, private=False, failed=0, banned=0):
+            return tracer._calculate_threat_score(IPTrace(
+                '203.0.113.1', 'public', is_private=private,
+                is_whitelisted=whitelisted, is_known_malicious=malicious,
+                failed_login_count=failed, banned_count=banned,
+            ))
+
+        assert score() == 10
+        assert score(private=True) == 0
+        assert score(whitelisted=True, failed=2) == 10
+        assert score(failed=100) == 40
+        assert score(banned=1) == 30
+        assert score(malicious=True, whitelisted=True) == 90
+        assert score(malicious=True, failed=10, banned=10) == 100
+
+    @pytest.mark.unit
+    def test_detect_ip_sweep_counts_repeated_ips(self):
+        """Test that repeated IPs count toward their subnet's total"""
+        tracer = IPTracer()
+        ips = ['203.0.113.5'] * 6 + ['203.0.113.9'] * 4 + ['198.51.100.1'] * 9 + ['::1'] * 20
+
+        assert tracer.detect_ip_sweep(ips) == ['203.0.113.0/24']
+        assert tracer.detect_ip_sweep(ips, threshold=9) == ['203.0.113.0/24', '198.51.100.0/24']
+        assert tracer._get_subnet('10.1.2.3') == '10.1.2.0/24'
+        assert tracer._get_subnet('fe80::1') is None
+
+    @pytest.mark.unit
+    def test_trace_ip_returns_dict_snapshot(self):
+        """Test that traces are cached as records and returned as dicts"""
+        tracer = IPTracer()
+
+        trace = tracer.trace_ip("203.0.113.7")
+        tracer.update_ip_activity("203.0.113.7", "banned")
+
+        assert tuple(trace) == IP_TRACE_FIELDS
+        assert trace['banned_count'] == 0
+        assert tracer.trace_ip("203.0.113.7")['banned_count'] == 1
+        assert isinstance(tracer._ip_cache["203.0.113.7"], IPTrace)
+
+    @pytest.mark.unit
+    def test_export_ip_reputation_tracks_high_threat_ips(self):
+        """Test that the high-threat export follows score changes and evictions"""
+        tracer = IPTracer(max_cache_size=2)
+
+        def high_threat():
+            return [entry["ip"] for entry in tracer.export_ip_reputation()["high_threat_ips"]]
+
+        for activity in ["banned"] * 2 + ["failed_login"] * 3:
+            tracer.update_ip_activity("203.0.113.1", activity)
+        assert high_threat() == []
+
+        tracer.update_ip_activity("203.0.113.1", "failed_login")
+        tracer.blacklist_ip("198.51.100.1")
+        tracer.trace_ip("198.51.100.1")
+        assert high_threat() == ["203.0.113.1", "198.51.100.1"]
+
+        tracer.whitelist_ip("203.0.113.1")
+        assert high_threat() == ["198.51.100.1"]
+
+        tracer.trace_ip("192.0.2.1")
+        tracer.trace_ip("192.0.2.2")
+        assert high_threat() == []
@@ -6,7 +6,10 @@ Tests daily rotating logger functionality
 import pytest
 from unittest.mock import patch, Mock
 from pathlib import Path
-from logly.utils.logger import get_logger, initialize_logging, get_current_log_file
+from datetime import date
+from logly.utils.logger import (
+    DailyFileHandler, get_logger, initialize_logging, get_current_log_file
+)
 
 
 class TestLogger:
@@ -69,3 +72,48 @@ class TestLogger:
         # Check that log file was created
         log_files = list(temp_log_dir.glob("*.log"))
         assert len(log_files) > 0
+
+    @pytest.mark.unit
+    def test_daily_file_handler_switches_file_at_midnight(self, temp_log_dir):
+        """Test that rollover continues in the next day's dated file"""
+        import logging
+
+        with patch('logly.utils.logger.date') as mock_date:
+            mock_date.today.return_value = date(2025, 1, 15)
+            handler = DailyFileHandler(temp_log_dir, "logly")
+            first = logging.makeLogRecord({"msg": "before midnight"})
+            handler.emit(first)
+
+            mock_date.today.return_value = date(2025, 1, 16)
+            handler.rolloverAt = 0  # midnight has passed
+            handler.emit(logging.makeLogRecord({"msg": "after midnight"}))
+        handler.close()
+
+        assert (temp_log_dir / "logly-2025-01-15.log").read_text() == "before midnight\n"
+        assert (temp_log_dir / "logly-2025-01-16.log").read_text() == "after midnight\n"
+        assert handler.rolloverAt > first.created
+
+    @pytest.mark.unit
+    @patch('logly.utils.logger.get_logs_dir')
+    def test_get_logger_reuses_child_loggers(self, mock_get_logs_dir, temp_log_dir):
+        """Test that module loggers are looked up once"""
+        mock_get_logs_dir.return_value = temp_log_dir
+        initialize_logging()
+
+        with patch('logly.utils.logger.logging.getLogger') as mock_get:
+            first = get_logger("cached_module")
+            assert get_logger("cached_module") is first
+        assert mock_get.call_count == 1
+
+    @pytest.mark.unit
+    def test_dated_filename_cached_until_date_changes(self, temp_log_dir):
+        """Test that the dated filename is rebuilt only on a new date"""
+        with patch('logly.utils.logger.date') as mock_date:
+            mock_date.today.return_value = date(2025, 3, 1)
+            handler = DailyFileHandler(temp_log_dir, "logly")
+            first = handler.dated_filename()
+            assert handler.dated_filename() is first
+
+            mock_date.today.return_value = date(2025, 3, 2)
+            assert handler.dated_filename() == temp_log_dir / "logly-2025-03-02.log"
+        handler.close()
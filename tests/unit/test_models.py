@@ -9,6 +9,8 @@ import time
 from unittest.mock import patch
 
 from logly.storage.models import (
+    SYSTEM_METRIC_COLUMNS,
+    NETWORK_METRIC_COLUMNS,
     SystemMetric,
     NetworkMetric,
     LogEvent,
@@ -109,6 +111,17 @@ class TestSystemMetric:
         assert metric.load_5min is None
         assert metric.load_15min is None
 
+    @pytest.mark.unit
+    def test_as_insert_tuple(self):
+        """Test as_insert_tuple() follows SYSTEM_METRIC_COLUMNS order"""
+        metric = SystemMetric(timestamp=1234567890, cpu_percent=45.5, load_15min=1.8)
+
+        values = metric.as_insert_tuple()
+
+        assert values == tuple(metric.to_dict()[col] for col in SYSTEM_METRIC_COLUMNS)
+        assert values[0] == 1234567890
+        assert values[-1] == 1.8
+
 
 class TestNetworkMetric:
     """Test suite for NetworkMetric model"""
@@ -196,6 +209,16 @@ class TestNetworkMetric:
         assert metric.connections_listen is None
         assert metric.connections_time_wait is None
 
+    @pytest.mark.unit
+    def test_as_insert_tuple(self):
+        """Test as_insert_tuple() follows NETWORK_METRIC_COLUMNS order"""
+        metric = NetworkMetric(timestamp=1234567890, bytes_sent=100, connections_time_wait=2)
+
+        values = metric.as_insert_tuple()
+
+        assert values == tuple(metric.to_dict()[col] for col in NETWORK_METRIC_COLUMNS)
+        assert values[-1] == 2
+
 
 class TestLogEvent:
     """Test suite for LogEvent model"""
@@ -269,6 +292,20 @@ class TestLogEvent:
         assert data["message"] == "Test message"
         assert data.get("metadata") is None
 
+    @pytest.mark.unit
+    def test_as_insert_tuple(self):
+        """Test as_insert_tuple() orders columns and serializes metadata"""
+        event = LogEvent(
+            timestamp=1234567890, source="test", message="Test message",
+            level="INFO", metadata={"key": "value"}
+        )
+
+        assert event.as_insert_tuple() == (
+            1234567890, "test", "INFO", "Test message",
+            None, None, None, None, '{"key": "value"}'
+        )
+        assert LogEvent(timestamp=1, source="s", message="m").as_insert_tuple()[-1] is None
+
     @pytest.mark.unit
     def test_from_dict_with_metadata(self):
         """Test LogEvent.from_dict() with metadata"""
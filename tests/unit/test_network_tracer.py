@@ -355,3 +355,109 @@ class TestNetworkMonitor:
         assert stats["established"] == 0
         assert stats["listen"] == 0
         assert stats["other"] == 0  # Unknown state 'XX' goes to other
+
+
+class TestNetworkTracer:
+    """Test suite for NetworkTracer /proc/net/tcp parsing"""
+
+    @pytest.mark.unit
+    def test_parse_connection_line(self):
+        """Test little-endian IPv4 decoding and state mapping"""
+        from logly.tracers.network_tracer import NetworkTracer
+
+        tracer = NetworkTracer()
+        line = "   0: 0100007F:0050 0201A8C0:D431 0A 00000000:00000000 00:00000000 00000000     0        0 12345 1"
+
+        conn = tracer._parse_connection_line(line, '/proc/net/tcp')
+
+        assert conn == {
+            'local_ip': '127.0.0.1',
+            'local_port': 80,
+            'remote_ip': '192.168.1.2',
+            'remote_port': 54321,
+            'state': 'LISTEN',
+            'inode': '12345',
+        }
+        assert tracer._parse_connection_line("too short", '/proc/net/tcp') is None
+
+    @pytest.mark.unit
+    def test_parse_hex_address_ipv6(self):
+        """Test decoding /proc/net/tcp6 addresses (little-endian 32-bit words)"""
+        from logly.tracers.network_tracer import NetworkTracer
+
+        tracer = NetworkTracer()
+
+        assert tracer._parse_hex_address('00000000000000000000000001000000:0016', '/proc/net/tcp6') == ('::1', 22)
+        assert tracer._parse_hex_address('B80D0120000000000000000001000000:0050', '/proc/net/tcp6') == ('2001:db8::1', 80)
+        assert tracer._parse_hex_address(
+            '0000000000000000FFFF00000100007F:01BB', '/proc/net/tcp6'
+        ) == ('::ffff:127.0.0.1', 443)
+
+    @pytest.mark.unit
+    def test_parse_hex_address_memoizes_decoding(self):
+        """Test that repeated addresses are decoded once and bad hex falls back"""
+        from logly.tracers.network_tracer import NetworkTracer, _hex_to_ipv4
+
+        tracer = NetworkTracer()
+        _hex_to_ipv4.cache_clear()
+
+        for port in ('0016', '0050', '01BB'):
+            tracer._parse_hex_address(f'0101A8C0:{port}', '/proc/net/tcp')
+
+        assert _hex_to_ipv4.cache_info().misses == 1
+        assert _hex_to_ipv4.cache_info().hits == 2
+        assert tracer._parse_hex_address('ZZZZZZZZ:0050', '/proc/net/tcp') == ('ZZZZZZZZ:0050', 0)
+
+    @pytest.mark.unit
+    def test_get_all_connections_reuses_snapshot(self):
+        """Test that lookups share one snapshot until the TTL expires or refresh()"""
+        from logly.tracers.network_tracer import NetworkTracer
+
+        tracer = NetworkTracer(connection_ttl=60)
+        snapshot = [{'local_ip': '10.0.0.1', 'local_port': 22, 'remote_ip': '10.0.0.2',
+                     'remote_port': 5000, 'state': 'ESTABLISHED', 'inode': '1'}]
+
+        with patch.object(tracer, '_load_connections', return_value=snapshot) as load:
+            assert tracer.find_connections_by_ip('10.0.0.2') == snapshot
+            assert tracer.get_connection_stats()['established'] == 1
+            assert load.call_count == 1
+
+            tracer.refresh()
+            tracer.get_all_connections()
+            assert load.call_count == 2
+
+    @pytest.mark.unit
+    def test_trace_service_connections(self):
+        """Test filtering connections by a service's local ports in one pass"""
+        from logly.tracers.network_tracer import NetworkTracer
+
+        tracer = NetworkTracer()
+        snapshot = [
+            {'local_ip': '0.0.0.0', 'local_port': port, 'remote_ip': '0.0.0.0',
+             'remote_port': 0, 'state': 'LISTEN', 'inode': str(port)}
+            for port in (443, 22, 80, 5432)
+        ]
+
+        with patch.object(tracer, '_load_connections', return_value=snapshot):
+            assert [c['local_port'] for c in tracer.trace_service_connections('NGINX')] == [443, 80]
+            assert tracer.trace_service_connections('unknown') == []
+
+    @pytest.mark.unit
+    def test_tracer_get_connection_stats(self):
+        """Test per-state counts with unknown states bucketed as other"""
+        from logly.tracers.network_tracer import NetworkTracer
+
+        tracer = NetworkTracer()
+        snapshot = [{'state': state} for state in ('ESTABLISHED', 'LISTEN', 'ESTABLISHED', 'CLOSING', '0C')]
+
+        with patch.object(tracer, '_load_connections', return_value=snapshot):
+            assert tracer.get_connection_stats() == {
+                'total': 5,
+                'established': 2,
+                'listen': 1,
+                'time_wait': 0,
+                'close_wait': 0,
+                'syn_sent': 0,
+                'syn_recv': 0,
+                'other': 2,
+            }
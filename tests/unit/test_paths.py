@@ -8,6 +8,7 @@ from unittest.mock import Mock, patch, mock_open
 from datetime import datetime
 
 from logly.exporters.report_generator import ReportGenerator
+from logly.utils import paths
 
 
 class TestReportGenerator:
@@ -337,4 +338,66 @@ class TestReportGenerator:
         assert stats['system']['max_cpu'] == 45.0
         assert stats['system']['avg_memory'] == 50.0  # Only one valid value
         assert stats['system']['max_memory'] == 50.0
-        assert stats['system']['avg_disk'] == 60.0  # Only one valid value
\ No newline at end of file
+        assert stats['system']['avg_disk'] == 60.0  # Only one valid value
+
+
+class TestPaths:
+    """Test suite for logly.utils.paths"""
+
+    @pytest.mark.unit
+    def test_directories_created_once_until_refresh(self, temp_dir):
+        """Test that the directories are created on first use and after refresh()"""
+        logs_dir, db_dir = temp_dir / "logs", temp_dir / "db"
+
+        with patch.multiple(paths, _LOGS_DIR=logs_dir, _DB_DIR=db_dir, _DIRS_READY=False):
+            assert paths.get_logs_dir() == logs_dir
+            assert logs_dir.is_dir() and db_dir.is_dir()
+
+            logs_dir.rmdir()
+            paths.get_logs_dir()
+            assert not logs_dir.exists()
+
+            paths.refresh()
+            paths.get_logs_dir()
+            assert logs_dir.is_dir()
+        paths.refresh()
+
+    @pytest.mark.unit
+    def test_paths_resolved_from_project_root(self):
+        """Test that the cached paths hang off the project root"""
+        root = paths.get_project_root()
+
+        assert root == paths.Path(paths.__file__).parent.parent.parent.resolve()
+        assert paths.get_logs_dir() == root / "logs"
+        assert paths.get_db_dir() == root / "db"
+        assert paths.get_db_path() == root / "db" / "logly.db"
+
+    @pytest.mark.unit
+    def test_validate_paths_outside_test_mode(self):
+        """Test validation against the hardcoded paths with memoized resolution"""
+        root = paths.get_project_root()
+        paths.refresh()
+
+        with patch.object(paths, "_TEST_MODE", False):
+            assert paths.validate_db_path(str(root / "db" / ".." / "db" / "logly.db"))
+            assert paths.validate_db_path(str(root / "db" / "logly.db"))
+            assert not paths.validate_db_path("/tmp/other.db")
+            assert paths.validate_log_dir(str(root / "logs"))
+            assert not paths.validate_log_dir("/tmp")
+            assert not paths.validate_db_path("/tmp/other.db")
+
+        assert paths._resolve_absolute.cache_info().misses == 5
+        assert paths._resolve_absolute.cache_info().hits == 1
+        assert paths.validate_db_path("/tmp/other.db")  # test mode allows any path
+
+        paths.refresh()
+        assert paths._resolve_absolute.cache_info().currsize == 0
+
+    @pytest.mark.unit
+    def test_validate_relative_path_follows_cwd(self, monkeypatch, tmp_path):
+        """Test that a relative db path is re-resolved after the working directory changes"""
+        monkeypatch.chdir(paths.get_project_root())
+        with patch.object(paths, "_TEST_MODE", False):
+            assert paths.validate_db_path("db/logly.db")
+            monkeypatch.chdir(tmp_path)
+            assert not paths.validate_db_path("db/logly.db")
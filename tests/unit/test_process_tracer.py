@@ -3,6 +3,7 @@ Unit tests for logly.tracers.process_tracer module
 """
 
 import pytest
+from pathlib import Path
 from unittest.mock import patch, mock_open
 from logly.tracers.process_tracer import ProcessTracer
 
@@ -49,3 +50,106 @@ class TestProcessTracer:
         pids = tracer.find_process_by_name("nginx")
         
         assert isinstance(pids, list)
+
+    @pytest.mark.unit
+    def test_get_child_processes_uses_one_index(self, tmp_path):
+        """Test that children come from a single /proc pass reused within the TTL"""
+        for pid, ppid in [(1, 0), (10, 1), (11, 1), (20, 10)]:
+            (tmp_path / str(pid)).mkdir()
+            (tmp_path / str(pid) / 'stat').write_text(f"{pid} (proc name) S {ppid} 0 0\n")
+        (tmp_path / 'self').mkdir()
+
+        tracer = ProcessTracer(snapshot_ttl=60)
+        tracer._proc_path = tmp_path
+
+        assert sorted(tracer._get_child_processes(1)) == [10, 11]
+        assert tracer._get_child_processes(10) == [20]
+        assert tracer._get_child_processes(20) == []
+
+        # A new process only shows up after the index is rebuilt
+        (tmp_path / '30').mkdir()
+        (tmp_path / '30' / 'stat').write_text("30 (x) S 20 0 0\n")
+        assert tracer._get_child_processes(20) == []
+        tracer._children_index = None
+        assert tracer._get_child_processes(20) == [30]
+
+    @pytest.mark.unit
+    def test_proc_reads_are_shared_within_snapshot(self, tmp_path):
+        """Test that find/trace/summary reuse each /proc file read within the TTL"""
+        proc = tmp_path / '42'
+        proc.mkdir()
+        (proc / 'cmdline').write_text("nginx\x00-g\x00daemon off;")
+        (proc / 'status').write_text("Name:\tnginx\nPPid:\t1\nVmRSS:\t2048 kB\nThreads:\t4\n")
+        (proc / 'io').write_text("rchar: 100\nwchar: 200\n")
+        (proc / 'stat').write_text("42 (nginx) S 1 42 42 0 -1 0 0 0 0 0 5 6 0 0 20 0 4 0 99\n")
+
+        tracer = ProcessTracer(snapshot_ttl=60)
+        tracer._proc_path = tmp_path
+
+        read_text, read_bytes = Path.read_text, Path.read_bytes
+        with patch('pathlib.Path.read_text', autospec=True, side_effect=read_text) as reads, \
+                patch('pathlib.Path.read_bytes', autospec=True, side_effect=read_bytes) as byte_reads:
+            traces = tracer.trace_by_name('nginx')
+            summary = tracer.get_resource_summary([42])
+
+        assert [trace['pid'] for trace in traces] == [42]
+        assert summary['total_memory_rss'] == 2048
+        assert summary['total_write_bytes'] == 200
+        read_files = sorted(call.args[0].name for call in reads.call_args_list + byte_reads.call_args_list)
+        assert read_files == ['cmdline', 'io', 'stat', 'stat', 'status']
+        assert traces[0]['cmdline'] == 'nginx -g daemon off;'
+
+    @pytest.mark.unit
+    def test_get_cmdline_tolerates_invalid_utf8(self, tmp_path):
+        """Test NUL-separated args are joined and undecodable bytes replaced"""
+        (tmp_path / '7').mkdir()
+        (tmp_path / '7' / 'cmdline').write_bytes(b"app\x00--name\x00caf\xe9\x00")
+
+        tracer = ProcessTracer()
+        tracer._proc_path = tmp_path
+
+        assert tracer._get_cmdline(7) == 'app --name caf\ufffd'
+        assert tracer._get_cmdline(8) is None
+
+    @pytest.mark.unit
+    def test_get_status_parses_wanted_fields(self, tmp_path):
+        """Test that only the known status fields are extracted and converted"""
+        (tmp_path / '9').mkdir()
+        (tmp_path / '9' / 'status').write_text(
+            "Name:\tmy worker\nUmask:\t0022\nState:\tS (sleeping)\nPid:\t9\nPPid:\t1\n"
+            "Uid:\t1000\t1000\t1000\t1000\nVmPeak:\t    9000 kB\nVmSize:\t    8000 kB\n"
+            "VmRSS:\t    1200 kB\nThreads:\t3\nvoluntary_ctxt_switches:\t15\n"
+            "nonvoluntary_ctxt_switches:\t2\n"
+        )
+
+        tracer = ProcessTracer()
+        tracer._proc_path = tmp_path
+
+        assert tracer._get_status(9) == {
+            'name': 'my worker',
+            'state': 'S',
+            'ppid': 1,
+            'uid': '1000\t1000\t1000\t1000',
+            'vm_size': 8000,
+            'vm_rss': 1200,
+            'threads': 3,
+            'voluntary_switches': 15,
+            'nonvoluntary_switches': 2,
+        }
+        assert tracer._get_status(10) == {}
+
+    @pytest.mark.unit
+    def test_find_process_by_name_falls_back_to_comm(self, tmp_path):
+        """Test matching on cmdline first, then on the comm name without reading status"""
+        for pid, cmdline, comm in [(1, b"/sbin/init\x00", b"systemd\n"), (2, b"", b"kworker/0:1\n"),
+                                   (3, b"/usr/bin/NGINX\x00", b"nginx\n")]:
+            (tmp_path / str(pid)).mkdir()
+            (tmp_path / str(pid) / 'cmdline').write_bytes(cmdline)
+            (tmp_path / str(pid) / 'comm').write_bytes(comm)
+
+        tracer = ProcessTracer()
+        tracer._proc_path = tmp_path
+
+        assert tracer.find_process_by_name('nginx') == [3]
+        assert tracer.find_process_by_name('KWORKER') == [2]
+        assert tracer.find_process_by_name('systemd') == [1]
@@ -202,6 +202,8 @@ class TestReportGenerator:
 
         assert generator._format_bytes(0) == "0 B"
         assert generator._format_bytes(512) == "512 B"
+        assert generator._format_bytes(512.0) == "512 B"
+        assert generator._format_bytes(512.7) == "512 B"
         assert generator._format_bytes(1024) == "1.00 KB"
         assert generator._format_bytes(1024 * 1024) == "1.00 MB"
         assert generator._format_bytes(1024 * 1024 * 1024) == "1.00 GB"
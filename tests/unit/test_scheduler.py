@@ -227,6 +227,18 @@ class TestScheduler:
         assert not scheduler.running
         mock_thread.join.assert_called_once_with(timeout=5)
 
+    @pytest.mark.unit
+    def test_stop_flushes_grouped_writes(self, mock_config, test_store, mock_system_metric):
+        """Test that stop() commits single-row inserts still held for the group commit"""
+        scheduler = Scheduler(mock_config, test_store)
+        scheduler.running = True
+        test_store.insert_system_metric(mock_system_metric)
+        assert test_store._pending_writes == 1
+
+        scheduler.stop()
+
+        assert test_store._pending_writes == 0
+
     @pytest.mark.unit
     def test_stop_not_running(self, mock_config, test_store):
         """Test stopping scheduler when not running"""
@@ -10,7 +10,7 @@ from unittest.mock import patch
 from pathlib import Path
 
 from logly.storage.sqlite_store import SQLiteStore
-from logly.storage.models import SystemMetric, NetworkMetric, LogEvent
+from logly.storage.models import SystemMetric, NetworkMetric, LogEvent, SYSTEM_METRIC_COLUMNS
 
 
 class TestSQLiteStore:
@@ -26,6 +26,20 @@ class TestSQLiteStore:
                 assert store.db_path == Path(temp_db_path)
                 assert store.db_path.exists()
 
+    @pytest.mark.unit
+    def test_readers_do_not_see_uncommitted_grouped_writes(self, test_store, mock_system_metric):
+        """Test that pooled readers only see grouped writes once they are committed"""
+        test_store.insert_system_metric(mock_system_metric)
+        assert test_store._pending_writes == 1
+
+        reader = test_store._open_reader()  # bypasses the flush in _read_connection()
+        try:
+            assert reader.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0] == 0
+            test_store.flush()
+            assert reader.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0] == 1
+        finally:
+            test_store._release_reader(reader)
+
     @pytest.mark.unit
     def test_init_with_invalid_path(self):
         """Test SQLiteStore initialization with invalid path"""
@@ -69,6 +83,266 @@ class TestSQLiteStore:
             result = conn.execute("SELECT 1").fetchone()
             assert result is not None
 
+    @pytest.mark.unit
+    def test_write_connection_is_reused(self, test_store, mock_system_metric):
+        """Test that writes share a single long-lived writer connection"""
+        test_store.insert_system_metric(mock_system_metric)
+        writer = test_store._writer
+
+        test_store.insert_system_metric(mock_system_metric)
+
+        assert writer is not None
+        assert test_store._writer is writer
+
+    @pytest.mark.unit
+    def test_write_connection_rolls_back_on_error(self, test_store):
+        """Test that a failing write block leaves no partial data behind"""
+        with pytest.raises(RuntimeError):
+            with test_store._write_connection() as conn:
+                conn.execute(
+                    "INSERT INTO system_metrics (timestamp, cpu_percent) VALUES (?, ?)",
+                    (int(time.time()), 10.0)
+                )
+                raise RuntimeError("boom")
+
+        assert test_store.get_stats()["system_metrics"] == 0
+
+    @pytest.mark.unit
+    def test_single_row_inserts_are_group_committed(self, file_store, temp_db_path):
+        """Test that single-row inserts share a transaction until flushed"""
+        import sqlite3
+
+        def committed_rows():
+            conn = sqlite3.connect(temp_db_path)
+            try:
+                return conn.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0]
+            finally:
+                conn.close()
+
+        file_store.COMMIT_BATCH_SIZE = 3
+        for i in range(2):
+            file_store.insert_system_metric(SystemMetric(timestamp=1000 + i, cpu_percent=1.0))
+
+        assert file_store._pending_writes == 2
+        assert committed_rows() == 0
+
+        # Reaching the batch size commits the whole group
+        file_store.insert_system_metric(SystemMetric(timestamp=1002, cpu_percent=1.0))
+        assert file_store._pending_writes == 0
+        assert committed_rows() == 3
+
+        file_store.insert_system_metric(SystemMetric(timestamp=1003, cpu_percent=1.0))
+        file_store.flush()
+        assert committed_rows() == 4
+
+    @pytest.mark.unit
+    def test_write_retries_while_database_is_locked(self, file_store, temp_db_path):
+        """Test that BEGIN IMMEDIATE is retried until another writer releases the lock"""
+        import sqlite3
+        import threading
+
+        with file_store._writer_lock:
+            file_store._get_writer().execute("PRAGMA busy_timeout=0")
+
+        other = sqlite3.connect(temp_db_path, isolation_level=None, check_same_thread=False)
+        other.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.2, lambda: other.execute("COMMIT"))
+        release.start()
+        try:
+            with file_store._write_connection() as conn:
+                conn.execute("INSERT INTO system_metrics (timestamp) VALUES (?)", (1000,))
+        finally:
+            release.join()
+            other.close()
+
+        assert file_store.get_stats()["system_metrics"] == 1
+
+    @pytest.mark.unit
+    def test_failed_write_keeps_pending_grouped_writes(self, test_store):
+        """Test that a failing block only rolls back its own changes"""
+        test_store.insert_system_metric(SystemMetric(timestamp=1000, cpu_percent=1.0))
+
+        with pytest.raises(RuntimeError):
+            with test_store._write_connection() as conn:
+                conn.execute("INSERT INTO system_metrics (timestamp) VALUES (?)", (1001,))
+                raise RuntimeError("boom")
+
+        metrics = test_store.get_system_metrics(0, 2000)
+        assert [m["timestamp"] for m in metrics] == [1000]
+
+    @pytest.mark.unit
+    def test_read_connection_is_read_only_and_pooled(self, test_store):
+        """Test that getters check out read-only connections from a pool"""
+        import sqlite3
+        import threading
+
+        with test_store._read_connection() as conn:
+            main_reader = conn
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute(
+                    "INSERT INTO system_metrics (timestamp) VALUES (?)", (1,)
+                )
+
+        # A checked-in reader is reused by any thread
+        readers = []
+
+        def read():
+            with test_store._read_connection() as conn:
+                readers.append(conn)
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        assert readers[0] is main_reader
+
+        # Concurrent checkouts get distinct connections
+        with test_store._read_connection() as first:
+            with test_store._read_connection() as second:
+                assert first is not second
+        assert test_store.pool_stats() == {"open": 2, "idle": 2, "opened": 2}
+
+    @pytest.mark.unit
+    def test_read_pool_closes_surplus_readers(self, temp_db_path):
+        """Test that readers beyond READ_POOL_SIZE are closed when returned"""
+        from contextlib import ExitStack
+
+        with patch.object(SQLiteStore, "READ_POOL_SIZE", 2):
+            test_store = SQLiteStore(temp_db_path)
+
+        with ExitStack() as stack:
+            for _ in range(4):
+                stack.enter_context(test_store._read_connection())
+            assert test_store.pool_stats()["open"] == 4
+
+        assert test_store.pool_stats() == {"open": 2, "idle": 2, "opened": 4}
+
+        with test_store._read_connection() as conn:
+            test_store.close()
+        assert test_store.pool_stats()["idle"] == 0
+        assert test_store.get_system_metrics(0, 1) == []
+        test_store.close()
+
+    @pytest.mark.unit
+    def test_read_connection_applies_read_pragmas(self, file_store):
+        """Test that readers get their own page cache, mmap window and temp store"""
+        with file_store._read_connection() as conn:
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -file_store.CACHE_SIZE_KIB
+            assert conn.execute("PRAGMA mmap_size").fetchone()[0] == file_store.MMAP_SIZE
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    @pytest.mark.unit
+    def test_checkpoint_truncates_wal(self, file_store, mock_system_metric):
+        """Test that checkpoint() folds the WAL into the main database file"""
+        file_store.insert_system_metric(mock_system_metric)
+        wal_path = Path(str(file_store.db_path) + "-wal")
+        assert wal_path.stat().st_size > 0
+
+        result = file_store.checkpoint()
+
+        assert result["busy"] == 0
+        assert wal_path.stat().st_size == 0
+
+    @pytest.mark.unit
+    def test_backup_includes_grouped_writes(self, test_store, temp_dir):
+        """Test that backup() commits pending writes and copies every page"""
+        import sqlite3
+
+        test_store.insert_system_metric(SystemMetric(timestamp=1000, cpu_percent=1.0))
+        assert test_store._pending_writes == 1
+
+        backup_path = test_store.backup(str(temp_dir / "backup.db"), pages=1)
+
+        assert test_store._pending_writes == 0
+        conn = sqlite3.connect(backup_path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0] == 1
+            assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        finally:
+            conn.close()
+
+    @pytest.mark.unit
+    def test_cleanup_releases_pages_incrementally(self, file_store):
+        """Test that cleanup_old_data() frees pages without a full VACUUM"""
+        file_store.insert_system_metrics(
+            SystemMetric(timestamp=1000 + i, cpu_percent=float(i)) for i in range(5000)
+        )
+        file_store.checkpoint()
+        size_before = Path(file_store.db_path).stat().st_size
+
+        file_store.cleanup_old_data(retention_days=1)
+        file_store.checkpoint()
+
+        with file_store._read_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        assert Path(file_store.db_path).stat().st_size < size_before
+
+    @pytest.mark.unit
+    def test_file_store_optimizes_on_open(self, temp_db_path):
+        """Test that opening a file database runs PRAGMA optimize once with the open mask"""
+        with patch.object(SQLiteStore, "optimize") as mock_optimize:
+            store = SQLiteStore(temp_db_path)
+            store.close()
+
+        mock_optimize.assert_called_once_with(SQLiteStore.OPTIMIZE_ON_OPEN)
+
+    @pytest.mark.unit
+    def test_checkpoint_rejects_invalid_mode(self, test_store):
+        """Test that checkpoint() validates the mode before building the PRAGMA"""
+        with pytest.raises(ValueError):
+            test_store.checkpoint("TRUNCATE); DROP TABLE system_metrics; --")
+
+    @pytest.mark.unit
+    def test_write_schedules_background_maintenance(self, file_store, mock_system_metric):
+        """Test that a write past the interval checkpoints on a background thread"""
+        import sqlite3
+
+        file_store.CHECKPOINT_INTERVAL = 0
+        with patch.object(file_store, "checkpoint", wraps=file_store.checkpoint) as checkpoint:
+            file_store.insert_system_metric(mock_system_metric)
+
+            thread = file_store._maintenance_thread
+            assert thread is not None
+            thread.join(timeout=10)
+        checkpoint.assert_called_once_with("PASSIVE")
+
+        # immutable=1 ignores the WAL, so this reads the main file alone
+        conn = sqlite3.connect(f"file:{file_store.db_path}?immutable=1", uri=True)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0] == 1
+        finally:
+            conn.close()
+
+    @pytest.mark.unit
+    def test_passive_checkpoint_skips_writer_lock(self, file_store, mock_system_metric):
+        """Test that a PASSIVE checkpoint does not wait for the writer lock"""
+        import threading
+
+        file_store.insert_system_metric(mock_system_metric)
+        file_store.flush()
+
+        results = []
+        with file_store._writer_lock:
+            worker = threading.Thread(target=lambda: results.append(file_store.checkpoint("PASSIVE")))
+            worker.start()
+            worker.join(timeout=5)
+            assert not worker.is_alive()
+
+        assert results[0]["busy"] == 0
+        assert results[0]["checkpointed_frames"] == results[0]["log_frames"]
+
+    @pytest.mark.unit
+    def test_close_releases_connections(self, file_store, mock_system_metric):
+        """Test that close() drops connections and the store reopens lazily"""
+        file_store.insert_system_metric(mock_system_metric)
+        file_store.get_system_metrics(0, int(time.time()) + 60)
+
+        file_store.close()
+
+        assert file_store._writer is None
+        assert file_store._readers == []
+        assert len(file_store.get_system_metrics(0, int(time.time()) + 60)) == 1
+
     @pytest.mark.unit
     def test_insert_system_metric(self, test_store, mock_system_metric):
         """Test inserting a system metric"""
@@ -88,6 +362,49 @@ class TestSQLiteStore:
             assert row["cpu_percent"] == mock_system_metric.cpu_percent
             assert row["memory_percent"] == mock_system_metric.memory_percent
 
+    @pytest.mark.unit
+    def test_insert_system_metrics_batch(self, test_store):
+        """Test inserting many system metrics in one transaction"""
+        metrics = [
+            SystemMetric(timestamp=1000 + i, cpu_percent=float(i), memory_percent=50.0)
+            for i in range(20)
+        ]
+
+        assert test_store.insert_system_metrics(metrics) == 20
+        assert test_store.insert_system_metrics([]) == 0
+        assert test_store._pending_writes == 0  # committed, not grouped
+
+        rows = test_store.get_system_metrics(1000, 1019)
+        assert [row["cpu_percent"] for row in rows] == [float(i) for i in reversed(range(20))]
+
+    @pytest.mark.unit
+    def test_insert_network_metrics_and_log_events_batch(self, test_store):
+        """Test batch inserts for network metrics and log events"""
+        assert test_store.insert_network_metrics(
+            NetworkMetric(timestamp=1000 + i, bytes_sent=i) for i in range(4)
+        ) == 4
+        assert test_store.insert_log_events([
+            LogEvent(timestamp=1000, source="auth", message="one", metadata={"k": 1}),
+            LogEvent(timestamp=1001, source="auth", message="two", level="ERROR"),
+        ]) == 2
+        assert test_store._pending_writes == 0  # committed, not grouped
+
+        assert len(test_store.get_network_metrics(1000, 1003)) == 4
+        events = test_store.get_log_events(1000, 1001)
+        assert {e["message"]: e["metadata"] for e in events} == {"one": '{"k": 1}', "two": None}
+
+    @pytest.mark.unit
+    def test_insert_system_metrics_iter_consumes_generator(self, test_store):
+        """Test inserting raw column-ordered rows from a generator"""
+        padding = (None,) * (len(SYSTEM_METRIC_COLUMNS) - 2)
+        rows = ((2000 + i, float(i)) + padding for i in range(5))
+
+        assert test_store.insert_system_metrics_iter(rows) == 5
+        assert test_store.insert_system_metrics_iter(iter(())) == 0
+
+        stored = test_store.get_system_metrics(2000, 2004)
+        assert sorted(row["cpu_percent"] for row in stored) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
     @pytest.mark.unit
     def test_get_system_metrics(self, test_store, mock_system_metric):
         """Test retrieving system metrics by time range"""
@@ -287,6 +604,29 @@ class TestSQLiteStore:
         assert len(events) == 1
         assert events[0]["level"] == "ERROR"
 
+    @pytest.mark.unit
+    def test_get_log_events_filtered_with_limit(self, test_store):
+        """Test combining source and level filters with a bound limit"""
+        base_time = int(time.time())
+
+        for i in range(5):
+            test_store.insert_log_event(
+                LogEvent(timestamp=base_time + i, source="auth", message=f"Fail {i}", level="ERROR")
+            )
+        test_store.insert_log_event(
+            LogEvent(timestamp=base_time, source="syslog", message="Other", level="ERROR")
+        )
+
+        events = test_store.get_log_events(
+            start_time=base_time - 60,
+            end_time=base_time + 60,
+            source="auth",
+            level="ERROR",
+            limit=2
+        )
+
+        assert [e["message"] for e in events] == ["Fail 4", "Fail 3"]
+
     @pytest.mark.unit
     def test_compute_hourly_aggregates(self, test_store):
         """Test computing hourly aggregates"""
@@ -317,6 +657,78 @@ class TestSQLiteStore:
             assert row["avg_cpu_percent"] == pytest.approx(50.0, 0.1)
             assert row["max_cpu_percent"] == 60.0
 
+    @pytest.mark.unit
+    def test_compute_hourly_aggregates_log_counts(self, test_store):
+        """Test hourly log counts from the partial indexes, bounded to the hour"""
+        base_time = int(time.time())
+        hour_start = base_time - (base_time % 3600)
+
+        events = [
+            LogEvent(timestamp=hour_start, source="auth", message="a", action="failed_login"),
+            LogEvent(timestamp=hour_start + 10, source="auth", message="b", action="failed_login"),
+            LogEvent(timestamp=hour_start + 20, source="fail2ban", message="c", action="banned"),
+            LogEvent(timestamp=hour_start + 30, source="syslog", message="d", level="ERROR"),
+            LogEvent(timestamp=hour_start + 40, source="syslog", message="e", level="WARNING"),
+            # Outside the hour window
+            LogEvent(timestamp=hour_start + 3600, source="syslog", message="f", level="ERROR"),
+        ]
+        for event in events:
+            test_store.insert_log_event(event)
+
+        test_store.compute_hourly_aggregates(hour_start)
+
+        with test_store._connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM hourly_aggregates WHERE hour_timestamp = ?",
+                (hour_start,)
+            ).fetchone()
+
+        assert row["log_events_count"] == 5
+        assert row["failed_login_count"] == 2
+        assert row["banned_ip_count"] == 1
+        assert row["error_count"] == 1
+        assert row["warning_count"] == 1
+
+    @pytest.mark.unit
+    def test_compute_hourly_aggregates_without_data_skips_writer(self, test_store):
+        """Test that an empty hour is only read, never written"""
+        with patch.object(test_store, "_write_connection") as write_connection:
+            test_store.compute_hourly_aggregates(3600)
+
+        write_connection.assert_not_called()
+
+    @pytest.mark.unit
+    def test_init_adds_missing_schema_objects(self, file_store, temp_db_path):
+        """Test that reopening a database restores indexes missing from it"""
+        with file_store._connection() as conn:
+            conn.execute("DROP INDEX idx_log_events_error_ts")
+            conn.commit()
+
+        SQLiteStore(temp_db_path)
+
+        with file_store._connection() as conn:
+            row = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name = 'idx_log_events_error_ts'"
+            ).fetchone()
+        assert row is not None
+
+    @pytest.mark.unit
+    def test_init_applies_schema_in_one_transaction(self, temp_db_path):
+        """Test that a failing schema script leaves no partially created objects"""
+        import sqlite3
+        from logly.utils.create_db import load_schema_sql
+
+        broken = load_schema_sql() + "\nINSERT INTO missing_table VALUES (1);"
+        with patch("logly.storage.sqlite_store.load_schema_sql", return_value=broken):
+            with pytest.raises(sqlite3.OperationalError):
+                SQLiteStore(temp_db_path)
+
+        conn = sqlite3.connect(temp_db_path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+        finally:
+            conn.close()
+
     @pytest.mark.unit
     def test_compute_daily_aggregates(self, test_store):
         """Test computing daily aggregates"""
@@ -341,6 +753,30 @@ class TestSQLiteStore:
             assert row is not None
             assert row["date"] == date_str
 
+    @pytest.mark.unit
+    def test_compute_daily_aggregates_uses_utc_day_bounds(self, test_store):
+        """Test that daily unique counts only include events from that UTC day"""
+        day_start = 1736899200  # 2025-01-15 00:00:00 UTC
+
+        for ts, ip in [
+            (day_start - 1, "10.0.0.1"),       # previous day
+            (day_start, "10.0.0.2"),
+            (day_start + 86399, "10.0.0.3"),
+            (day_start + 86400, "10.0.0.4"),   # next day
+        ]:
+            test_store.insert_log_event(
+                LogEvent(timestamp=ts, source="auth", message="x", ip_address=ip)
+            )
+
+        test_store.compute_daily_aggregates("2025-01-15")
+
+        with test_store._connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM daily_aggregates WHERE date = ?", ("2025-01-15",)
+            ).fetchone()
+
+        assert row["unique_ips_banned"] == 2
+
     @pytest.mark.unit
     def test_cleanup_old_data(self, test_store):
         """Test cleaning up old data"""
@@ -388,6 +824,69 @@ class TestSQLiteStore:
         assert stats["log_events"] == 1
         assert isinstance(stats["database_size_mb"], float)
 
+    @pytest.mark.unit
+    def test_get_stats_tracks_deletes_and_replaces(self, test_store):
+        """Test that trigger-maintained counts stay exact through DELETE and REPLACE"""
+        current_time = int(time.time())
+        hour_start = current_time - (current_time % 3600)
+
+        test_store.insert_system_metric(SystemMetric(timestamp=hour_start, cpu_percent=10.0))
+        test_store.insert_system_metric(
+            SystemMetric(timestamp=current_time - 100 * 86400, cpu_percent=20.0)
+        )
+
+        # Recomputing the same hour replaces the existing aggregate row
+        test_store.compute_hourly_aggregates(hour_start)
+        test_store.compute_hourly_aggregates(hour_start)
+        test_store.cleanup_old_data(retention_days=30)
+
+        stats = test_store.get_stats()
+
+        assert stats["system_metrics"] == 1
+        assert stats["hourly_aggregates"] == 1
+
+    @pytest.mark.unit
+    def test_row_counters_with_raw_connection_writes(self, file_store, temp_db_path):
+        """Test counters through a plain sqlite3 connection and reconciliation of REPLACE drift"""
+        import sqlite3
+
+        row = (3600,) + (1,) * 14
+        conn = sqlite3.connect(temp_db_path)
+        try:
+            for _ in range(3):
+                conn.execute(SQLiteStore._UPSERT_HOURLY_AGGREGATE, row)
+            conn.commit()
+            assert file_store.get_stats()["hourly_aggregates"] == 1
+
+            # REPLACE without recursive_triggers skips the delete trigger
+            for _ in range(3):
+                conn.execute(
+                    "INSERT OR REPLACE INTO hourly_aggregates (hour_timestamp) VALUES (7200)"
+                )
+            conn.commit()
+        finally:
+            conn.close()
+        assert file_store.get_stats()["hourly_aggregates"] == 4
+
+        assert file_store.reconcile_row_counters() == {"hourly_aggregates": 2}
+        assert file_store.get_stats()["hourly_aggregates"] == 2
+        assert file_store.reconcile_row_counters() == {}
+
+    @pytest.mark.unit
+    def test_get_stats_seeds_counters_for_existing_database(self, temp_db_path):
+        """Test that a database created without row_counters gets seeded counts"""
+        import sqlite3
+
+        conn = sqlite3.connect(temp_db_path)
+        conn.execute("CREATE TABLE system_metrics (id INTEGER PRIMARY KEY, timestamp INTEGER NOT NULL)")
+        conn.executemany("INSERT INTO system_metrics (timestamp) VALUES (?)", [(1,), (2,), (3,)])
+        conn.commit()
+        conn.close()
+
+        store = SQLiteStore(temp_db_path)
+
+        assert store.get_stats()["system_metrics"] == 3
+
     @pytest.mark.unit
     def test_insert_event_trace(self, test_store):
         """Test inserting event trace"""
@@ -520,6 +1019,34 @@ class TestSQLiteStore:
             assert row["remote_ip"] == "192.168.1.100"
             assert row["state"] == "ESTABLISHED"
 
+    @pytest.mark.unit
+    def test_insert_event_trace_with_many_children(self, test_store):
+        """Test that every process and connection of a high fan-out trace is stored"""
+        trace = {
+            'timestamp': int(time.time()),
+            'source': 'test',
+            'severity_score': 50,
+            'message': 'Test',
+            'processes': [{'pid': pid, 'name': f'worker{pid}'} for pid in range(100, 120)],
+            'network_connections': [
+                {'local_ip': '127.0.0.1', 'local_port': port} for port in range(8000, 8015)
+            ],
+        }
+
+        trace_id = test_store.insert_event_trace(trace)
+
+        with test_store._connection() as conn:
+            pids = [row["pid"] for row in conn.execute(
+                "SELECT pid FROM process_traces WHERE trace_id = ? ORDER BY pid", (trace_id,)
+            )]
+            ports = [row["local_port"] for row in conn.execute(
+                "SELECT local_port FROM network_traces WHERE trace_id = ? ORDER BY local_port",
+                (trace_id,)
+            )]
+
+        assert pids == list(range(100, 120))
+        assert ports == list(range(8000, 8015))
+
     @pytest.mark.unit
     def test_insert_event_trace_with_error(self, test_store):
         """Test inserting event trace with error information"""
@@ -597,6 +1124,33 @@ class TestSQLiteStore:
         assert ip_rep['threat_score'] == 85
         assert ip_rep['is_blacklisted'] == 1
 
+    @pytest.mark.unit
+    def test_update_ip_reputation_existing_ip(self, test_store):
+        """Test that a repeated IP updates the existing reputation row"""
+        def make_trace(threat_score):
+            return {
+                'timestamp': int(time.time()),
+                'source': 'test',
+                'severity_score': 50,
+                'message': 'Test',
+                'ip_info': {
+                    'ip': '10.0.0.5',
+                    'type': 'private',
+                    'threat_score': threat_score,
+                    'failed_login_count': 2,
+                    'banned_count': 0
+                }
+            }
+
+        test_store.insert_event_trace(make_trace(30))
+        first = test_store.get_ip_reputation('10.0.0.5')
+        test_store.insert_event_trace(make_trace(90))
+        ip_rep = test_store.get_ip_reputation('10.0.0.5')
+
+        assert ip_rep['total_events'] == 2
+        assert ip_rep['threat_score'] == 90
+        assert ip_rep['first_seen'] == first['first_seen']
+
     @pytest.mark.unit
     def test_get_traces(self, test_store):
         """Test retrieving traces"""
@@ -737,3 +1291,41 @@ class TestSQLiteStore:
         assert 'by_category' in patterns
         assert len(patterns['by_type']) > 0
         assert len(patterns['by_category']) > 0
+        assert patterns['by_type'] == [
+            {'error_type': 'connection_error', 'count': 2},
+            {'error_type': 'database_error', 'count': 1},
+        ]
+        assert patterns['by_category'][0] == {'error_category': 'network', 'count': 2}
+
+    @pytest.mark.unit
+    def test_get_high_threat_ips_raw_rows(self, test_store):
+        """Test that raw=True returns sqlite3.Row objects with mapping access"""
+        import sqlite3
+
+        with test_store._write_connection() as conn:
+            for ip, score, last_seen in [("1.1.1.1", 90, 10), ("2.2.2.2", 90, 20), ("3.3.3.3", 10, 30)]:
+                conn.execute(
+                    "INSERT INTO ip_reputation (ip, threat_score, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                    (ip, score, last_seen, last_seen)
+                )
+
+        rows = test_store.get_high_threat_ips(threshold=70, raw=True)
+
+        assert all(isinstance(row, sqlite3.Row) for row in rows)
+        assert [row["ip"] for row in rows] == ["2.2.2.2", "1.1.1.1"]
+        assert isinstance(test_store.get_ip_reputation("1.1.1.1", raw=True), sqlite3.Row)
+
+    @pytest.mark.unit
+    def test_get_error_traces_category_and_limit(self, test_store):
+        """Test category filtering with a bound limit on error traces"""
+        with test_store._write_connection() as conn:
+            for ts, category in [(10, "network"), (20, "database"), (30, "network"), (40, "network")]:
+                conn.execute(
+                    "INSERT INTO error_traces (timestamp, error_type, error_category) VALUES (?, ?, ?)",
+                    (ts, "x", category)
+                )
+
+        rows = test_store.get_error_traces(0, 100, category="network", limit=2)
+        assert [row["timestamp"] for row in rows] == [40, 30]
+        assert len(test_store.get_error_traces(0, 100)) == 4
+        assert len(test_store.get_error_traces(0, 100, limit=3)) == 3
@@ -4,14 +4,23 @@ Tests filesystem storage checking
 """
 
 import pytest
+from pathlib import Path
 from unittest.mock import patch, Mock
 from logly.utils.system_storage import (
     get_storage_info, format_bytes, get_storage_summary,
     check_storage_warning, check_storage_critical,
-    get_free_space_mb, get_free_space_gb
+    get_free_space_mb, get_free_space_gb, clear_storage_cache
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_storage_cache():
+    """Keep statvfs results cached by one test out of the next"""
+    clear_storage_cache()
+    yield
+    clear_storage_cache()
+
+
 class TestSystemStorage:
     """Test suite for system_storage utility"""
 
@@ -49,35 +58,72 @@ class TestSystemStorage:
         assert "MB" in format_bytes(5 * 1024 * 1024)
 
     @pytest.mark.unit
-    @patch('logly.utils.system_storage.get_storage_info')
-    def test_check_storage_warning_above_threshold(self, mock_get_info):
+    @patch('logly.utils.system_storage._raw_statvfs')
+    def test_check_storage_warning_above_threshold(self, mock_statvfs):
         """Test warning check when above threshold"""
-        mock_get_info.return_value = {"percent_used": 95.0}
+        mock_statvfs.return_value = (100, 5, 95)
         
         assert check_storage_warning("/", threshold_percent=90.0) is True
 
     @pytest.mark.unit
-    @patch('logly.utils.system_storage.get_storage_info')
-    def test_check_storage_warning_below_threshold(self, mock_get_info):
+    @patch('logly.utils.system_storage._raw_statvfs')
+    def test_check_storage_warning_below_threshold(self, mock_statvfs):
         """Test warning check when below threshold"""
-        mock_get_info.return_value = {"percent_used": 85.0}
+        mock_statvfs.return_value = (100, 15, 85)
         
         assert check_storage_warning("/", threshold_percent=90.0) is False
 
     @pytest.mark.unit
-    @patch('logly.utils.system_storage.get_storage_info')
-    def test_get_free_space_mb(self, mock_get_info):
+    @patch('logly.utils.system_storage._raw_statvfs')
+    def test_get_free_space_mb(self, mock_statvfs):
         """Test getting free space in MB"""
-        mock_get_info.return_value = {"free_bytes": 10 * 1024 * 1024}
+        mock_statvfs.return_value = (0, 10 * 1024 * 1024, 0)
         
         free_mb = get_free_space_mb("/")
         assert free_mb == 10.0
 
     @pytest.mark.unit
-    @patch('logly.utils.system_storage.get_storage_info')
-    def test_get_free_space_gb(self, mock_get_info):
+    @patch('logly.utils.system_storage._raw_statvfs')
+    def test_get_free_space_gb(self, mock_statvfs):
         """Test getting free space in GB"""
-        mock_get_info.return_value = {"free_bytes": 5 * 1024 * 1024 * 1024}
+        mock_statvfs.return_value = (0, 5 * 1024 * 1024 * 1024, 0)
         
         free_gb = get_free_space_gb("/")
         assert free_gb == 5.0
+
+    @pytest.mark.unit
+    @patch('os.statvfs')
+    def test_check_storage_critical_edge_cases(self, mock_statvfs):
+        """Test critical check on an empty filesystem and on statvfs failure"""
+        mock_statvfs.return_value = Mock(f_blocks=0, f_frsize=4096, f_bavail=0)
+        assert check_storage_critical("/", threshold_percent=95.0) is False
+
+        mock_statvfs.side_effect = FileNotFoundError("no such path")
+        assert check_storage_critical("/missing") is False
+        with pytest.raises(OSError, match="Failed to get storage info for /missing"):
+            get_storage_info("/missing")
+
+    @pytest.mark.unit
+    @patch('logly.utils.system_storage.time.monotonic')
+    @patch('os.statvfs')
+    def test_storage_info_cached_within_ttl(self, mock_statvfs, mock_monotonic):
+        """Test that statvfs runs once per path per STORAGE_CACHE_TTL"""
+        mock_statvfs.return_value = Mock(f_blocks=100, f_frsize=1024, f_bavail=40)
+
+        mock_monotonic.return_value = 100.0
+        get_storage_info("/")
+        mock_monotonic.return_value = 100.5
+        assert check_storage_warning("/", threshold_percent=60.0) is True
+        assert get_free_space_mb("/") == round(40 * 1024 / (1024 * 1024), 2)
+        assert mock_statvfs.call_count == 1
+
+        mock_monotonic.return_value = 101.0
+        get_storage_info("/")
+        assert mock_statvfs.call_count == 2
+
+        assert get_free_space_gb(Path("/")) == 0.0  # Path shares the "/" entry
+        assert mock_statvfs.call_count == 2
+
+        clear_storage_cache()
+        get_storage_info("/")
+        assert mock_statvfs.call_count == 3